@@ -0,0 +1,496 @@
+import numpy as np
+import json
+import os
+import re
+import sys
+from evolution import get_generations, get_individual_chromosome
+from genepool import get_gene_symbols, read_fasta
+from similarity import get_generation_sequences
+
+
+##################################################
+
+# MODULE ALIGNMENT
+
+# The Alignment Module provides functionalities
+# for the pairwise alignments of the gene sequences
+# of a generation. Alignments are stored once per
+# unordered pair as run-length edit scripts and
+# decoded or recomputed only when they are viewed.
+
+##################################################
+
+
+### ALIGNMENT EDIT SCRIPTS ###
+# Operations of the edit scripts: genes of both sequences, gene of the first only, gene of the second only
+ALIGNED, FIRST_ONLY, SECOND_ONLY = "M", "I", "D"
+GAP = "-"
+
+def encode_cigar(aligned_a, aligned_b):
+    """
+    Encode a gapped alignment of two sequences as run-length edit script.
+
+    Args:
+        aligned_a (str): The gapped first sequence.
+        aligned_b (str): The gapped second sequence of the same length.
+
+    Returns:
+        str: The edit script, e.g. '1M1I1D5M'.
+
+    Raises:
+        ValueError: If the gapped sequences differ in length.
+
+    Example:
+    >>> encode_cigar('CI-MCDBg-', 'C-TM-DBgO')
+    '1M1I1D1M1I3M1D'
+    """
+    if len(aligned_a) != len(aligned_b):
+        raise ValueError("The gapped sequences of an alignment must have the same length.")
+
+    operations = []
+
+    for char_a, char_b in zip(aligned_a, aligned_b):
+        if char_a != GAP and char_b != GAP:
+            operations.append(ALIGNED)
+        elif char_a != GAP:
+            operations.append(FIRST_ONLY)
+        elif char_b != GAP:
+            operations.append(SECOND_ONLY)
+
+    cigar = []
+    for operation in operations:
+        if cigar and cigar[-1][1] == operation:
+            cigar[-1][0] += 1
+        else:
+            cigar.append([1, operation])
+
+    return "".join(f"{count}{operation}" for count, operation in cigar)
+
+def decode_cigar(sequence_a, sequence_b, cigar):
+    """
+    Decode a run-length edit script into the gapped alignment of two sequences.
+
+    Args:
+        sequence_a (str): The first sequence.
+        sequence_b (str): The second sequence.
+        cigar (str): The edit script.
+
+    Returns:
+        tuple: The gapped first and second sequence.
+
+    Raises:
+        ValueError: If the edit script doesn't match the sequences.
+
+    Example:
+    >>> decode_cigar('CIMCDBg', 'CTMDBgO', '1M1I1D1M1I3M1D')
+    ('CI-MCDBg-', 'C-TM-DBgO')
+    """
+    aligned_a, aligned_b = [], []
+    pos_a, pos_b = 0, 0
+
+    for count, operation in re.findall(r"(\d+)([MID])", cigar):
+        count = int(count)
+
+        if operation in (ALIGNED, FIRST_ONLY):
+            aligned_a.append(sequence_a[pos_a:pos_a + count])
+            pos_a += count
+        else:
+            aligned_a.append(GAP * count)
+
+        if operation in (ALIGNED, SECOND_ONLY):
+            aligned_b.append(sequence_b[pos_b:pos_b + count])
+            pos_b += count
+        else:
+            aligned_b.append(GAP * count)
+
+    if pos_a != len(sequence_a) or pos_b != len(sequence_b):
+        raise ValueError(f"The edit script '{cigar}' doesn't match the sequences.")
+
+    return "".join(aligned_a), "".join(aligned_b)
+
+def _swap_cigar(cigar):
+    """
+    Swap the sequences of an edit script.
+
+    Args:
+        cigar (str): The edit script of the pair (a, b).
+
+    Returns:
+        str: The edit script of the pair (b, a).
+    """
+    return cigar.translate(str.maketrans({FIRST_ONLY: SECOND_ONLY, SECOND_ONLY: FIRST_ONLY}))
+
+
+### PAIRWISE ALIGNMENT ###
+def align_sequences(sequence_a, sequence_b):
+    """
+    Compute an optimal global alignment of two gene sequences.
+
+    The alignment maximizes the number of matching genes like the similarity of the similarity module,
+    mismatching genes are aligned to gaps.
+
+    Args:
+        sequence_a (str): The first sequence.
+        sequence_b (str): The second sequence.
+
+    Returns:
+        str: The edit script of the alignment.
+
+    Example:
+    >>> align_sequences('CIMCDBg', 'CTMDBgO')
+    '1M1I1D1M1I3M1D'
+    """
+    codes_a = np.array([ord(char) for char in sequence_a], dtype=np.int32)
+    codes_b = np.array([ord(char) for char in sequence_b], dtype=np.int32)
+
+    # Matching genes of all prefix pairs
+    table = np.zeros((len(codes_a) + 1, len(codes_b) + 1), dtype=np.int32)
+
+    for i in range(len(codes_a)):
+        candidate = table[i].copy()
+        candidate[1:] = np.maximum(table[i, 1:], table[i, :-1] + (codes_a[i] == codes_b))
+        table[i + 1] = np.maximum.accumulate(candidate)
+
+    # Trace back from the end, preferring matches
+    operations = []
+    i, j = len(codes_a), len(codes_b)
+
+    while i > 0 or j > 0:
+        if i > 0 and j > 0 and codes_a[i - 1] == codes_b[j - 1] and table[i, j] == table[i - 1, j - 1] + 1:
+            operations.append(ALIGNED)
+            i, j = i - 1, j - 1
+        elif i > 0 and table[i, j] == table[i - 1, j]:
+            operations.append(FIRST_ONLY)
+            i -= 1
+        else:
+            operations.append(SECOND_ONLY)
+            j -= 1
+
+    operations.reverse()
+    aligned_a = "".join(GAP if operation == SECOND_ONLY else "A" for operation in operations)
+    aligned_b = "".join(GAP if operation == FIRST_ONLY else "A" for operation in operations)
+
+    return encode_cigar(aligned_a, aligned_b)
+
+
+### ALIGNMENT STORE ###
+_alignment_stores = {}
+
+def _get_alignment_cache_dir(run):
+    """
+    Get the alignment directory in the EvoVis cache directory of the run, creating it if necessary.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+
+    Returns:
+        str: The path of the alignment directory.
+    """
+    cache_dir = os.path.join(run, ".evovis", "alignments")
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+def _pair_key(individual_a, individual_b):
+    """
+    Get the key of an unordered pair of individuals.
+
+    Args:
+        individual_a (str): The name of the first individual.
+        individual_b (str): The name of the second individual.
+
+    Returns:
+        tuple: The names in sorted order.
+    """
+    return (individual_a, individual_b) if individual_a <= individual_b else (individual_b, individual_a)
+
+def get_alignment_store(run, generation):
+    """
+    Get the compact alignment store of a generation.
+
+    The store holds the gene sequences of the individuals and the edit scripts of unordered pairs in
+    '.evovis/alignments/Generation_<generation>.json'. Without store the sequences are read from the
+    sequences.fasta of the generation or encoded from the chromosomes, and all alignments are recomputed
+    on demand. The alignment.json of a generation is never read here, see convert_alignment_json.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+        generation (int): The generation number.
+
+    Returns:
+        dict: A dictionary containing:
+              - 'sequences': A dictionary mapping individual names to their gene sequences.
+              - 'cigars': A dictionary mapping individual names to a dictionary mapping the names
+                          sorted after them to the edit script of the pair.
+
+    Example:
+    >>> get_alignment_store('my_run', 8)['cigars']['antique_gaur']['silent_avocet']
+    '1M3D2I3M1D'
+    """
+    filepath = os.path.join(run, ".evovis", "alignments", f"Generation_{generation}.json")
+    signature = os.stat(filepath).st_mtime_ns if os.path.isfile(filepath) else None
+    key = (run, generation)
+
+    cached = _alignment_stores.get(key)
+    if cached is not None and cached["signature"] == signature:
+        return cached
+
+    if signature is not None:
+        with open(filepath, 'r') as file:
+            store = json.load(file)
+    else:
+        fasta_path = f"{run}/Generation_{generation}/sequences.fasta"
+        sequences = dict(read_fasta(fasta_path)) if os.path.isfile(fasta_path) else get_generation_sequences(run, generation)
+        store = {"sequences": sequences, "cigars": {}}
+
+    cached = {"signature": signature, "sequences": store["sequences"], "cigars": store["cigars"]}
+    _alignment_stores[key] = cached
+
+    return cached
+
+def get_alignment(run, generation, individual_a, individual_b):
+    """
+    Get the alignment of the gene sequences of two individuals of a generation.
+
+    Only the requested pair is decoded, pairs without stored edit script are aligned on demand.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+        generation (int): The generation number.
+        individual_a (str): The name of the first individual.
+        individual_b (str): The name of the second individual.
+
+    Returns:
+        tuple: The gapped sequences of the first and the second individual, None if an individual has no sequence.
+
+    Example:
+    >>> get_alignment('my_run', 8, 'silent_avocet', 'hallowed_meerkat')
+    ('CI-MCDBg-', 'C-TM-DBgO')
+    """
+    store = get_alignment_store(run, generation)
+    sequences = store["sequences"]
+
+    if individual_a not in sequences or individual_b not in sequences:
+        return None
+
+    if individual_a == individual_b:
+        return sequences[individual_a], sequences[individual_b]
+
+    first, second = _pair_key(individual_a, individual_b)
+    cigar = store["cigars"].get(first, {}).get(second)
+
+    if cigar is None:
+        cigar = align_sequences(sequences[first], sequences[second])
+        store["cigars"].setdefault(first, {})[second] = cigar
+
+    if first != individual_a:
+        cigar = _swap_cigar(cigar)
+
+    return decode_cigar(sequences[individual_a], sequences[individual_b], cigar)
+
+def get_alignment_across_generations(run, generation_a, individual_a, generation_b, individual_b):
+    """
+    Get the alignment of the gene sequences of two individuals of possibly different generations.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+        generation_a (int): The generation of the first individual.
+        individual_a (str): The name of the first individual.
+        generation_b (int): The generation of the second individual.
+        individual_b (str): The name of the second individual.
+
+    Returns:
+        tuple: The gapped sequences of the first and the second individual, None if an individual has no sequence.
+    """
+    if generation_a == generation_b:
+        return get_alignment(run, generation_a, individual_a, individual_b)
+
+    sequence_a = get_alignment_store(run, generation_a)["sequences"].get(individual_a)
+    sequence_b = get_alignment_store(run, generation_b)["sequences"].get(individual_b)
+
+    if sequence_a is None or sequence_b is None:
+        return None
+
+    return decode_cigar(sequence_a, sequence_b, align_sequences(sequence_a, sequence_b))
+
+
+### ALIGNED GENES ###
+def _get_sequence_genes(run, generation, individual, sequence):
+    """
+    Get the gene of the chromosome of an individual behind every symbol of its gene sequence.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+        generation (int): The generation of the individual.
+        individual (str): The name of the individual.
+        sequence (str): The gene sequence of the individual.
+
+    Returns:
+        list: The gene of every symbol, None for all symbols if the chromosome doesn't match the sequence.
+    """
+    chromosome = get_individual_chromosome(run, generation, individual)
+
+    # Missing or unreadable chromosomes aren't lists
+    if isinstance(chromosome, list):
+        genes = [(symbol, gene) for gene, symbol in zip(chromosome, get_gene_symbols(run, chromosome)) if symbol]
+
+        if "".join(symbol for symbol, _ in genes) == sequence:
+            return [gene for _, gene in genes]
+
+    return [None] * len(sequence)
+
+def get_aligned_genes(run, generation_a, individual_a, generation_b, individual_b):
+    """
+    Get the alignment of two individuals as columns of aligned genes.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+        generation_a (int): The generation of the first individual.
+        individual_a (str): The name of the first individual.
+        generation_b (int): The generation of the second individual.
+        individual_b (str): The name of the second individual.
+
+    Returns:
+        list: The columns of the alignment as tuples of the first and second individual's entry, which is None
+              for a gap or a dictionary with the 'symbol' and the chromosome 'gene' (None if unknown).
+              None if an individual has no sequence.
+
+    Example:
+    >>> get_aligned_genes('my_run', 7, 'silent_avocet', 8, 'hallowed_meerkat')[:2]
+    [({'symbol': 'C', 'gene': {'layer': 'C_2D', ...}}, {'symbol': 'C', 'gene': {'layer': 'C_2D', ...}}),
+     ({'symbol': 'I', 'gene': {'layer': 'IN_2D', ...}}, None)]
+    """
+    alignment = get_alignment_across_generations(run, generation_a, individual_a, generation_b, individual_b)
+
+    if alignment is None:
+        return None
+
+    entries = []
+
+    for aligned, generation, individual in zip(alignment, (generation_a, generation_b), (individual_a, individual_b)):
+        sequence = aligned.replace(GAP, "")
+        genes = iter(_get_sequence_genes(run, generation, individual, sequence))
+        entries.append([None if symbol == GAP else {"symbol": symbol, "gene": next(genes)} for symbol in aligned])
+
+    return list(zip(*entries))
+
+### ALIGNMENT.JSON CONVERSION ###
+def _parse_alignment(alignment):
+    """
+    Parse a pairwise alignment in FASTA format.
+
+    Args:
+        alignment (str): Two gapped sequences in FASTA format.
+
+    Returns:
+        tuple: The gapped first and second sequence.
+    """
+    lines = [line.strip() for line in alignment.strip().split("\n")]
+    names = [idx for idx, line in enumerate(lines) if line.startswith(">")]
+
+    return "".join(lines[names[0] + 1:names[1]]), "".join(lines[names[1] + 1:])
+
+def convert_alignment_json(run, generation, omit_recomputable=False, remove_source=False):
+    """
+    Convert the alignment.json of a generation into the compact alignment store.
+
+    Every unordered pair is kept once as edit script, the reversed pair is viewed as its mirror image.
+    Self-pairs are dropped. Optionally pairs whose stored alignment equals the recomputed alignment are
+    dropped as well, they are recomputed when viewed.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+        generation (int): The generation number.
+        omit_recomputable (bool, optional): If True, drops pairs that align_sequences reproduces. Defaults to False.
+        remove_source (bool, optional): If True, deletes the alignment.json after the conversion. Defaults to False.
+
+    Returns:
+        dict: A dictionary containing the number of 'pairs' in alignment.json, the number of 'stored' pairs,
+              and the file sizes 'source-bytes' and 'store-bytes'. None if the generation has no alignment.json.
+
+    Example:
+    >>> convert_alignment_json('my_run', 8)
+    {'pairs': 400, 'stored': 190, 'source-bytes': 45962, 'store-bytes': 4215}
+    """
+    source_path = f"{run}/Generation_{generation}/alignment.json"
+
+    if not os.path.isfile(source_path):
+        return None
+
+    with open(source_path, 'r') as file:
+        alignments = json.load(file)
+
+    sequences = {}
+    cigars = {}
+
+    pairs = [(re.findall(r"'([^']*)'", pair), alignment) for pair, alignment in alignments.items()]
+    pairs = [(names, alignment) for names, alignment in pairs if len(names) == 2]
+
+    # Pairs in sorted order are kept as they are, the reversed pairs only if their counterpart is missing
+    pairs.sort(key=lambda pair: pair[0][0] > pair[0][1])
+
+    for names, alignment in pairs:
+
+        aligned_a, aligned_b = _parse_alignment(alignment)
+        sequences.setdefault(names[0], aligned_a.replace(GAP, ""))
+        sequences.setdefault(names[1], aligned_b.replace(GAP, ""))
+
+        first, second = _pair_key(*names)
+        if first == second or second in cigars.get(first, {}):
+            continue
+
+        cigar = encode_cigar(aligned_a, aligned_b)
+        if first != names[0]:
+            cigar = _swap_cigar(cigar)
+
+        if omit_recomputable and cigar == align_sequences(sequences[first], sequences[second]):
+            continue
+
+        cigars.setdefault(first, {})[second] = cigar
+
+    store_path = os.path.join(_get_alignment_cache_dir(run), f"Generation_{generation}.json")
+
+    with open(store_path, 'w') as file:
+        json.dump({"sequences": sequences, "cigars": cigars}, file, separators=(",", ":"))
+
+    source_bytes = os.path.getsize(source_path)
+
+    if remove_source:
+        os.remove(source_path)
+
+    return {
+        "pairs": len(alignments),
+        "stored": sum(len(pairs) for pairs in cigars.values()),
+        "source-bytes": source_bytes,
+        "store-bytes": os.path.getsize(store_path),
+    }
+
+def convert_run_alignments(run, omit_recomputable=False, remove_source=False):
+    """
+    Convert the alignment.json files of all generations of a run into compact alignment stores.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+        omit_recomputable (bool, optional): If True, drops pairs that align_sequences reproduces. Defaults to False.
+        remove_source (bool, optional): If True, deletes the alignment.json files after the conversion. Defaults to False.
+
+    Returns:
+        dict: Generation dictionary with the conversion statistics of every converted generation.
+    """
+    statistics = {}
+
+    for generation in get_generations(run, as_int=True):
+        converted = convert_alignment_json(run, generation, omit_recomputable, remove_source)
+        if converted is not None:
+            statistics[generation] = converted
+
+    return statistics
+
+
+### CONVERTER SCRIPT ###
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: python3 src/alignment.py <run results directory>")
+        sys.exit(1)
+
+    for generation, converted in convert_run_alignments(sys.argv[1]).items():
+        print(f"Generation {generation}: {converted['stored']} of {converted['pairs']} pairs, {converted['source-bytes']} -> {converted['store-bytes']} bytes")
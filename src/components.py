@@ -436,6 +436,62 @@ def chromosome_sequence(chromosome, justify="flex-start", align="flex-start", co
     return dmc.Stack(chromosome_sequence, justify=justify, align=align, spacing="0px")
 
 
+### ALIGNMENT SEQUENCE ###
+def _alignment_badge(entry, unique_genes=None):
+    """
+    Generate the badge of one gene of an alignment or of a gap.
+
+    Args:
+        entry (dict): The aligned gene with 'symbol' and 'gene', None for a gap.
+        unique_genes (dict, optional): Dictionary of unique genes with corresponding colors. Defaults to None.
+
+    Returns:
+        dash_mantine_components.Tooltip or dash_mantine_components.Badge: Badge of the gene or the gap.
+    """
+    if entry is None:
+        return dmc.Badge("-", variant='light', color='gray', style={'width': '100%', 'background-color': '#EFEFEF', 'color': '#B0B0B0'})
+    
+    gene = entry["gene"]
+    color = '#6173E9'
+    
+    if gene is not None and unique_genes is not None and gene.get("layer") in unique_genes:
+        color = unique_genes[gene["layer"]]
+    
+    gene_name = entry["symbol"] if gene is None else gene["layer"].replace('_', '')
+    gene_params = entry["symbol"] if gene is None else str(gene).replace('{', '').replace('}', '').replace("'", '').replace(",", '\n')
+    
+    return dmc.Tooltip(
+        label=gene_params,
+        position="right",
+        offset=3,
+        transition="slide-up",
+        color='gray',
+        multiline=True,
+        children=[dmc.Badge(gene_name, variant='light', color='indigo', style={'width': '100%', 'background-color': f"{color}33", 'color': color})]
+    )
+
+def alignment_sequence(columns, labels=None, unique_genes=None):
+    """
+    Generate the aligned gene sequences of two chromosomes side by side.
+
+    Args:
+        columns (list): The columns of the alignment as tuples of the two aligned genes, see alignment.get_aligned_genes.
+        labels (tuple, optional): The names of the two chromosomes. Defaults to None.
+        unique_genes (dict, optional): Dictionary of unique genes with corresponding colors. Defaults to None.
+
+    Returns:
+        dash.html.Div: Grid with one row per alignment column.
+    """
+    cells = []
+    
+    if labels is not None:
+        cells += [html.P(label, style={'margin': '0px', 'font-size': '11px', 'font-weight': 'bold', 'overflow': 'hidden', 'text-overflow': 'ellipsis'}) for label in labels]
+    
+    for entry_a, entry_b in columns:
+        cells += [_alignment_badge(entry_a, unique_genes), _alignment_badge(entry_b, unique_genes)]
+    
+    return html.Div(cells, style={'display': 'grid', 'grid-template-columns': '1fr 1fr', 'gap': '2px 5px'})
+
 ### NOT IN USE ###
 def fitness_function():
     
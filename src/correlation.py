@@ -0,0 +1,289 @@
+import numpy as np
+from evolution import get_meas_info, get_results_table
+
+
+##################################################
+
+# MODULE CORRELATION
+
+# The Correlation Module provides functionalities
+# for the Pearson and Spearman correlation
+# between the measurements of a run
+# per generation and over the generations.
+
+##################################################
+
+
+### VALID MEASUREMENT VALUES ###
+def _get_valid_values(run):
+    """
+    Get the measurement values of the healthy individuals within the 'min-boundary' and 'max-boundary'.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+
+    Returns:
+        tuple: A tuple containing:
+               - dict: The results table.
+               - numpy.ndarray: Matrix (individuals x measurements) of the values, NaN where not valid.
+               - tuple: The boundaries of the measurements.
+    """
+    table = get_results_table(run)
+    meas_infos = get_meas_info(run)
+    boundaries = tuple((meas_infos[meas]["min-boundary"], meas_infos[meas]["max-boundary"]) for meas in table["measurements"])
+
+    lower = np.array([-np.inf if low is None else low for low, _ in boundaries], dtype=np.float64)
+    upper = np.array([np.inf if high is None else high for _, high in boundaries], dtype=np.float64)
+
+    with np.errstate(invalid="ignore"):
+        valid = table["healthy"][:, None] & (table["values"] >= lower) & (table["values"] <= upper)
+
+    return table, np.where(valid, table["values"], np.nan), boundaries
+
+def _rank(values):
+    """
+    Rank the values of every column, ties get their average rank and NaN values stay NaN.
+
+    Args:
+        values (numpy.ndarray): Matrix (rows x columns) of values.
+
+    Returns:
+        numpy.ndarray: Matrix of the ranks starting with 1.
+    """
+    ranks = np.full(values.shape, np.nan)
+
+    for col in range(values.shape[1]):
+        valid = ~np.isnan(values[:, col])
+
+        if valid.any():
+            _, inverse, counts = np.unique(values[valid, col], return_inverse=True, return_counts=True)
+            average_ranks = np.cumsum(counts) - (counts - 1) / 2
+            ranks[valid, col] = average_ranks[inverse.reshape(-1)]
+
+    return ranks
+
+
+### SUFFICIENT STATISTICS ###
+def _pairwise_sums(values, starts):
+    """
+    Sum the sufficient statistics of the pairwise correlations per group of rows.
+
+    For every pair of measurements only the rows where both values are valid are summed.
+
+    Args:
+        values (numpy.ndarray): Matrix (rows x measurements) of values, NaN where not valid.
+        starts (numpy.ndarray): The first row of every group, the groups are contiguous.
+
+    Returns:
+        numpy.ndarray: Array (groups x 6 x measurements x measurements) with the count, the sums of x and y,
+                       the sums of squares of x and y and the sum of products of every pair.
+    """
+    valid = ~np.isnan(values)
+    filled = np.where(valid, values, 0.0)
+    mask = valid.astype(np.float64)
+
+    # Per row statistics of every pair (x: first, y: second measurement)
+    rows = np.stack([
+        mask[:, :, None] * mask[:, None, :],
+        filled[:, :, None] * mask[:, None, :],
+        (filled ** 2)[:, :, None] * mask[:, None, :],
+        filled[:, :, None] * filled[:, None, :],
+    ], axis=1)
+
+    if not len(values):
+        return np.zeros((0, 6) + rows.shape[2:])
+
+    sums = np.add.reduceat(rows, starts, axis=0)
+
+    # The sums of y are the transposed sums of x
+    return np.stack([
+        sums[:, 0],
+        sums[:, 1],
+        np.swapaxes(sums[:, 1], 1, 2),
+        sums[:, 2],
+        np.swapaxes(sums[:, 2], 1, 2),
+        sums[:, 3],
+    ], axis=1)
+
+def _pearson(sums):
+    """
+    Compute the Pearson correlation from the sufficient statistics.
+
+    Args:
+        sums (numpy.ndarray): Array (... x 6 x measurements x measurements) of the count, the sums of x and y,
+                              the sums of squares of x and y and the sum of products.
+
+    Returns:
+        numpy.ndarray: The correlation matrices, NaN where not defined.
+    """
+    n, sx, sy, sxx, syy, sxy = (sums[..., idx, :, :] for idx in range(6))
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        covariance = n * sxy - sx * sy
+        variance = (n * sxx - sx ** 2) * (n * syy - sy ** 2)
+        correlation = np.where(variance > 0, covariance / np.sqrt(np.where(variance > 0, variance, 1.0)), np.nan)
+
+    return np.clip(correlation, -1.0, 1.0)
+
+
+def _spearman(values):
+    """
+    Compute the Spearman correlation of every pair of columns over the rows where both are valid.
+
+    Both columns of a pair are ranked within the rows where both values are valid, like
+    pandas.DataFrame.corr(method="spearman").
+
+    Args:
+        values (numpy.ndarray): Matrix (rows x measurements) of values, NaN where not valid.
+
+    Returns:
+        numpy.ndarray: Matrix (measurements x measurements) of the correlations, NaN where not defined.
+    """
+    num_measurements = values.shape[1]
+    valid = ~np.isnan(values)
+    correlation = np.full((num_measurements, num_measurements), np.nan)
+
+    for first in range(num_measurements):
+        for second in range(first, num_measurements):
+            both = valid[:, first] & valid[:, second]
+
+            if both.any():
+                ranks = _rank(values[both][:, [first, second]])
+                correlation[first, second] = correlation[second, first] = _pearson(_pairwise_sums(ranks, np.array([0])))[0, 0, 1]
+
+    return correlation
+
+
+### CORRELATIONS OF A RUN ###
+_correlations = {}
+
+def _update_correlations(run):
+    """
+    Compute the correlation statistics of the generations which weren't processed before.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+
+    Returns:
+        tuple: A tuple containing:
+               - dict: The correlation cache of the run.
+               - dict: The results table.
+               - numpy.ndarray: Matrix (individuals x measurements) of the valid values.
+    """
+    table, values, boundaries = _get_valid_values(run)
+    generations = [int(generation) for generation in np.unique(table["generations"])]
+    key = (tuple(table["measurements"]), boundaries)
+
+    cached = _correlations.get(run)
+    if cached is None or cached["key"] != key or cached["generations"] != generations[:len(cached["generations"])]:
+
+        # All sums are taken relative to the same shift to reduce cancellation
+        with np.errstate(invalid="ignore"):
+            shift = np.nan_to_num(np.nanmean(values, axis=0)) if len(values) else np.zeros(values.shape[1])
+
+        cached = {"key": key, "shift": shift, "generations": [], "pearson": [], "spearman": [], "sums": [], "spearman-cumulative": {}}
+        _correlations[run] = cached
+
+    new_generations = generations[len(cached["generations"]):]
+
+    if new_generations:
+        first = np.searchsorted(table["generations"], new_generations[0], side="left")
+        new_values = values[first:]
+        new_row_generations = table["generations"][first:]
+        starts = np.searchsorted(new_row_generations, new_generations, side="left")
+        ends = np.searchsorted(new_row_generations, new_generations, side="right")
+
+        sums = _pairwise_sums(new_values - cached["shift"], starts)
+        cached["sums"].extend(sums)
+        cached["pearson"].extend(_pearson(sums))
+        cached["spearman"].extend(_spearman(new_values[start:end]) for start, end in zip(starts, ends))
+        cached["generations"].extend(new_generations)
+
+    return cached, table, values
+
+def get_correlation_matrix(run, generation, method="pearson", cumulative=False):
+    """
+    Get the correlation matrix between all measurements of a generation.
+
+    Every pair of measurements is correlated over the healthy individuals with valid values of both.
+    The Pearson correlation is computed from sufficient statistics per generation, which are summed up over
+    the generations for the cumulative correlation. The Spearman correlation is the Pearson correlation
+    of the ranks, ranked within the generation or, cumulative, within all generations up to it, over the
+    individuals where both measurements are valid.
+    The statistics of a generation are computed once, when it is processed for the first time.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+        generation (int): The generation number.
+        method (str, optional): "pearson" or "spearman". Defaults to "pearson".
+        cumulative (bool, optional): If True, correlates all individuals up to the generation. Defaults to False.
+
+    Returns:
+        numpy.ndarray: Matrix (measurements x measurements) of the correlations, NaN where not defined.
+
+    Raises:
+        ValueError: If the method is unknown or the generation wasn't processed.
+
+    Example:
+    >>> get_correlation_matrix('my_run', 20, method='spearman', cumulative=True)
+    array([[ 1.  ,  0.62, -0.15], ...])
+    """
+    if method not in ("pearson", "spearman"):
+        raise ValueError(f"Unknown correlation method '{method}'. Must be 'pearson' or 'spearman'.")
+
+    cached, table, values = _update_correlations(run)
+
+    if generation not in cached["generations"]:
+        raise ValueError(f"Generation {generation} wasn't processed.")
+
+    idx = cached["generations"].index(generation)
+
+    if method == "pearson" and cumulative:
+        return _pearson(np.sum(cached["sums"][:idx + 1], axis=0))
+
+    if method == "pearson":
+        return cached["pearson"][idx]
+
+    if not cumulative:
+        return cached["spearman"][idx]
+
+    # Ranks of all individuals up to the generation
+    if generation not in cached["spearman-cumulative"]:
+        end = np.searchsorted(table["generations"], generation, side="right")
+        cached["spearman-cumulative"][generation] = _spearman(values[:end])
+
+    return cached["spearman-cumulative"][generation]
+
+def get_correlation_matrices(run, method="pearson", cumulative=False):
+    """
+    Get the correlation matrices between all measurements for every generation.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+        method (str, optional): "pearson" or "spearman". Defaults to "pearson".
+        cumulative (bool, optional): If True, correlates all individuals up to every generation. Defaults to False.
+
+    Returns:
+        dict: A dictionary containing:
+              - 'measurements': The measurement keys.
+              - 'generations': The generation numbers.
+              - 'matrices': Array (generations x measurements x measurements) of the correlations, NaN where not defined.
+
+    Example:
+    >>> get_correlation_matrices('my_run')['matrices'].shape
+    (20, 4, 4)
+    """
+    cached, table, _ = _update_correlations(run)
+    num_measurements = len(table["measurements"])
+
+    if method == "pearson" and cumulative and cached["sums"]:
+        matrices = _pearson(np.cumsum(np.array(cached["sums"]), axis=0))
+    else:
+        matrices = [get_correlation_matrix(run, generation, method, cumulative) for generation in cached["generations"]]
+        matrices = np.array(matrices) if matrices else np.zeros((0, num_measurements, num_measurements))
+
+    return {
+        "measurements": list(table["measurements"]),
+        "generations": list(cached["generations"]),
+        "matrices": matrices,
+    }
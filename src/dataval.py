@@ -294,6 +294,10 @@ def validate_meas_info(run):
             message += f"Error config.json file: Result '{result}' settings must be a dictionary.\n"
             continue
         
+        # Check if the objective direction is known
+        if details.get("objective-direction", "maximize") not in ("maximize", "minimize"):
+            message += f"Error config.json file: Result '{result}' objective-direction must be 'maximize' or 'minimize'.\n"
+        
     return message
 
 def validate_individual_result(run, generation, individual):
@@ -328,4 +332,29 @@ def validate_individual_chromosome(run, generation, individual):
     except json.JSONDecodeError:
         return f"Error chromosome.json file for {individual} in {generation}: Invalid JSON format in chromosome.json."
     
-    return ""
\ No newline at end of file
+    return ""
+
+def validate_individual_rule_compliance(violations, generation, individual):
+    """
+    Check if the chromosome of an individual follows the rule set of the search space.
+
+    Parameters:
+        violations (list): The rule set violations of the chromosome, see genepool.get_rule_violations.
+        generation (int): The generation of the individual.
+        individual (str): The name of the individual.
+
+    Returns:
+        str: A message listing the gene transitions that break the rule set or an empty string if the chromosome follows it.
+
+    Example:
+    >>> validate_individual_rule_compliance([], 8, 'silent_avocet')
+    ''
+    """
+    
+    # Check if the chromosome follows the rule set of the search space
+    if not violations:
+        return ""
+    
+    transitions = ", ".join(f"{violation['source']} → {violation['target']} (gene {violation['position']})" for violation in violations)
+    
+    return f"Error chromosome.json file for {individual} in {generation}: Genes don't follow the rule set of search_space.json: {transitions}."
@@ -0,0 +1,193 @@
+import numpy as np
+from evolution import get_generations, get_gene_frequencies, get_duplicate_index
+from similarity import get_similarity_matrix, update_similarity_checkpoint
+
+
+##################################################
+
+# MODULE DIVERSITY
+
+# The Diversity Module provides functionalities
+# for the diversity of the population per generation
+# and for 2D embeddings of the individuals of a
+# generation by their chromosome similarity.
+
+##################################################
+
+
+### DIVERSITY METRICS ###
+_diversity_metrics = {}
+
+def _load_similarities(run, generations):
+    """
+    Load the similarity matrices of generations as float64 arrays.
+
+    All matrices are computed by EvoVis, since the similarity.csv files of a run use a different metric
+    and may be missing for some generations.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+        generations (list): The generation numbers.
+
+    Returns:
+        tuple: A tuple containing:
+               - dict: Generation dictionary with the individual names and the similarity matrix.
+               - tuple: The signatures of the matrices, which change when a generation changes.
+    """
+    # Align the pairs of new generations first, reusing the checkpointed scores
+    update_similarity_checkpoint(run)
+    similarities = {}
+    signatures = []
+
+    for generation in generations:
+        similarity = get_similarity_matrix(run, generation, source="evovis")
+        similarities[generation] = (similarity["individuals"], np.asarray(similarity["matrix"], dtype=np.float64) * similarity["scale"])
+        signatures.append(similarity["signature"])
+
+    return similarities, tuple(signatures)
+
+def get_diversity_metrics(run):
+    """
+    Get the diversity of the population of every generation.
+
+    The metrics are computed for all generations at once and cached until a generation is added or changes.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+
+    Returns:
+        dict: A dictionary containing:
+              - 'generations': The generation numbers.
+              - 'mean_similarity': Array with the mean EvoVis alignment similarity of all pairs of distinct individuals.
+              - 'layer_entropy': Array with the Shannon entropy of the layer usage in bits.
+              - 'normalized_layer_entropy': Array with the layer entropy divided by its maximum for the layers of the run.
+              - 'distinct': Array with the number of distinct architectures.
+
+    Example:
+    >>> get_diversity_metrics('my_run')['mean_similarity']
+    array([0.31, 0.33, 0.38, ...])
+    """
+    generations = get_generations(run, as_int=True)
+    similarities, signatures = _load_similarities(run, generations)
+    key = (tuple(generations), signatures)
+
+    cached = _diversity_metrics.get(run)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    # Mean of the off-diagonal similarities
+    mean_similarity = []
+
+    for individuals, matrix in similarities.values():
+        pairs = len(individuals) * (len(individuals) - 1)
+        mean_similarity.append((matrix.sum() - np.trace(matrix)) / pairs if pairs else np.nan)
+
+    # Entropy of the layer usage of all generations at once
+    frequencies = get_gene_frequencies(run)
+    counts = frequencies["counts"][:, [frequencies["generations"].index(generation) for generation in generations]].astype(np.float64)
+    totals = counts.sum(axis=0)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        probabilities = counts / totals
+        entropy = -np.where(probabilities > 0, probabilities * np.log2(np.where(probabilities > 0, probabilities, 1.0)), 0.0).sum(axis=0)
+        entropy = np.where(totals > 0, entropy, np.nan)
+
+    used_layers = int(np.count_nonzero(counts.sum(axis=1)))
+    duplicates = get_duplicate_index(run)
+
+    metrics = {
+        "generations": generations,
+        "mean_similarity": np.array(mean_similarity, dtype=np.float64),
+        "layer_entropy": entropy,
+        "normalized_layer_entropy": entropy / np.log2(used_layers) if used_layers > 1 else np.zeros(len(generations)),
+        "distinct": duplicates["distinct"][[duplicates["generations"].index(generation) for generation in generations]],
+    }
+    _diversity_metrics[run] = (key, metrics)
+
+    return metrics
+
+
+### SIMILARITY EMBEDDINGS ###
+_embeddings = {}
+
+def _classical_mds(similarities):
+    """
+    Embed stacked similarity matrices in 2D with classical multidimensional scaling.
+
+    The distance of two individuals is one minus their similarity. The double centered squared distances are
+    decomposed for all matrices at once and the two largest eigenvectors, scaled by the square root of their
+    eigenvalues, are the coordinates. The axes are oriented so that their largest coordinate is positive.
+
+    Args:
+        similarities (numpy.ndarray): Array (matrices x individuals x individuals) of symmetric similarity matrices.
+
+    Returns:
+        numpy.ndarray: Array (matrices x individuals x 2) of the coordinates.
+    """
+    num_individuals = similarities.shape[1]
+    squared = (1.0 - similarities) ** 2
+
+    # Double centering -1/2 * J D^2 J
+    centered = squared - squared.mean(axis=1, keepdims=True) - squared.mean(axis=2, keepdims=True) + squared.mean(axis=(1, 2), keepdims=True)
+    gram = -0.5 * centered
+
+    eigenvalues, eigenvectors = np.linalg.eigh(gram)
+    eigenvalues = eigenvalues[:, ::-1][:, :2]
+    eigenvectors = eigenvectors[:, :, ::-1][:, :, :2]
+
+    if num_individuals < 2:
+        eigenvalues = np.pad(eigenvalues, ((0, 0), (0, 2 - eigenvalues.shape[1])))
+        eigenvectors = np.pad(eigenvectors, ((0, 0), (0, 0), (0, 2 - eigenvectors.shape[2])))
+
+    coordinates = eigenvectors * np.sqrt(np.maximum(eigenvalues, 0.0))[:, None, :]
+
+    # Deterministic orientation of the axes
+    largest = np.take_along_axis(coordinates, np.abs(coordinates).argmax(axis=1)[:, None, :], axis=1)
+    return coordinates * np.where(largest < 0, -1.0, 1.0)
+
+def get_similarity_embeddings(run):
+    """
+    Get a 2D embedding of the individuals of every generation by their EvoVis chromosome similarity.
+
+    The embeddings of all generations are computed at once, generations with the same number of individuals
+    in one batched eigendecomposition, and cached until a generation is added or changes.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+
+    Returns:
+        dict: Generation dictionary with the 'individuals' and their 'coordinates' (individuals x 2).
+
+    Example:
+    >>> get_similarity_embeddings('my_run')[8]['coordinates'][:2]
+    array([[ 0.21, -0.05],
+           [-0.12,  0.17]])
+    """
+    generations = get_generations(run, as_int=True)
+    similarities, signatures = _load_similarities(run, generations)
+    key = (tuple(generations), signatures)
+
+    cached = _embeddings.get(run)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    embeddings = {}
+
+    # Batches of generations with the same number of individuals
+    sizes = {}
+    for generation, (individuals, _) in similarities.items():
+        sizes.setdefault(len(individuals), []).append(generation)
+
+    for size, batch in sizes.items():
+        if size == 0:
+            coordinates = np.zeros((len(batch), 0, 2))
+        else:
+            coordinates = _classical_mds(np.stack([similarities[generation][1] for generation in batch]))
+
+        for generation, generation_coordinates in zip(batch, coordinates):
+            embeddings[generation] = {"individuals": similarities[generation][0], "coordinates": generation_coordinates}
+
+    embeddings = {generation: embeddings[generation] for generation in generations}
+    _embeddings[run] = (key, embeddings)
+
+    return embeddings
@@ -1,9 +1,11 @@
 import pandas as pd
 import numpy as np
 import os
+import re
 import random
 from matplotlib.colors import hex2color, rgb2hex
 import json
+import hashlib
 
 
 ##################################################
@@ -94,6 +96,7 @@ def get_meas_info(run):
         setting["individual-info-img"] = setting.get("individual-info-img", "measure1-icon.png") or "measure1-icon.png"
         setting["min-boundary"] = setting.get("min-boundary", None) 
         setting["max-boundary"] = setting.get("max-boundary", None) 
+        setting["objective-direction"] = setting.get("objective-direction", "maximize") 
     
     return configs["results"]
 
@@ -133,7 +136,7 @@ def get_generations(run, as_int=False):
     # Retrieve generation names and numbers
     generation_path = run
     items = os.listdir(generation_path)
-    generations = [item for item in items if os.path.isdir(os.path.join(generation_path, item))]
+    generations = [item for item in items if re.match(r"^Generation_\d+$", item) and os.path.isdir(os.path.join(generation_path, item))]
     generations_int = [int(gen.split("_")[1]) for gen in generations]
 
     generations_int.sort()
@@ -339,58 +342,14 @@ def get_individuals(run, generation_range=None, value="names", as_generation_dic
 
         return individuals
       
-def _get_minmax_result_by_key(results, key, min_boundary=None, max_boundary=None):
-    """
-    Finds the minimum and maximum values in a list of dictionaries based on a specified key,
-    while respecting optional minimum and maximum boundaries.
-
-    Parameters:
-        results (list): A list of dictionaries containing key-value pairs.
-        key (str): The key to be used for comparison in dictionaries.
-        min_boundary (int or float, optional): The minimum boundary for the values. Default is None.
-        max_boundary (int or float, optional): The maximum boundary for the values. Default is None.
-
-    Returns:
-        tuple: A tuple containing the adjusted minimum and maximum values respecting the boundaries.
-
-    Raises:
-        ValueError: If 'key' is not present in a dictionary or if the corresponding value is not an int or float.
-
-    Example:
-    >>> my_list_of_dicts = [{'value': 3}, {'value': 'invalid'}, {'value': 5}]
-    >>> min_val, max_val = _get_minmax_result_by_key(my_list_of_dicts, 'value', min_boundary=2, max_boundary=4)
-    >>> print(min_val, max_val)
-    (3, 4)
-    """
-    if not results:
-        return None, None  # Return None for both min and max if the list is empty
-
-    min_val = float('inf')
-    max_val = float('-inf')
-
-    for result in results:
-        if result is not None and key in result and isinstance(result[key], (int, float)):
-            
-            val = result[key]
-
-            if min_boundary is not None:
-                val = max(val, min_boundary)
-
-            if max_boundary is not None:
-                val = min(val, max_boundary)
-
-            min_val = min(min_val, val)
-            max_val = max(max_val, val)
-            
-    return min_val, max_val
-
 def get_individuals_min_max(run, generation_range=None):
     """
     Get the minimum and maximum values for various measurements across generations and individuals.
+    Values are clipped to the 'min-boundary' and 'max-boundary' of the measurements.
 
     Parameters:
         run (str): The path of the ENAS run results directory.
-        generation_range (tuple, optional): A tuple specifying the range of generations to consider (start, end).
+        generation_range (tuple, optional): A tuple specifying the range of generations to consider (start, end), both included.
 
     Returns:
         measurements (dict): A dictionary containing the minimum and maximum values for each measurement.
@@ -410,22 +369,19 @@ def get_individuals_min_max(run, generation_range=None):
     if generation_range is not None and (len(generation_range) != 2 or not all(isinstance(g, int) for g in generation_range)):
         raise ValueError("Invalid 'generation_range'. Must be a tuple of two integers.")
 
-    values = get_individuals(run, generation_range, "results", as_generation_dict=False)
+    bounds = get_measurement_bounds(run)
     
-    values, _ = get_healthy_individuals_results(run, generation_range, as_generation_dict=False)
-    meas_infos = get_meas_info(run)
+    if generation_range is None:
+        return dict(bounds["run"])
+    
+    # Combine the bounds of the generations in the range
     measurements = {}
-
-    for measure, meas_info in meas_infos.items():
-        min_boundary = meas_info.get('min_boundary', None)
-        max_boundary = meas_info.get('max_boundary', None)
-        
-        measurements[measure] = _get_minmax_result_by_key(
-            values,
-            measure,
-            min_boundary=min_boundary,
-            max_boundary=max_boundary
-        )
+    generations = [gen for gen in bounds["generations"] if generation_range[0] <= gen <= generation_range[1]]
+    
+    for measure in bounds["run"]:
+        mins = [bounds["generation"][gen][measure][0] for gen in generations if bounds["generation"][gen][measure][0] is not None]
+        maxs = [bounds["generation"][gen][measure][1] for gen in generations if bounds["generation"][gen][measure][1] is not None]
+        measurements[measure] = (min(mins), max(maxs)) if mins else (None, None)
 
     return measurements
   
@@ -491,6 +447,76 @@ def get_healthy_individuals_results(run, generation_range=None, as_generation_di
             
         return healthy_list, unhealthy_list
    
+def get_top_individuals(run, k=1, measurement="fitness", maximize=None):
+    """
+    Get the k best individuals per generation by a measurement.
+    
+    Only healthy individuals with a numeric value of the measurement are considered. The candidates are 
+    selected per generation with a partial sort of the results table, so only the chromosomes of the 
+    selected individuals are read.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+        k (int, optional): The number of individuals per generation. Defaults to 1.
+        measurement (str, optional): The measurement key to rank by. Defaults to "fitness".
+        maximize (bool, optional): If True, the highest values are the best, if False the lowest. 
+                                   Defaults to the 'objective-direction' of the measurement.
+
+    Returns:
+        dict: Generation dictionnairy with a list of the best individuals, best first, each a dictionnairy of 
+              "individual", its "results" and "chromosome".
+
+    Example:
+    >>> get_top_individuals('my_run', k=2, measurement='val_acc')[1]
+    [{'individual': 'clay_poodle', 'results': {...}, 'chromosome': [...]}, {'individual': 'shy_owl', ...}]
+    """
+    table = get_results_table(run)
+    
+    if maximize is None:
+        maximize = get_meas_info(run).get(measurement, {}).get("objective-direction", "maximize") == "maximize"
+    
+    # Values of the measurement, also if it isn't configured
+    if measurement in table["measurements"]:
+        values = table["values"][:, table["measurements"].index(measurement)]
+    else:
+        values = np.array([
+            value if isinstance(value, (int, float)) and not isinstance(value, bool) else np.nan 
+            for value in (result.get(measurement) if isinstance(result, dict) else None for result in table["results"])
+        ], dtype=np.float64)
+    
+    # Rank by descending score with invalid values last
+    scores = np.where(table["healthy"] & ~np.isnan(values), values if maximize else -values, -np.inf)
+    
+    generations = np.unique(table["generations"])
+    starts = np.searchsorted(table["generations"], generations, side="left")
+    ends = np.searchsorted(table["generations"], generations, side="right")
+    
+    top_individuals = {}
+    
+    for generation, start, end in zip(generations.tolist(), starts, ends):
+        
+        generation_scores = scores[start:end]
+        
+        # Partial sort of the k best candidates, then order them
+        if k < len(generation_scores):
+            candidates = np.argpartition(-generation_scores, k - 1)[:k]
+        else:
+            candidates = np.arange(len(generation_scores))
+        
+        candidates = candidates[np.argsort(-generation_scores[candidates], kind="stable")]
+        candidates = candidates[np.isfinite(generation_scores[candidates])]
+        
+        top_individuals[generation] = [
+            {
+                "individual": table["individuals"][start + row],
+                "results": table["results"][start + row],
+                "chromosome": get_individual_chromosome(run, generation, table["individuals"][start + row]),
+            }
+            for row in candidates.tolist()
+        ]
+    
+    return top_individuals
+
 def get_best_individuals(run):
     """Get the individuals with the highest fitness value per generation.
 
@@ -501,40 +527,511 @@ def get_best_individuals(run):
         dict: Generation dictionnairy with dictionnairy of "individual", its "results" and "chromosome"
     """
     
-    results = get_individuals(run, generation_range=None, value="results", as_generation_dict=True)
-    chromosomes = get_individuals(run, generation_range=None, value="chromosome", as_generation_dict=True)
-    
     best_individuals = {}
     
-    for gen, individuals in results.items():
+    for gen, individuals in get_top_individuals(run, k=1, measurement="fitness", maximize=True).items():
+        best_individuals[gen] = individuals[0] if individuals else {
+            "individual": None,
+            "results": None,
+            "chromosome": None,
+        }
         
-        best_fitness = 0
-        best_ind = None
-        best_result = None
-        best_chromosome = None
+    return best_individuals
+
+
+### COLUMNAR RUN DATA ###
+# Per run caches of the processed generations. Processed generations don't change anymore,
+# so their files are read only once and new generations are appended as they are processed.
+_chromosome_caches = {}
+
+def _get_chromosome_cache(run):
+    """
+    Get the chromosome cache of a run, creating it if necessary.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+
+    Returns:
+        dict: The cache with the layer vocabulary ("layers", "layer_index"), the encoded generations ("generations") 
+              and the assembled tables ("tables").
+    """
+    if run not in _chromosome_caches:
+        _chromosome_caches[run] = {"layers": [], "layer_index": {}, "generations": {}, "tables": {}}
         
-        for ind, results in individuals.items():
-            
-            # TODO Why None
-            if results is not None:
-                ind_fitness = results["fitness"]
+    return _chromosome_caches[run]
+
+def _encode_generation_chromosomes(run, generation):
+    """
+    Read the chromosomes of a generation once and encode their genes as integer layer codes.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+        generation (int): The generation number.
+
+    Returns:
+        dict: A dictionary with the sorted individual names ("individuals"), their chromosomes ("chromosomes"),
+              the concatenated layer codes of their genes ("gene_layers"), the number of genes per individual ("lengths")
+              and the canonical architecture hashes ("hashes").
+    """
+    cache = _get_chromosome_cache(run)
+    
+    if generation in cache["generations"]:
+        return cache["generations"][generation]
+    
+    layer_index = cache["layer_index"]
+    individuals = _get_individuals_of_generation(run, generation, "names")
+    chromosomes = []
+    gene_layers = []
+    lengths = []
+    hashes = []
+    
+    for individual in individuals:
+        chromosome = get_individual_chromosome(run, generation, individual)
+        
+        # Missing or unreadable chromosomes have no genes
+        if not isinstance(chromosome, list):
+            chromosomes.append(None)
+            lengths.append(0)
+            hashes.append(None)
+            continue
+        
+        for gene in chromosome:
+            layer = gene.get("layer")
             
-                if ind_fitness > best_fitness:
-                    best_fitness = ind_fitness
-                    best_ind = ind
-                    best_result = results
-                    best_chromosome = chromosomes[gen][ind]
+            if layer not in layer_index:
+                layer_index[layer] = len(cache["layers"])
+                cache["layers"].append(layer)
+                
+            gene_layers.append(layer_index[layer])
         
-        best_individuals[gen] = {
-            "individual": best_ind,
-            "results": best_result,
-            "chromosome": best_chromosome,
-        }
+        chromosomes.append(chromosome)
+        lengths.append(len(chromosome))
+        hashes.append(get_architecture_hash(chromosome))
+    
+    encoded = {
+        "individuals": individuals,
+        "chromosomes": chromosomes,
+        "gene_layers": np.array(gene_layers, dtype=np.int32),
+        "lengths": np.array(lengths, dtype=np.int64),
+        "hashes": hashes,
+    }
+    cache["generations"][generation] = encoded
+    
+    return encoded
+
+def get_chromosome_table(run):
+    """
+    Get the chromosomes of all processed generations as columnar table.
+    
+    The genes of all individuals are stored as one array of integer layer codes. The genes of individual i are 
+    gene_layers[gene_offsets[i]:gene_offsets[i+1]]. Only generations which weren't read before are loaded from disk.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+
+    Returns:
+        dict: A dictionary containing:
+              - 'layers': The layer vocabulary, the position of a layer is its code.
+              - 'generations': Array with the generation number of every individual.
+              - 'individuals': List with the names of the individuals.
+              - 'chromosomes': List with the chromosomes of the individuals (None if missing).
+              - 'gene_layers': Array with the layer codes of all genes.
+              - 'gene_offsets': Array with the start of every individual's genes in gene_layers.
+              - 'architecture_hashes': List with the canonical architecture hash of every individual (None if missing).
+              
+    Example:
+    >>> table = get_chromosome_table('my_run')
+    >>> table['layers'][table['gene_layers'][0]]
+    'Rescaling'
+    """
+    cache = _get_chromosome_cache(run)
+    generations = tuple(get_generations(run, as_int=True))
+    
+    if generations in cache["tables"]:
+        return cache["tables"][generations]
+    
+    encoded = [_encode_generation_chromosomes(run, generation) for generation in generations]
+    lengths = np.concatenate([enc["lengths"] for enc in encoded]) if encoded else np.zeros(0, dtype=np.int64)
+    
+    table = {
+        "layers": list(cache["layers"]),
+        "generations": np.repeat(np.array(generations, dtype=np.int64), [len(enc["individuals"]) for enc in encoded]),
+        "individuals": [ind for enc in encoded for ind in enc["individuals"]],
+        "chromosomes": [chromosome for enc in encoded for chromosome in enc["chromosomes"]],
+        "gene_layers": np.concatenate([enc["gene_layers"] for enc in encoded]) if encoded else np.zeros(0, dtype=np.int32),
+        "gene_offsets": np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64),
+        "architecture_hashes": [chromosome_hash for enc in encoded for chromosome_hash in enc["hashes"]],
+    }
+    
+    # Only the table of the current generations is kept
+    cache["tables"] = {generations: table}
+    
+    return table
+
+
+_results_caches = {}
+
+def _is_healthy(result):
+    """
+    Check whether an individual was successfully trained.
+
+    Args:
+        result (dict or None): The results of the individual.
+
+    Returns:
+        bool: True if the results exist and don't report an error.
+    """
+    return isinstance(result, dict) and ("error" not in result or result["error"] == "False" or result["error"] == False)
+
+def _encode_generation_results(run, generation):
+    """
+    Read the results of a generation once.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+        generation (int): The generation number.
+
+    Returns:
+        dict: A dictionary with the sorted individual names ("individuals"), their results ("results"), 
+              their health ("healthy") and the numeric columns of the measurements read so far ("columns").
+    """
+    cache = _results_caches.setdefault(run, {"generations": {}, "tables": {}})
+    
+    if generation in cache["generations"]:
+        return cache["generations"][generation]
+    
+    individuals = _get_individuals_of_generation(run, generation, "names")
+    results = [get_individual_result(run, generation, individual) for individual in individuals]
+    
+    encoded = {
+        "individuals": individuals,
+        "results": results,
+        "healthy": np.array([_is_healthy(result) for result in results], dtype=bool),
+        "columns": {},
+    }
+    cache["generations"][generation] = encoded
+    
+    return encoded
+
+def _get_results_column(encoded, measurement):
+    """
+    Get the values of a measurement of an encoded generation as float array.
+
+    Args:
+        encoded (dict): The encoded generation from _encode_generation_results.
+        measurement (str): The measurement key.
+
+    Returns:
+        numpy.ndarray: The measurement values, NaN where missing or not numeric.
+    """
+    if measurement not in encoded["columns"]:
+        values = [
+            result.get(measurement) if isinstance(result, dict) else None 
+            for result in encoded["results"]
+        ]
+        encoded["columns"][measurement] = np.array(
+            [value if isinstance(value, (int, float)) and not isinstance(value, bool) else np.nan for value in values], 
+            dtype=np.float64
+        )
         
-    return best_individuals
+    return encoded["columns"][measurement]
+
+def get_results_table(run):
+    """
+    Get the results of all processed generations as columnar table.
+    
+    The rows are in the same order as the rows of the chromosome table. Only generations which weren't read 
+    before are loaded from disk.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+
+    Returns:
+        dict: A dictionary containing:
+              - 'measurements': The measurement keys of the config.json file, the position of a measurement is its column.
+              - 'generations': Array with the generation number of every individual.
+              - 'individuals': List with the names of the individuals.
+              - 'results': List with the results of the individuals (None if missing).
+              - 'healthy': Boolean array, True for individuals that were successfully trained.
+              - 'values': Matrix (individuals x measurements) of the measurement values, NaN where missing or not numeric.
+
+    Example:
+    >>> table = get_results_table('my_run')
+    >>> table['values'][table['healthy'], table['measurements'].index('fitness')].max()
+    0.8724
+    """
+    cache = _results_caches.setdefault(run, {"generations": {}, "tables": {}})
+    generations = tuple(get_generations(run, as_int=True))
+    measurements = tuple(get_meas_info(run).keys())
+    key = (generations, measurements)
+    
+    if key in cache["tables"]:
+        return cache["tables"][key]
+    
+    encoded = [_encode_generation_results(run, generation) for generation in generations]
+    
+    table = {
+        "measurements": list(measurements),
+        "generations": np.repeat(np.array(generations, dtype=np.int64), [len(enc["individuals"]) for enc in encoded]),
+        "individuals": [ind for enc in encoded for ind in enc["individuals"]],
+        "results": [result for enc in encoded for result in enc["results"]],
+        "healthy": np.concatenate([enc["healthy"] for enc in encoded]) if encoded else np.zeros(0, dtype=bool),
+        "values": np.column_stack([
+            np.concatenate([_get_results_column(enc, measurement) for enc in encoded]) if encoded else np.zeros(0)
+            for measurement in measurements
+        ]) if measurements else np.zeros((sum(len(enc["individuals"]) for enc in encoded), 0)),
+    }
+    
+    # Only the table of the current generations is kept
+    cache["tables"] = {key: table}
+    
+    return table
+
+_generation_statistics = {}
+
+def get_generation_statistics(run, quantiles=(0.25, 0.5, 0.75)):
+    """
+    Get count, mean, standard deviation, minimum, maximum and quantiles of every measurement per generation.
+    
+    The statistics of all measurements are computed in one grouped pass over the healthy individuals of the 
+    results table. Values outside the 'min-boundary' and 'max-boundary' of a measurement are left out.
+    The statistics are cached until a new generation is processed or the config changes.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+        quantiles (tuple, optional): The quantiles to compute. Defaults to (0.25, 0.5, 0.75).
+
+    Returns:
+        dict: A dictionary containing:
+              - 'generations': The generation numbers.
+              - 'quantiles': The computed quantiles.
+              - 'statistics': Maps every measurement to a dictionary with the arrays 'count', 'mean', 'std', 'min' 
+                and 'max' (one value per generation) and 'quantiles' (generations x quantiles). Statistics of 
+                generations without valid values are NaN.
+
+    Example:
+    >>> statistics = get_generation_statistics('my_run')
+    >>> statistics['statistics']['val_acc']['mean']
+    array([0.61, 0.68, ...])
+    """
+    table = get_results_table(run)
+    meas_infos = get_meas_info(run)
+    measurements = table["measurements"]
+    boundaries = tuple((meas_infos[meas]["min-boundary"], meas_infos[meas]["max-boundary"]) for meas in measurements)
+    generations = np.unique(table["generations"])
+    quantiles = tuple(quantiles)
+    key = (tuple(generations), tuple(measurements), boundaries, quantiles)
+    
+    cached = _generation_statistics.get(run)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    
+    # Valid values of the healthy individuals within the boundaries
+    values = table["values"]
+    lower = np.array([-np.inf if low is None else low for low, _ in boundaries], dtype=np.float64)
+    upper = np.array([np.inf if high is None else high for _, high in boundaries], dtype=np.float64)
+    
+    with np.errstate(invalid="ignore"):
+        valid = table["healthy"][:, None] & ~np.isnan(values) & (values >= lower) & (values <= upper)
+    
+    # Generation groups are contiguous, so group sums are differences of cumulative sums
+    starts = np.searchsorted(table["generations"], generations, side="left")
+    ends = np.searchsorted(table["generations"], generations, side="right")
+    group = np.searchsorted(generations, table["generations"])
+    
+    def group_sums(matrix):
+        cumulative = np.vstack([np.zeros((1, matrix.shape[1])), np.cumsum(matrix, axis=0)])
+        return cumulative[ends] - cumulative[starts]
+    
+    filled = np.where(valid, values, 0.0)
+    count = group_sums(valid.astype(np.float64))
+    
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = group_sums(filled) / count
+        deviation = np.where(valid, values - mean[group], 0.0)
+        std = np.sqrt(group_sums(deviation ** 2) / count)
+    
+    # Minimum, maximum and quantiles from the values sorted within every generation
+    sorted_values = np.empty_like(values)
+    
+    for column in range(values.shape[1]):
+        ordered = np.where(valid[:, column], values[:, column], np.inf)
+        order = np.lexsort((ordered, group))
+        sorted_values[:, column] = ordered[order]
+    
+    has_values = count > 0
+    columns = np.arange(values.shape[1])
+    minimum = np.where(has_values, sorted_values[np.minimum(starts, len(values) - 1)][:, columns] if len(values) else 0.0, np.nan)
+    last = np.clip(starts[:, None] + count.astype(np.int64) - 1, 0, max(len(values) - 1, 0))
+    maximum = np.where(has_values, sorted_values[last, columns] if len(values) else 0.0, np.nan)
+    
+    quantile_values = np.full((len(generations), values.shape[1], len(quantiles)), np.nan)
+    
+    for idx, quantile in enumerate(quantiles):
+        position = starts[:, None] + quantile * np.maximum(count - 1, 0)
+        below = np.clip(np.floor(position).astype(np.int64), 0, max(len(values) - 1, 0))
+        above = np.clip(np.ceil(position).astype(np.int64), 0, max(len(values) - 1, 0))
+        fraction = position - np.floor(position)
+        
+        if len(values):
+            interpolated = sorted_values[below, columns] + fraction * (sorted_values[above, columns] - sorted_values[below, columns])
+            quantile_values[:, :, idx] = np.where(has_values, np.where(fraction == 0, sorted_values[below, columns], interpolated), np.nan)
+    
+    statistics = {
+        "generations": [int(generation) for generation in generations],
+        "quantiles": list(quantiles),
+        "statistics": {
+            measurement: {
+                "count": count[:, column].astype(np.int64),
+                "mean": mean[:, column],
+                "std": std[:, column],
+                "min": minimum[:, column],
+                "max": maximum[:, column],
+                "quantiles": quantile_values[:, column, :],
+            }
+            for column, measurement in enumerate(measurements)
+        },
+    }
+    _generation_statistics[run] = (key, statistics)
+    
+    return statistics
+
+
+_measurement_bounds = {}
+
+def get_measurement_bounds(run):
+    """
+    Get the minimum and maximum value of every measurement over the run and per generation.
+    
+    The bounds are computed once from the healthy individuals of the results table, values are clipped
+    to the 'min-boundary' and 'max-boundary' of a measurement. They are cached until a new generation 
+    is processed or the config changes.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+
+    Returns:
+        dict: A dictionary containing:
+              - 'generations': The generation numbers.
+              - 'run': Maps every measurement to a (min, max) tuple over the run, (None, None) if there are no values.
+              - 'generation': Maps every generation to a dictionary mapping every measurement to a (min, max) tuple.
+
+    Example:
+    >>> bounds = get_measurement_bounds('my_run')
+    >>> bounds['run']['inference_time'], bounds['generation'][3]['inference_time']
+    ((0.19, 1.43), (0.21, 0.98))
+    """
+    table = get_results_table(run)
+    meas_infos = get_meas_info(run)
+    measurements = table["measurements"]
+    boundaries = tuple((meas_infos[meas]["min-boundary"], meas_infos[meas]["max-boundary"]) for meas in measurements)
+    generations = np.unique(table["generations"])
+    key = (tuple(generations), tuple(measurements), boundaries)
+    
+    cached = _measurement_bounds.get(run)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    
+    # Clip the values of the healthy individuals to the boundaries
+    lower = np.array([-np.inf if low is None else low for low, _ in boundaries], dtype=np.float64)
+    upper = np.array([np.inf if high is None else high for _, high in boundaries], dtype=np.float64)
+    values = np.where(table["healthy"][:, None], np.clip(table["values"], lower, upper), np.nan)
+    
+    # Generation groups are contiguous, NaN values are ignored
+    starts = np.searchsorted(table["generations"], generations, side="left")
+    
+    if len(values):
+        minimum = np.fmin.reduceat(values, starts, axis=0)
+        maximum = np.fmax.reduceat(values, starts, axis=0)
+    else:
+        minimum = maximum = np.zeros((0, len(measurements)))
+    
+    def as_bounds(low, high):
+        return (None, None) if np.isnan(low) else (float(low), float(high))
+    
+    with np.errstate(invalid="ignore"):
+        run_minimum = np.fmin.reduce(minimum, axis=0) if len(minimum) else np.full(len(measurements), np.nan)
+        run_maximum = np.fmax.reduce(maximum, axis=0) if len(maximum) else np.full(len(measurements), np.nan)
+    
+    bounds = {
+        "generations": [int(generation) for generation in generations],
+        "run": {meas: as_bounds(run_minimum[col], run_maximum[col]) for col, meas in enumerate(measurements)},
+        "generation": {
+            int(generation): {meas: as_bounds(minimum[row, col], maximum[row, col]) for col, meas in enumerate(measurements)}
+            for row, generation in enumerate(generations)
+        },
+    }
+    _measurement_bounds[run] = (key, bounds)
+    
+    return bounds
 
 
 ### GENES ###
+_gene_frequencies = {}
+
+def get_gene_frequencies(run):
+    """
+    Get the gene frequency matrix of all layer types and processed generations.
+    
+    The matrix is computed in one vectorized pass over the chromosome table and cached until a new generation is processed.
+    
+    Args:
+        run (str): The path of the ENAS run results directory.
+        
+    Returns:
+        dict: A dictionary containing:
+              - 'layers': The layer identifiers of the matrix rows.
+              - 'layer_index': Maps layer identifiers to their row.
+              - 'generations': The generation numbers of the matrix columns.
+              - 'counts': Matrix (layers x generations) with the number of genes of a layer in a generation.
+              - 'presence': Matrix (layers x generations) with the number of individuals containing a layer in a generation.
+              
+    Example:
+    >>> frequencies = get_gene_frequencies('my_run')
+    >>> frequencies['counts'][frequencies['layer_index']['C_2D']]
+    array([21, 30, 44, ...])
+    """
+    table = get_chromosome_table(run)
+    generations = np.unique(table["generations"])
+    key = tuple(generations)
+    
+    cached = _gene_frequencies.get(run)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    
+    num_layers = len(table["layers"])
+    num_generations = len(generations)
+    
+    # Generation column and individual of every gene
+    lengths = np.diff(table["gene_offsets"])
+    individual_generation = np.searchsorted(generations, table["generations"])
+    gene_individual = np.repeat(np.arange(len(lengths)), lengths)
+    gene_generation = individual_generation[gene_individual]
+    
+    # Number of genes per layer and generation
+    counts = np.bincount(
+        table["gene_layers"] * num_generations + gene_generation, 
+        minlength=num_layers * num_generations
+    ).reshape(num_layers, num_generations)
+    
+    # Number of individuals per layer and generation (a layer is counted once per individual)
+    individual_layers = np.unique(gene_individual * num_layers + table["gene_layers"])
+    presence = np.bincount(
+        (individual_layers % num_layers) * num_generations + individual_generation[individual_layers // num_layers], 
+        minlength=num_layers * num_generations
+    ).reshape(num_layers, num_generations)
+    
+    frequencies = {
+        "layers": table["layers"],
+        "layer_index": {layer: idx for idx, layer in enumerate(table["layers"])},
+        "generations": [int(generation) for generation in generations],
+        "counts": counts,
+        "presence": presence,
+    }
+    _gene_frequencies[run] = (key, frequencies)
+    
+    return frequencies
+
 def get_number_of_genes(run, generation, genename):
     """
     Get the number of genes in a certain generation.
@@ -547,18 +1044,176 @@ def get_number_of_genes(run, generation, genename):
     Returns:
         count (int): Number of genes
     """
-    chromosomes = get_individuals(run, range(generation, generation+1), value="chromosome", as_generation_dict=False)
+    frequencies = get_gene_frequencies(run)
+    
+    if genename not in frequencies["layer_index"] or generation not in frequencies["generations"]:
+        return 0
+    
+    row = frequencies["layer_index"][genename]
+    column = frequencies["generations"].index(generation)
+
+    return int(frequencies["counts"][row, column])
+
+
+
+### ARCHITECTURES ###
+def _normalize_parameter(value):
+    """
+    Normalize a gene parameter for the canonical architecture hash.
 
-    count = 0
-    for chromosome in chromosomes:
-        if chromosome is not None:
-            for gene in chromosome:
+    Integral floats become integers, floats are rounded to 10 digits and strings are stripped, so equal parameters
+    written differently get the same representation.
 
-                if gene["layer"] == genename:
-                    count += 1
+    Args:
+        value: The parameter value.
+
+    Returns:
+        The normalized value.
+    """
+    if isinstance(value, bool) or value is None:
+        return value
+    if isinstance(value, float):
+        return int(value) if value.is_integer() else round(value, 10)
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, (list, tuple)):
+        return [_normalize_parameter(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): _normalize_parameter(item) for key, item in value.items()}
+    
+    return value
+
+def get_architecture_hash(chromosome):
+    """
+    Get the canonical hash of the architecture encoded by a chromosome.
+
+    The hash covers the genes in their order with their parameters sorted by name and normalized, so
+    identical architectures get the same hash independent of the key order in chromosome.json.
+
+    Args:
+        chromosome (list): The genes of the chromosome.
+
+    Returns:
+        str: The hexadecimal hash, None if the chromosome isn't a list of genes.
+
+    Example:
+    >>> get_architecture_hash([{'layer': 'C_2D', 'filters': 32.0}, {'layer': 'GAP_2D'}])
+    '21aaf577b4b03aa4'
+    """
+    if not isinstance(chromosome, list):
+        return None
 
-    return count
+    canonical = json.dumps([_normalize_parameter(gene) for gene in chromosome], sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()[:16]
 
+_duplicate_indexes = {}
+
+def get_duplicate_index(run):
+    """
+    Get the groups of individuals with identical architectures over all processed generations as columnar index.
+
+    The groups are formed from the architecture hashes computed when the chromosomes are read, so no chromosome
+    is scanned again. The spread of the measurements covers the healthy individuals of a group with values within
+    the 'min-boundary' and 'max-boundary'.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+
+    Returns:
+        dict: A dictionary containing:
+              - 'measurements': The measurement keys, the position of a measurement is its column.
+              - 'generations': The generation numbers.
+              - 'hashes': Array with the architecture hash of every group.
+              - 'first_generation': Array with the generation every architecture occurred first.
+              - 'count': Array with the number of individuals of every group.
+              - 'generation_count': Array with the number of generations every architecture occurs in.
+              - 'rows': Chromosome table rows of the group members, grouped by architecture.
+              - 'starts': Array with the start of every group's members in 'rows'.
+              - 'group_index': A dictionary mapping architecture hashes to their group.
+              - 'min', 'max', 'std': Matrices (groups x measurements) of the measurement spread, NaN without valid values.
+              - 'distinct': Array with the number of distinct architectures per generation.
+              - 'novel': Array with the number of architectures per generation that didn't occur in earlier generations.
+              - 'individuals': Array with the number of individuals with chromosome per generation.
+              - 'uniqueness': Array with the ratio of distinct architectures to individuals per generation.
+
+    Example:
+    >>> index = get_duplicate_index('my_run')
+    >>> index['uniqueness']
+    array([1.  , 0.95, 0.85, ...])
+    """
+    table = get_chromosome_table(run)
+    results = get_results_table(run)
+    meas_infos = get_meas_info(run)
+    boundaries = tuple((meas_infos[meas]["min-boundary"], meas_infos[meas]["max-boundary"]) for meas in results["measurements"])
+    generations = [int(generation) for generation in np.unique(table["generations"])]
+    key = (tuple(generations), tuple(results["measurements"]), boundaries)
+
+    cached = _duplicate_indexes.get(run)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    # Architecture code of every individual with chromosome, members of a group are contiguous
+    rows = np.array([idx for idx, chromosome_hash in enumerate(table["architecture_hashes"]) if chromosome_hash is not None], dtype=np.int64)
+    hashes, codes = np.unique(np.array([table["architecture_hashes"][idx] for idx in rows], dtype=str), return_inverse=True)
+    codes = codes.reshape(-1)
+    order = np.argsort(codes, kind="stable")
+    rows, codes = rows[order], codes[order]
+    starts = np.searchsorted(codes, np.arange(len(hashes)))
+    columns = np.searchsorted(generations, table["generations"][rows])
+    num_generations = len(generations)
+
+    # Distinct and novel architectures per generation
+    occurrences = np.unique(codes * num_generations + columns)
+    distinct = np.bincount(occurrences % num_generations, minlength=num_generations) if num_generations else np.zeros(0, dtype=np.int64)
+    generation_count = np.bincount(occurrences // num_generations, minlength=len(hashes)) if num_generations else np.zeros(0, dtype=np.int64)
+    first_columns = np.minimum.reduceat(columns, starts) if len(hashes) else np.zeros(0, dtype=np.int64)
+    novel = np.bincount(first_columns, minlength=num_generations)
+    individuals = np.bincount(columns, minlength=num_generations)
+
+    # Valid measurement values of the healthy individuals within the boundaries
+    lower = np.array([-np.inf if low is None else low for low, _ in boundaries], dtype=np.float64)
+    upper = np.array([np.inf if high is None else high for _, high in boundaries], dtype=np.float64)
+    values = results["values"][rows]
+
+    with np.errstate(invalid="ignore"):
+        valid = results["healthy"][rows][:, None] & (values >= lower) & (values <= upper)
+
+    # Measurement spread per group
+    num_measurements = values.shape[1]
+    
+    if len(hashes):
+        count = np.add.reduceat(valid.astype(np.float64), starts, axis=0)
+        
+        with np.errstate(invalid="ignore", divide="ignore"):
+            minimum = np.where(count > 0, np.fmin.reduceat(np.where(valid, values, np.nan), starts, axis=0), np.nan)
+            maximum = np.where(count > 0, np.fmax.reduceat(np.where(valid, values, np.nan), starts, axis=0), np.nan)
+            mean = np.add.reduceat(np.where(valid, values, 0.0), starts, axis=0) / count
+            deviation = np.where(valid, values - np.repeat(mean, np.diff(np.append(starts, len(rows))), axis=0), 0.0)
+            std = np.where(count > 0, np.sqrt(np.add.reduceat(deviation ** 2, starts, axis=0) / count), np.nan)
+    else:
+        minimum = maximum = std = np.zeros((0, num_measurements))
+
+    index = {
+        "measurements": list(results["measurements"]),
+        "generations": generations,
+        "hashes": hashes,
+        "first_generation": np.array(generations, dtype=np.int64)[first_columns] if len(hashes) else np.zeros(0, dtype=np.int64),
+        "count": np.diff(np.append(starts, len(rows))),
+        "generation_count": generation_count,
+        "rows": rows,
+        "starts": starts,
+        "group_index": {architecture_hash: group for group, architecture_hash in enumerate(hashes.tolist())},
+        "min": minimum,
+        "max": maximum,
+        "std": std,
+        "distinct": distinct,
+        "novel": novel,
+        "individuals": individuals,
+        "uniqueness": np.divide(distinct, individuals, out=np.full(num_generations, np.nan), where=individuals > 0),
+    }
+    _duplicate_indexes[run] = (key, index)
+
+    return index
 
 ### FAMILY TREE 
 def _get_crossover_parents(run):
@@ -669,8 +1324,8 @@ def _get_upstream_tree(run, generation, individual, generation_range):
 
     individual_el = [
         {'data': {'id': individual, 'label': individual[0:3], 'generation': generation, 'extinct': False}},
-        {'data': {'source': parent1, 'target': individual, 'edgelabel': crossover1}},
-        {'data': {'source': parent2, 'target': individual, 'edgelabel': crossover2}}
+        {'data': {'source': parent1, 'target': individual, 'edgelabel': crossover1, 'generation': generation}},
+        {'data': {'source': parent2, 'target': individual, 'edgelabel': crossover2, 'generation': generation}}
     ]
 
     # Recursion for moving up the tree
@@ -713,7 +1368,7 @@ def _get_downstream_tree(run, generation, individual, generation_range):
     individual_el = [{'data': {'id': individual, 'label': individual[0:3], 'generation': generation, 'extinct': extinct}}]
 
     for idx, child in enumerate(children):
-        individual_el.append({'data': {'source': individual, 'target': child, 'edgelabel': crossover[idx]}})
+        individual_el.append({'data': {'source': individual, 'target': child, 'edgelabel': crossover[idx], 'generation': generation+1}})
 
     # Recursion for moving down the tree
     children_tree = []
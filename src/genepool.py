@@ -1,6 +1,9 @@
 import json
+import os
+import hashlib
 from matplotlib.colors import hex2color, rgb2hex
 import numpy as np
+from evolution import get_chromosome_table, get_results_table
 
 
 ##########################################################################################
@@ -61,6 +64,300 @@ def _get_search_space(run):
     """
     return _json_to_dict(f"{run}/search_space.json")
 
+### COMPILED SEARCH SPACE ###
+# Rule target marking the end of a chromosome
+END_LAYER = "End"
+SYMBOL_LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
+UNKNOWN_SYMBOL = "?"
+
+class SearchSpace:
+    """
+    Compiled representation of the search space of an ENAS run.
+
+    The search space JSON is walked once and turned into lookup tables, so the gene pool 
+    functions can answer their queries without re-reading and re-walking the rule sets.
+
+    Args:
+        search_space (dict): The search space as read from the search_space.json file.
+
+    Attributes:
+        signature (str): Hash of the search space content.
+        genes (list): Flattened genes of the gene pool with their group information.
+        gene_table (dict): Maps layer identifiers to their flattened gene.
+        groups (dict): Maps group names to lists of layer identifiers.
+        layer_groups (dict): Maps layer identifiers to the set of groups containing the layer.
+        rule_graph (dict): Layer connections from the 'rule_set' only. Values are ordered lists without duplicates.
+        layer_graph (dict): Layer connections from the 'rule_set' and the 'rule_set_group'. Values are ordered lists without duplicates.
+        layer_adjacency (dict): The connections of the layer graph as sets of target layers.
+        group_graph (dict): Group connections of the 'rule_set_group' entries that are not excluded.
+        reachable_layers (list): Layers reachable from the 'Start' layer in DFS order.
+        reachable_layer_set (set): The reachable layers as a set.
+        colors (dict): Maps the reachable layers to their unique colors in hexadecimal format.
+        layers (list): All layers of the layer graph. The position of a layer is its bit in the reachability bitsets.
+        layer_index (dict): Maps layer identifiers to their position in layers.
+        reachability (list): Transitive closure of the layer graph. Bit j of reachability[i] is set if layers[j] is reachable from layers[i].
+        end_layers (set): Layers at which a chromosome can end.
+        end_reaching_layers (set): Layers from which an end layer is reachable.
+        dead_end_layers (list): Layers reachable from 'Start' that can't reach an end layer.
+        transition_table (numpy.ndarray): Matrix (layers x layers) with 1 where a layer may follow another layer.
+        layout (dict): Preset positions of the gene pool graph nodes, see get_genepool_layout.
+        symbols (dict): Maps layer identifiers to their one-letter sequence symbol, None for layers which aren't encoded.
+        symbol_variants (dict): Maps layer identifiers to a list of (parameters, symbol) tuples for genes with matching parameters.
+
+    Raises:
+        KeyError: If the expected keys ('rule', 'layer', 'group') are not present in the search space data.
+        TypeError: If the data structure of the search space is not as expected.
+
+    Example:
+        >>> space = SearchSpace(_get_search_space('run_123'))
+        >>> 'MAG_2D' in space.layer_adjacency['STFT_2D']
+        True
+    """
+    def __init__(self, search_space):
+        # Content signature that identifies the search space across sessions
+        self.signature = hashlib.sha1(json.dumps(search_space, sort_keys=True).encode()).hexdigest()
+
+        try:
+            # Gene table and group membership
+            self.genes = []
+            self.gene_table = {}
+            self.groups = {}
+            self.layer_groups = {}
+
+            for group, group_layers in search_space.get("gene_pool", {}).items():
+                self.groups[group] = [gene["layer"] for gene in group_layers]
+
+                for gene in group_layers:
+                    gene_with_group = gene.copy()
+                    gene_with_group["group"] = group
+
+                    self.genes.append(gene_with_group)
+                    self.gene_table.setdefault(gene["layer"], gene_with_group)
+                    self.layer_groups.setdefault(gene["layer"], set()).add(group)
+
+            # Layer connections of the rule set
+            self.rule_graph = {}
+
+            for src_layer, rule in search_space.get("rule_set", {}).items():
+                self.rule_graph[src_layer] = list(dict.fromkeys(rule.get("rule", [])))
+
+            # Layer connections of the rule set extended by the group rules
+            self.layer_graph = {layer: targets.copy() for layer, targets in self.rule_graph.items()}
+            self.layer_adjacency = {layer: set(targets) for layer, targets in self.rule_graph.items()}
+            self.group_graph = {}
+
+            for group_rule in search_space.get("rule_set_group", []):
+                source_group = group_rule["group"]
+                target_groups = group_rule.get("rule", [])
+
+                if not group_rule.get("exclude", False):
+                    self.group_graph[source_group] = target_groups
+
+                for target_group in target_groups:
+                    for src_layer in self.groups.get(source_group, []):
+                        targets = self.layer_graph.setdefault(src_layer, [])
+                        adjacency = self.layer_adjacency.setdefault(src_layer, set())
+
+                        for target_layer in self.groups.get(target_group, []):
+                            if target_layer not in adjacency:
+                                targets.append(target_layer)
+                                adjacency.add(target_layer)
+
+        except KeyError as key_error:
+            raise KeyError(f"Expected key not found in search space data: {key_error}")
+
+        except TypeError as type_error:
+            raise TypeError(f"Unexpected data structure in search space data: {type_error}")
+
+        # Reachable layers and their colors
+        self.reachable_layers = self.get_connected_layers("Start") if "Start" in self.layer_graph else []
+        self.reachable_layer_set = set(self.reachable_layers)
+        self.colors = {}
+
+        if self.reachable_layers:
+            color_scale = _generate_color_scale('#6173E9', '#B70202', len(self.reachable_layers))
+            self.colors = dict(zip(self.reachable_layers, color_scale))
+
+        # Transitive closure as bitsets over the layer graph
+        self.layers = list(dict.fromkeys(
+            list(self.layer_graph) 
+            + [target for targets in self.layer_graph.values() for target in targets] 
+            + list(self.gene_table)
+        ))
+        self.layer_index = {layer: idx for idx, layer in enumerate(self.layers)}
+        self.reachability = [0] * len(self.layers)
+
+        components = _get_strongly_connected_components(self.layer_graph, self.layers)
+        terminal_layers = []
+
+        for component in components:
+            members = set(component)
+            closure = 0
+            terminal = True
+
+            for layer in component:
+                closure |= 1 << self.layer_index[layer]
+
+                for target in self.layer_graph.get(layer, []):
+                    if target not in members:
+                        # Components are in reverse topological order, so the target is already closed
+                        closure |= self.reachability[self.layer_index[target]]
+                        terminal = False
+
+            for layer in component:
+                self.reachability[self.layer_index[layer]] = closure
+
+            if terminal:
+                terminal_layers += component
+
+        # End layers are the layers with an explicit 'End' rule, otherwise the layers of terminal components
+        if END_LAYER in self.layer_index:
+            self.end_layers = {layer for layer, targets in self.layer_graph.items() if END_LAYER in targets}
+            end_mask = 1 << self.layer_index[END_LAYER]
+        else:
+            self.end_layers = set(terminal_layers)
+            end_mask = 0
+            for layer in self.end_layers:
+                end_mask |= 1 << self.layer_index[layer]
+
+        self.end_reaching_layers = {layer for layer in self.layers if self.reachability[self.layer_index[layer]] & end_mask}
+        self.dead_end_layers = [
+            layer for layer in self.reachable_layers 
+            if layer not in ("Start", END_LAYER) and layer not in self.end_reaching_layers
+        ]
+
+        # Integer transition table of the layer graph (1 if the column layer may follow the row layer)
+        self.transition_table = np.zeros((len(self.layers), len(self.layers)), dtype=np.int8)
+
+        for layer, targets in self.layer_graph.items():
+            for target in targets:
+                self.transition_table[self.layer_index[layer], self.layer_index[target]] = 1
+
+        # Gene pool graph positions, computed on first use
+        self.layout = None
+
+        # One-letter alphabet of the gene sequences, missing symbols are assigned from the unused letters
+        self.symbols = {}
+        self.symbol_variants = {}
+
+        for layer, gene in self.gene_table.items():
+            if "symbol" in gene:
+                self.symbols[layer] = gene["symbol"]
+            self.symbol_variants[layer] = [
+                ({key: value for key, value in variant.items() if key != "symbol"}, variant["symbol"])
+                for variant in gene.get("symbol-variants", [])
+            ]
+
+        used_symbols = set(self.symbols.values()) | {symbol for variants in self.symbol_variants.values() for _, symbol in variants}
+        free_symbols = [symbol for symbol in SYMBOL_LETTERS if symbol not in used_symbols]
+
+        # Layers in sorted order, so the assigned symbols don't depend on the order of the gene pool
+        for layer in sorted(self.gene_table):
+            if layer not in self.symbols:
+                self.symbols[layer] = free_symbols.pop(0) if free_symbols else UNKNOWN_SYMBOL
+
+    def is_reachable(self, source_layer, target_layer):
+        """
+        Check whether a layer is reachable from another layer in the layer graph.
+
+        A layer is always reachable from itself.
+
+        Args:
+            source_layer (str): The layer where the path starts.
+            target_layer (str): The layer where the path ends.
+
+        Returns:
+            bool: True if target_layer is reachable from source_layer, False otherwise.
+
+        Example:
+            >>> space.is_reachable('Start', 'GAP_2D')
+            True
+        """
+        source_idx = self.layer_index.get(source_layer)
+        target_idx = self.layer_index.get(target_layer)
+
+        if source_idx is None or target_idx is None:
+            return source_layer == target_layer
+
+        return bool(self.reachability[source_idx] >> target_idx & 1)
+
+    def get_reachable_layers(self, source_layer):
+        """
+        Retrieve all layers reachable from a layer using the precomputed transitive closure.
+
+        Args:
+            source_layer (str): The layer where the paths start.
+
+        Returns:
+            set: The layers reachable from source_layer, including source_layer itself.
+        """
+        if source_layer not in self.layer_index:
+            return {source_layer}
+
+        closure = self.reachability[self.layer_index[source_layer]]
+        return {layer for idx, layer in enumerate(self.layers) if closure >> idx & 1}
+
+    def get_connected_layers(self, start_layer="Start"):
+        """
+        Retrieve the layers connected to the specified starting layer in DFS order.
+
+        Args:
+            start_layer (str): The layer from which to start exploring connected layers.
+
+        Returns:
+            list: A list of layers connected to the starting layer.
+
+        Raises:
+            ValueError: If the specified start_layer is not found in the layer graph.
+        """
+        if start_layer not in self.layer_graph:
+            raise ValueError(f"The specified start_layer '{start_layer}' is not found in the layer graph.")
+
+        visited = set()
+        result = []
+
+        _dfs(self.layer_graph, start_layer, visited, result)
+
+        return result
+
+# Compiled search spaces by run with the modification time of their search_space.json
+_compiled_search_spaces = {}
+
+def get_compiled_search_space(run):
+    """
+    Retrieve the compiled search space of a run.
+
+    The search space is compiled once per run and recompiled only if the search_space.json file changes.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+
+    Returns:
+        SearchSpace: The compiled search space of the run.
+
+    Raises:
+        FileNotFoundError: If the search_space.json file for the given run is not found.
+        json.JSONDecodeError: If there is an issue decoding the JSON data in the search_space.json file.
+
+    Example:
+    >>> space = get_compiled_search_space('evonas_run')
+    >>> space.reachable_layers
+    ['Start', 'STFT_2D', 'MAG_2D', ...]
+    """
+    filepath = f"{run}/search_space.json"
+
+    if not os.path.isfile(filepath):
+        raise FileNotFoundError(f"File not found: {filepath}")
+
+    modified = os.path.getmtime(filepath)
+    cached = _compiled_search_spaces.get(run)
+
+    if cached is None or cached[0] != modified:
+        cached = (modified, SearchSpace(_get_search_space(run)))
+        _compiled_search_spaces[run] = cached
+
+    return cached[1]
+
 def _get_groups(run):
     """
     Extract layer identifiers from the 'gene_pool' section of the search space.
@@ -71,16 +368,8 @@ def _get_groups(run):
     Returns:
         dict: A dictionary mapping group types to lists of layer identifiers.
     """
-    search_space = _get_search_space(run)
-    
-    layer_dict = {}
-    
-    for key, values in search_space.get("gene_pool", []).items():
-        
-        layer_identifiers = [val['layer'] for val in values]
-        layer_dict[key] = layer_identifiers
-        
-    return layer_dict
+    search_space = get_compiled_search_space(run)
+    return {group: layers.copy() for group, layers in search_space.groups.items()}
 
 def _get_genes_flattened(run):
     """
@@ -92,20 +381,8 @@ def _get_genes_flattened(run):
     Returns:
         list: A list of dictionaries representing flattened genes with group information.
     """
-    
-    search_space = _get_search_space(run)
-    groups = search_space.get("gene_pool", [])
-    
-    layers = []
-    
-    for group, group_layers in groups.items():
-        
-        for layer in group_layers:
-            layer_with_group = layer.copy()
-            layer_with_group['group'] = group
-            layers.append(layer_with_group)
-            
-    return layers
+    search_space = get_compiled_search_space(run)
+    return [gene.copy() for gene in search_space.genes]
   
     
 ### GRAPH CREATED FROM RULESETS ###         
@@ -130,49 +407,10 @@ def _get_layer_graph(run, group_connections=True):
         >>> _get_layer_graph("run_123")
         {'STFT_2D': ['MAG_2D'], 'MAG_2D': ['FB_2D'], 'FB_2D': ['C_2D', 'DC_2D', 'MAG2DEC_2D'], ...}
     """
-    try:
-        # Read search space from JSON
-        search_space = _get_search_space(run)
-
-        # Store layer connections in dictionary
-        graph = {}
-
-        # Process layers connections
-        for src_layer in search_space.get("rule_set", []):
-                     
-                # Identify target layers
-                target_layers = search_space["rule_set"].get(src_layer).get("rule", [])
-                graph[src_layer] = target_layers
-        
-        # Return graph without group connections
-        if not group_connections:
-            return graph       
-
-        # Process group connections
-        for group_rule in search_space.get("rule_set_group", []):
-            
-            # Identify source and target group
-            for target_group in group_rule.get("rule", []):
-                source_groups = group_rule.get("group", [])
-
-                # Identify source and target layers in source and target groups
-                groups = _get_groups(run)
-                source_layers = groups.get(source_groups, [])
-                target_layers = groups.get(target_group, [])
-
-                for src_layer in source_layers:
-                    if src_layer in graph:
-                        graph[src_layer] += target_layers
-                    else:
-                        graph[src_layer] = target_layers
-        
-        return graph
+    search_space = get_compiled_search_space(run)
+    graph = search_space.layer_graph if group_connections else search_space.rule_graph
 
-    except KeyError as key_error:
-        raise KeyError(f"Expected key not found in search space data: {key_error}")
-
-    except TypeError as type_error:
-        raise TypeError(f"Unexpected data structure in search space data: {type_error}")
+    return {layer: targets.copy() for layer, targets in graph.items()}
 
 def _get_group_graph(run):
     """
@@ -193,30 +431,8 @@ def _get_group_graph(run):
         >>> _get_group_graph("run_123")
         {'Feature Extraction 1D': ['Global Pooling 1D'], 'Feature Extraction 2D': ['Global Pooling 2D']}
     """
-    try:
-        # Read search space from JSON
-        search_space = _get_search_space(run)
-
-        # Store groups connections in dictionary
-        group_graph = {}
-
-        # Process group connections
-        for group_rule in search_space.get("rule_set_group", []):
-            excluded = group_rule.get("exclude", False)
-
-            if not excluded:
-                # Identify source and target group
-                source_group = group_rule["group"]
-                tar_get_groups = group_rule.get("rule", [])
-                group_graph[source_group] = tar_get_groups
-
-        return group_graph
-
-    except KeyError as key_error:
-        raise KeyError(f"Expected key not found in search space data: {key_error}")
-
-    except TypeError as type_error:
-        raise TypeError(f"Unexpected data structure in search space data: {type_error}")
+    search_space = get_compiled_search_space(run)
+    return {group: targets.copy() for group, targets in search_space.group_graph.items()}
  
  
 ### CONNECTED LAYERS ### 
@@ -241,12 +457,87 @@ def _dfs(graph, layer, visited, result):
         >>> print(result)
         ['A', 'B', 'D', 'C', 'E']
     """
-    if layer not in visited:
-        visited.add(layer)
-        result.append(layer)
+    # Iterate with a stack of neighbor iterators to keep the recursive preorder without recursion
+    stack = [iter([layer])]
+
+    while stack:
+        for neighbor in stack[-1]:
+            if neighbor not in visited:
+                visited.add(neighbor)
+                result.append(neighbor)
+                stack.append(iter(graph.get(neighbor, [])))
+                break
+        else:
+            stack.pop()
+
+def _get_strongly_connected_components(graph, layers):
+    """
+    Find the strongly connected components of the layer graph with an iterative Tarjan algorithm.
+
+    Args:
+        graph (dict): A dictionary representing the layer graph.
+        layers (list): All layers of the layer graph.
+
+    Returns:
+        list: A list of components, each a list of layers. Components are in reverse topological order,
+              so every component comes after all components reachable from it.
+
+    Example:
+        >>> graph = {'A': ['B'], 'B': ['C', 'A'], 'C': []}
+        >>> _get_strongly_connected_components(graph, ['A', 'B', 'C'])
+        [['C'], ['B', 'A']]
+    """
+    index = {}
+    lowlink = {}
+    stack = []
+    on_stack = set()
+    components = []
+
+    for root in layers:
+        if root in index:
+            continue
+
+        index[root] = lowlink[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(graph.get(root, [])))]
+
+        while work:
+            layer, neighbors = work[-1]
+
+            for neighbor in neighbors:
+                if neighbor not in index:
+                    index[neighbor] = lowlink[neighbor] = len(index)
+                    stack.append(neighbor)
+                    on_stack.add(neighbor)
+                    work.append((neighbor, iter(graph.get(neighbor, []))))
+                    break
+
+                elif neighbor in on_stack:
+                    lowlink[layer] = min(lowlink[layer], index[neighbor])
+
+            else:
+                work.pop()
+
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[layer])
+
+                # Layer is the root of a component
+                if lowlink[layer] == index[layer]:
+                    component = []
+
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+
+                        if member == layer:
+                            break
 
-        for neighbor in graph.get(layer, []):
-            _dfs(graph, neighbor, visited, result)
+                    components.append(component)
+
+    return components
 
 def _get_connected_layers(run, start_layer="Start"):
     """
@@ -266,23 +557,153 @@ def _get_connected_layers(run, start_layer="Start"):
         >>> _get_connected_layers('run_123', 'STFT_2D')
         ['STFT_2D', 'MAG_2D', 'FB_2D', 'C_2D', 'DC_2D', 'MAG2DEC_2D', ...]
     """
-    try:
-        graph = _get_layer_graph(run, group_connections=True)
-        if start_layer not in graph:
-            raise ValueError(f"The specified start_layer '{start_layer}' is not found in the layer graph.")
+    search_space = get_compiled_search_space(run)
 
-        visited = set()
-        result = []
+    if start_layer == "Start" and "Start" in search_space.layer_graph:
+        return search_space.reachable_layers.copy()
 
-        _dfs(graph, start_layer, visited, result)
-        
-        return result
+    return search_space.get_connected_layers(start_layer)
 
-    except KeyError as key_error:
-        raise KeyError(f"Expected key not found in layer graph data: {key_error}")
 
-    except TypeError as type_error:
-        raise TypeError(f"Unexpected data structure in layer graph data: {type_error}")
+### GENE POOL LAYOUT ###
+# Spacing of layer nodes within a group and spacing between group boxes in pixels
+NODE_SPACING = 90
+GROUP_SPACING = 160
+
+def _get_cache_dir(run):
+    """
+    Get the EvoVis cache directory inside the ENAS run results directory, creating it if necessary.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+
+    Returns:
+        str: The path of the cache directory.
+    """
+    cache_dir = os.path.join(run, ".evovis")
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+def _compute_genepool_layout(search_space):
+    """
+    Compute stable, group-aware positions for the layer nodes of the gene pool graph.
+
+    Layers are ranked by their shortest distance from 'Start'. Groups are placed in columns ordered by the 
+    smallest rank of their layers, groups with the same rank are stacked. The layers of a group are arranged 
+    in a grid inside the group box.
+
+    Args:
+        search_space (SearchSpace): The compiled search space.
+
+    Returns:
+        dict: A dictionary mapping layer identifiers to positions {'x': float, 'y': float}.
+    """
+    # Shortest distance of every reachable layer from the start
+    ranks = {"Start": 0}
+    queue = ["Start"]
+
+    for layer in queue:
+        for target in search_space.layer_graph.get(layer, []):
+            if target not in ranks:
+                ranks[target] = ranks[layer] + 1
+                queue.append(target)
+
+    # Visible layers of every group ordered by rank
+    group_layers = {}
+
+    for gene in search_space.genes:
+        layer = gene["layer"]
+
+        if not gene.get("exclude", False) and layer in search_space.reachable_layer_set:
+            layers = group_layers.setdefault(gene["group"], [])
+            if layer not in layers:
+                layers.append(layer)
+
+    for layers in group_layers.values():
+        layers.sort(key=lambda layer: ranks.get(layer, 0))
+
+    # Columns of groups with the same smallest rank
+    columns = {}
+
+    for group, layers in group_layers.items():
+        group_rank = min(ranks.get(layer, 0) for layer in layers)
+        columns.setdefault(group_rank, []).append(group)
+
+    positions = {}
+    x = NODE_SPACING + GROUP_SPACING
+
+    for group_rank in sorted(columns):
+        y = 0
+        column_width = 0
+
+        for group in columns[group_rank]:
+            layers = group_layers[group]
+            grid_columns = int(np.ceil(np.sqrt(len(layers))))
+            grid_rows = int(np.ceil(len(layers) / grid_columns))
+
+            for idx, layer in enumerate(layers):
+                positions[layer] = {
+                    'x': float(x + (idx % grid_columns) * NODE_SPACING), 
+                    'y': float(y + (idx // grid_columns) * NODE_SPACING),
+                }
+
+            column_width = max(column_width, grid_columns * NODE_SPACING)
+            y += grid_rows * NODE_SPACING + GROUP_SPACING
+
+        x += column_width + GROUP_SPACING
+
+    # Start node centered in front of the first column
+    ys = [position['y'] for position in positions.values()]
+    positions["Start"] = {'x': 0.0, 'y': float((min(ys) + max(ys)) / 2) if ys else 0.0}
+
+    return positions
+
+def get_genepool_layout(run):
+    """
+    Get the preset positions of the gene pool graph nodes of a run.
+
+    The layout is computed once per search space and persisted in the run's EvoVis cache directory,
+    so positions stay the same across page loads and sessions.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+
+    Returns:
+        dict: A dictionary mapping layer identifiers to positions {'x': float, 'y': float}.
+
+    Example:
+    >>> get_genepool_layout('evonas_run')
+    {'Start': {'x': 0.0, 'y': 125.0}, 'Rescaling': {'x': 250.0, 'y': 0.0}, ...}
+    """
+    search_space = get_compiled_search_space(run)
+
+    if search_space.layout is not None:
+        return search_space.layout
+
+    filepath = os.path.join(run, ".evovis", "genepool_layout.json")
+    positions = None
+
+    # Reuse the persisted layout if it belongs to the same search space
+    if os.path.isfile(filepath):
+        try:
+            persisted = _json_to_dict(filepath)
+            if persisted.get("signature") == search_space.signature:
+                positions = persisted.get("positions")
+        except json.JSONDecodeError:
+            positions = None
+
+    if positions is None:
+        positions = _compute_genepool_layout(search_space)
+
+        try:
+            with open(os.path.join(_get_cache_dir(run), "genepool_layout.json"), 'w') as file:
+                json.dump({"signature": search_space.signature, "positions": positions}, file)
+        except OSError:
+            # Read-only run directories still get the layout for this session
+            pass
+
+    search_space.layout = positions
+    return positions
 
 
 ### DASH CYTOSCAPE FORMAT ###
@@ -319,6 +740,8 @@ def _get_node_element(gene):
 def get_genepool(run):
     """
     Create Cytoscape elements representing layers and group connections in the search space for a given run.
+    Edges carry how often evolution used the connection ('usage'), the usage relative to the most used connection ('weight') 
+    and the mean fitness of the successfully trained individuals using it ('fitness').
 
     Args:
         run (str): The path of the ENAS run results directory.
@@ -340,60 +763,79 @@ def get_genepool(run):
     """
     try:
         # Initialize elements with a start node
-        elements = [{'data': {'id': 'Start', 'label': 'Start', 'f_name': 'Start', 'layer': 'Start'}}]
+        positions = get_genepool_layout(run)
+        elements = [{'data': {'id': 'Start', 'label': 'Start', 'f_name': 'Start', 'layer': 'Start'}, 'position': positions["Start"]}]
         group_elements = []
         groups = []
 
-        # Use connected layers to create nodes of layers and groups
-        start_layer = "Start"
-        connected_layers = _get_connected_layers(run, start_layer)
-        genes = _get_genes_flattened(run)
+        # Use connected layers of the compiled search space to create nodes of layers and groups
+        search_space = get_compiled_search_space(run)
+        connected_layers = search_space.reachable_layer_set
+        dead_end_layers = set(search_space.dead_end_layers)
+        layer_ids = {'Start'}
+        group_ids = set()
 
-        for gene in genes:
+        for gene in search_space.genes:
             layer = gene.get("layer")
             excluded = gene.get("exclude", False)
 
             if not excluded and layer in connected_layers:
                 
                 # Add layer node
-                layer_data = _get_node_element(gene)
-                element = {"data": layer_data}
+                if layer not in layer_ids:
+                    element = {"data": _get_node_element(gene), "position": positions[layer]}
+
+                    # Flag genes that can't lead to the end of a chromosome
+                    if layer in dead_end_layers:
+                        element["classes"] = "dead-end"
 
-                if element not in elements:
                     elements.append(element)
+                    layer_ids.add(layer)
 
                 # Add group node
                 group = gene.get("group")
-                if group:
-                    group_data = {'id': group, 'label': group}
-                    element = {"data": group_data}
-
-                    if element not in elements:
-                        group_elements.append(element)
-                        groups.append(group)
+                if group and group not in group_ids:
+                    group_elements.append({"data": {'id': group, 'label': group}})
+                    groups.append(group)
+                    group_ids.add(group)
 
         # Combine group elements with layer elements
         elements = group_elements + elements
 
-        # Build layer connections
-        layer_graph = _get_layer_graph(run, group_connections=False)
-
-        for layer, edges in layer_graph.items():
-            for edge in edges:
-                element = {'data': {'source': layer, 'target': edge}, 'classes': f'{layer} {edge}'}
+        # Usage of the connections by the evolved chromosomes
+        usage = get_transition_matrix(run)
+        fitness = get_transition_matrix(run, value="fitness")
+        fitness_counts = get_transition_matrix(run, value="fitness_counts")
+        max_usage = max(int(usage.max()), 1) if usage.size else 1
+        index = search_space.layer_index
 
-                if element not in elements and layer in connected_layers:
-                    elements.append(element)
+        # Build layer connections
+        for layer, edges in search_space.rule_graph.items():
+            if layer in connected_layers:
+                for edge in edges:
+                    count = int(usage[index[layer], index[edge]])
+                    rated = int(fitness_counts[index[layer], index[edge]])
+                    mean_fitness = float(fitness[index[layer], index[edge]] / rated) if rated else 0.0
+                    
+                    elements.append({
+                        'data': {'source': layer, 'target': edge, 'usage': count, 'weight': count / max_usage, 'fitness': mean_fitness}, 
+                        'classes': f'{layer} {edge}'
+                    })
 
         # Build group connections
-        group_graph = _get_group_graph(run)
-
-        for group_source, group_targets in group_graph.items():
-            for group_target in group_targets:
-                element = {'data': {'source': group_source, 'target': group_target}, 'classes': 'class-connect'}
-
-                if element not in elements and group_source in groups:
-                    elements.append(element)
+        for group_source, group_targets in search_space.group_graph.items():
+            if group_source in group_ids:
+                for group_target in dict.fromkeys(group_targets):
+                    source_layers = [index[layer] for layer in search_space.groups.get(group_source, [])]
+                    target_layers = [index[layer] for layer in search_space.groups.get(group_target, [])]
+                    count = int(usage[np.ix_(source_layers, target_layers)].sum())
+                    rated = int(fitness_counts[np.ix_(source_layers, target_layers)].sum())
+                    mean_fitness = float(fitness[np.ix_(source_layers, target_layers)].sum() / rated) if rated else 0.0
+                    
+                    elements.append({
+                        'data': {'source': group_source, 'target': group_target, 'usage': count, 'weight': count / max_usage, 'fitness': mean_fitness}, 
+                        'classes': 'class-connect'
+                    })
 
         return elements, groups
 
@@ -404,6 +846,564 @@ def get_genepool(run):
         raise TypeError(f"Unexpected data structure in search space data: {type_error}")
     
 
+### RULE COMPLIANCE ###
+_rule_compliance = {}
+
+def check_rule_compliance(run):
+    """
+    Check whether the chromosomes of all processed generations follow the 'rule_set' and 'rule_set_group' of the search space.
+
+    The layer graph is compiled into an integer transition table and all gene transitions of the run, including the 
+    transition from 'Start' to the first gene, are looked up in one batched pass. If the rule set has an 'End' target, 
+    the last gene of each chromosome must be allowed to end the chromosome as well. The report is cached until a new 
+    generation is processed or the search space changes.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+
+    Returns:
+        dict: A dictionary containing:
+              - 'checked': The number of chromosomes that were checked.
+              - 'individuals': Maps (generation, individual) of violating individuals to their number of violations.
+              - 'transitions': Maps (source layer, target layer) of forbidden transitions to their number of occurrences.
+              - 'violations': Arrays with the individual (row of the chromosome table), gene position, source and target
+                layer code of every violation, see get_rule_violations.
+
+    Example:
+    >>> report = check_rule_compliance('evonas_run')
+    >>> report['transitions']
+    {('GMP_2D', 'DO'): 18, ('DO', 'DO'): 11}
+    """
+    search_space = get_compiled_search_space(run)
+    table = get_chromosome_table(run)
+    key = (search_space.signature, tuple(np.unique(table["generations"])))
+
+    cached = _rule_compliance.get(run)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    offsets = table["gene_offsets"]
+    lengths = np.diff(offsets)
+    gene_layers = table["gene_layers"]
+    vocabulary = table["layers"]
+    has_end = END_LAYER in search_space.layer_index
+
+    # Chromosome layer codes to transition table indices (-1 for layers unknown to the search space)
+    table_index = np.array([search_space.layer_index.get(layer, -1) for layer in vocabulary] + [-1], dtype=np.int64)
+
+    # Source of every gene transition, the first gene of a chromosome follows 'Start' (code -1)
+    starts = offsets[:-1][lengths > 0]
+    sources = np.empty_like(gene_layers, dtype=np.int64)
+    sources[1:] = gene_layers[:-1]
+    sources[starts] = -1
+    targets = gene_layers.astype(np.int64)
+    gene_individual = np.repeat(np.arange(len(lengths)), lengths)
+    positions = np.arange(len(gene_layers)) - offsets[gene_individual]
+
+    # Transitions from the last gene to the end
+    if has_end:
+        ends = offsets[1:][lengths > 0] - 1
+        sources = np.concatenate([sources, gene_layers[ends]])
+        targets = np.concatenate([targets, np.full(len(ends), len(vocabulary))])
+        gene_individual = np.concatenate([gene_individual, gene_individual[ends]])
+        positions = np.concatenate([positions, lengths[lengths > 0]])
+
+    source_index = np.where(sources < 0, search_space.layer_index.get("Start", -1), table_index[sources])
+    target_index = table_index[targets]
+    target_index[targets == len(vocabulary)] = search_space.layer_index.get(END_LAYER, -1)
+
+    known = (source_index >= 0) & (target_index >= 0)
+    allowed = np.zeros(len(targets), dtype=bool)
+    allowed[known] = search_space.transition_table[source_index[known], target_index[known]] == 1
+    violations = np.flatnonzero(~allowed)
+
+    # Violating transitions ordered by individual for the per-individual lookup
+    order = np.argsort(gene_individual[violations], kind="stable")
+    violations = violations[order]
+    violation_individuals = gene_individual[violations]
+    violation_counts = np.bincount(violation_individuals, minlength=len(lengths))
+
+    # Number of occurrences of every forbidden transition
+    names = vocabulary + [END_LAYER]
+    pairs, pair_counts = np.unique((sources[violations] + 1) * (len(names) + 1) + targets[violations], return_counts=True)
+    report_transitions = {}
+
+    for pair, count in zip(pairs, pair_counts):
+        source_code, target_code = divmod(int(pair), len(names) + 1)
+        source = "Start" if source_code == 0 else names[source_code - 1]
+        report_transitions[(source, names[target_code])] = int(count)
+
+    violating = np.flatnonzero(violation_counts)
+    report = {
+        "checked": int(np.count_nonzero(lengths)),
+        "individuals": {
+            (int(table["generations"][idx]), table["individuals"][idx]): int(violation_counts[idx]) for idx in violating
+        },
+        "transitions": report_transitions,
+        "violations": {
+            "individuals": violation_individuals,
+            "positions": positions[violations],
+            "sources": sources[violations],
+            "targets": targets[violations],
+            "names": names,
+        },
+    }
+    _rule_compliance[run] = (key, report)
+
+    return report
+
+
+def get_rule_violations(run, generation, individual):
+    """
+    Get the rule set violations of an individual's chromosome.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+        generation (int): The generation number.
+        individual (str): The individual's identifier.
+
+    Returns:
+        list: A list of violations, each a dictionary with the gene 'position', the 'source' layer and the 'target' layer.
+              The list is empty if the chromosome follows the rules or the individual is not part of a processed generation.
+
+    Example:
+    >>> get_rule_violations('evonas_run', 1, 'celadon_caterpillar')
+    [{'position': 8, 'source': 'GMP_2D', 'target': 'DO'}]
+    """
+    report = check_rule_compliance(run)
+
+    if report["individuals"].get((generation, individual), 0) == 0:
+        return []
+
+    table = get_chromosome_table(run)
+    rows = np.flatnonzero(table["generations"] == generation)
+    row = rows[[table["individuals"][idx] for idx in rows].index(individual)]
+
+    violations = report["violations"]
+    first = np.searchsorted(violations["individuals"], row, side="left")
+    last = np.searchsorted(violations["individuals"], row, side="right")
+    names = violations["names"]
+
+    return [
+        {
+            "position": int(violations["positions"][idx]),
+            "source": "Start" if violations["sources"][idx] < 0 else names[violations["sources"][idx]],
+            "target": names[violations["targets"][idx]],
+        }
+        for idx in range(first, last)
+    ]
+
+
+### LAYER TRANSITIONS ###
+_layer_transitions = {}
+
+def get_layer_transitions(run):
+    """
+    Get the layer-to-layer transition counts of all processed generations as sparse generation x from-layer x to-layer tensor.
+
+    Every transition between consecutive genes, including 'Start' to the first gene, is counted once per occurrence.
+    The fitness of the successfully trained individuals with a numeric fitness is summed and counted separately. Only the non-zero entries are stored. Generations are counted in one 
+    vectorized pass the first time they are seen, later calls only add the newly processed generations.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+
+    Returns:
+        dict: A dictionary containing:
+              - 'layers': The layers of the compiled search space, the position of a layer is its code.
+              - 'generations': The generation numbers of the tensor.
+              - 'generation_index': Array with the position in 'generations' of every non-zero entry.
+              - 'sources': Array with the from-layer code of every non-zero entry.
+              - 'targets': Array with the to-layer code of every non-zero entry.
+              - 'counts': Array with the number of occurrences of every non-zero entry.
+              - 'fitness': Array with the summed fitness of the occurrences of every non-zero entry.
+              - 'fitness_counts': Array with the number of occurrences with a fitness of every non-zero entry.
+
+    Example:
+    >>> transitions = get_layer_transitions('evonas_run')
+    >>> len(transitions['counts'])
+    864
+    """
+    search_space = get_compiled_search_space(run)
+    table = get_chromosome_table(run)
+    generations = [int(generation) for generation in np.unique(table["generations"])]
+
+    cached = _layer_transitions.get(run)
+
+    # Start over if the search space changed or generations were replaced instead of appended
+    if cached is None or cached["signature"] != search_space.signature or cached["generations"] != generations[:len(cached["generations"])]:
+        cached = {
+            "signature": search_space.signature,
+            "layers": search_space.layers,
+            "generations": [],
+            "generation_index": np.zeros(0, dtype=np.int32),
+            "sources": np.zeros(0, dtype=np.int32),
+            "targets": np.zeros(0, dtype=np.int32),
+            "counts": np.zeros(0, dtype=np.uint32),
+            "fitness": np.zeros(0, dtype=np.float32),
+            "fitness_counts": np.zeros(0, dtype=np.uint32),
+        }
+        _layer_transitions[run] = cached
+
+    new_generations = generations[len(cached["generations"]):]
+    
+    if not new_generations:
+        return cached
+
+    # Rows and genes of the new generations
+    rows = np.flatnonzero(np.isin(table["generations"], new_generations))
+    offsets = table["gene_offsets"]
+    lengths = np.diff(offsets)[rows]
+    gene_rows = np.repeat(rows, lengths)
+    gene_positions = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    genes = offsets[gene_rows] + gene_positions
+
+    # Layer codes of the search space for the genes and their predecessors ('Start' for the first gene)
+    num_layers = len(search_space.layers)
+    layer_codes = np.array([search_space.layer_index.get(layer, -1) for layer in table["layers"]], dtype=np.int64)
+    targets = layer_codes[table["gene_layers"][genes]]
+    sources = np.where(gene_positions == 0, search_space.layer_index.get("Start", -1), layer_codes[table["gene_layers"][genes - 1]])
+
+    # Fitness of the individuals, NaN for individuals that weren't successfully trained
+    fitness = _get_fitness(run)
+    rated = ~np.isnan(fitness)
+
+    # Count the transitions per generation, transitions from or to unknown layers are skipped
+    known = (sources >= 0) & (targets >= 0)
+    generation_index = np.searchsorted(generations, table["generations"][gene_rows[known]])
+    keys = (generation_index * num_layers + sources[known]) * num_layers + targets[known]
+    unique_keys, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+    fitness_sums = np.bincount(inverse, weights=np.where(rated, fitness, 0.0)[gene_rows[known]], minlength=len(unique_keys))
+    fitness_counts = np.bincount(inverse, weights=rated[gene_rows[known]], minlength=len(unique_keys))
+
+    cached["generations"] = generations
+    cached["generation_index"] = np.concatenate([cached["generation_index"], (unique_keys // (num_layers * num_layers)).astype(np.int32)])
+    cached["sources"] = np.concatenate([cached["sources"], (unique_keys // num_layers % num_layers).astype(np.int32)])
+    cached["targets"] = np.concatenate([cached["targets"], (unique_keys % num_layers).astype(np.int32)])
+    cached["counts"] = np.concatenate([cached["counts"], counts.astype(np.uint32)])
+    cached["fitness"] = np.concatenate([cached["fitness"], fitness_sums.astype(np.float32)])
+    cached["fitness_counts"] = np.concatenate([cached["fitness_counts"], fitness_counts.astype(np.uint32)])
+
+    return cached
+
+def _get_fitness(run):
+    """
+    Get the fitness of all individuals in the row order of the chromosome table.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+
+    Returns:
+        numpy.ndarray: The fitness of every individual, NaN if it isn't healthy or has no numeric fitness.
+    """
+    results = get_results_table(run)
+
+    if "fitness" not in results["measurements"]:
+        return np.full(len(results["individuals"]), np.nan)
+
+    values = results["values"][:, results["measurements"].index("fitness")]
+    return np.where(results["healthy"], values, np.nan)
+
+def get_transition_matrix(run, generation_range=None, value="counts"):
+    """
+    Get the layer-to-layer transition counts summed over a range of generations.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+        generation_range (range, optional): A python range of generations to sum. Defaults to all processed generations.
+        value (str, optional): "counts" for the occurrences, "fitness" for their summed fitness or "fitness_counts"
+                               for the occurrences with a fitness. Defaults to "counts".
+
+    Returns:
+        numpy.ndarray: Matrix (from-layer x to-layer) indexed by the layer codes of the compiled search space.
+    """
+    transitions = get_layer_transitions(run)
+    num_layers = len(transitions["layers"])
+    generations = np.array(transitions["generations"])
+
+    selected = np.ones(len(transitions["counts"]), dtype=bool)
+    if generation_range is not None:
+        selected = np.isin(generations[transitions["generation_index"]], list(generation_range))
+
+    values = transitions[value]
+    matrix = np.zeros((num_layers, num_layers), dtype=np.float64 if value == "fitness" else np.int64)
+    np.add.at(matrix, (transitions["sources"][selected], transitions["targets"][selected]), values[selected])
+
+    return matrix
+
+
+### GENE SEQUENCES ###
+def _encode_gene(search_space, gene):
+    """
+    Encode a gene as its sequence symbol.
+
+    Args:
+        search_space (SearchSpace): The compiled search space.
+        gene (dict): The gene of a chromosome.
+
+    Returns:
+        str: The symbol of the gene, '' for genes which aren't encoded and UNKNOWN_SYMBOL for unknown layers.
+    """
+    layer = gene.get("layer")
+
+    if layer not in search_space.symbols:
+        return UNKNOWN_SYMBOL
+
+    # First variant whose parameters all match the gene
+    for parameters, symbol in search_space.symbol_variants[layer]:
+        if all(gene.get(key) == value for key, value in parameters.items()):
+            return symbol or ""
+
+    return search_space.symbols[layer] or ""
+
+def encode_chromosome(run, chromosome):
+    """
+    Encode a chromosome as sequence of one-letter gene symbols.
+
+    The symbols are the 'symbol' keys of the genes in search_space.json. A gene can have different symbols
+    depending on its parameters given in 'symbol-variants', a symbol null leaves the gene out of the sequence.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+        chromosome (list): The genes of the chromosome.
+
+    Returns:
+        str: The gene sequence.
+
+    Example:
+        >>> encode_chromosome('run_123', [{'layer': 'Rescaling'}, {'layer': 'C_2D'}, {'layer': 'GAP_2D'}, {'layer': 'DO'}])
+        'CgO'
+    """
+    return "".join(get_gene_symbols(run, chromosome))
+
+def get_gene_symbols(run, chromosome):
+    """
+    Get the sequence symbol of every gene of a chromosome.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+        chromosome (list): The genes of the chromosome.
+
+    Returns:
+        list: The symbol of every gene, '' for genes which aren't encoded.
+
+    Example:
+        >>> get_gene_symbols('run_123', [{'layer': 'Rescaling'}, {'layer': 'C_2D'}, {'layer': 'GAP_2D'}])
+        ['', 'C', 'g']
+    """
+    search_space = get_compiled_search_space(run)
+    return [_encode_gene(search_space, gene) for gene in chromosome]
+
+def get_sequence_alphabet(run):
+    """
+    Get the genes behind the symbols of the gene sequences.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+
+    Returns:
+        dict: A dictionary mapping every symbol to the 'layer' and the variant 'parameters' it stands for.
+              Symbols shared by several layers map to the first layer of the gene pool.
+
+    Example:
+        >>> get_sequence_alphabet('run_123')['r']
+        {'layer': 'RES_2D', 'parameters': {'skip_connection': 0}}
+    """
+    search_space = get_compiled_search_space(run)
+    alphabet = {}
+
+    for layer, variants in search_space.symbol_variants.items():
+        for parameters, symbol in variants:
+            if symbol:
+                alphabet.setdefault(symbol, {"layer": layer, "parameters": parameters})
+
+    for layer, symbol in search_space.symbols.items():
+        if symbol:
+            alphabet.setdefault(symbol, {"layer": layer, "parameters": {}})
+
+    return alphabet
+
+def decode_sequence(run, sequence):
+    """
+    Decode a gene sequence into the genes of a chromosome.
+
+    Only the layer and the parameters of symbol variants can be recovered, genes which aren't encoded are missing.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+        sequence (str): The gene sequence.
+
+    Returns:
+        list: The genes as dictionaries with the 'layer' and the variant parameters.
+
+    Raises:
+        ValueError: If the sequence contains a symbol which isn't in the alphabet of the search space.
+
+    Example:
+        >>> decode_sequence('run_123', 'Crg')
+        [{'layer': 'C_2D'}, {'layer': 'RES_2D', 'skip_connection': 0}, {'layer': 'GAP_2D'}]
+    """
+    alphabet = get_sequence_alphabet(run)
+    unknown = sorted(set(sequence) - set(alphabet))
+
+    if unknown:
+        raise ValueError(f"Unknown gene symbols {unknown} in sequence '{sequence}'.")
+
+    return [{"layer": alphabet[symbol]["layer"], **alphabet[symbol]["parameters"]} for symbol in sequence]
+
+def encode_run_chromosomes(run):
+    """
+    Encode the chromosomes of all processed generations as gene sequences in one pass.
+
+    The layer codes of the chromosome table are translated to symbols at once, only genes of layers with
+    symbol variants are encoded one by one.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+
+    Yields:
+        tuple: The generation, the individual name and the gene sequence of every individual with chromosome,
+               in the order of the chromosome table.
+
+    Example:
+        >>> next(encode_run_chromosomes('run_123'))
+        (1, 'airborne_jackal', 'CTRCIMCMDBgO')
+    """
+    search_space = get_compiled_search_space(run)
+    table = get_chromosome_table(run)
+
+    # Symbol of every layer code, None where the gene has to be encoded by itself
+    layer_symbols = []
+
+    for layer in table["layers"]:
+        if layer not in search_space.symbols:
+            layer_symbols.append(UNKNOWN_SYMBOL)
+        elif search_space.symbol_variants[layer]:
+            layer_symbols.append(None)
+        else:
+            layer_symbols.append(search_space.symbols[layer] or "")
+
+    symbols = np.array(layer_symbols, dtype=object)[table["gene_layers"]] if len(table["gene_layers"]) else np.zeros(0, dtype=object)
+    offsets = table["gene_offsets"]
+
+    for row, chromosome in enumerate(table["chromosomes"]):
+        if chromosome is None:
+            continue
+
+        genes = symbols[offsets[row]:offsets[row + 1]]
+        sequence = "".join(
+            _encode_gene(search_space, chromosome[idx]) if symbol is None else symbol
+            for idx, symbol in enumerate(genes)
+        )
+
+        yield int(table["generations"][row]), table["individuals"][row], sequence
+
+def read_fasta(filepath):
+    """
+    Read the sequences of a FASTA file one by one.
+
+    Args:
+        filepath (str): The path of the FASTA file.
+
+    Yields:
+        tuple: The name (first word of the header) and the sequence of every record.
+
+    Example:
+        >>> dict(read_fasta('run_123/Generation_8/sequences.fasta'))['silent_avocet']
+        'CIMCDBg'
+    """
+    name = None
+    lines = []
+
+    with open(filepath, 'r') as file:
+        for line in file:
+            line = line.strip()
+
+            if line.startswith(">"):
+                if name is not None:
+                    yield name, "".join(lines)
+                header = line[1:].split()
+                name = header[0] if header else ""
+                lines = []
+            elif name is not None:
+                lines.append(line)
+
+    if name is not None:
+        yield name, "".join(lines)
+
+def write_run_fasta(run, filepath=None):
+    """
+    Encode the chromosomes of all processed generations and stream them into one FASTA file.
+
+    Every record is written when it is encoded, its header holds the individual name and the generation.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+        filepath (str, optional): The path of the FASTA file. Defaults to 'sequences.fasta' in the EvoVis cache directory.
+
+    Returns:
+        str: The path of the written file.
+
+    Example:
+        >>> write_run_fasta('run_123')
+        'run_123/.evovis/sequences.fasta'
+    """
+    if filepath is None:
+        filepath = os.path.join(_get_cache_dir(run), "sequences.fasta")
+
+    with open(filepath, 'w') as file:
+        for generation, individual, sequence in encode_run_chromosomes(run):
+            file.write(f">{individual} generation={generation}\n{sequence}\n")
+
+    return filepath
+
+def check_fasta(run):
+    """
+    Check the encoding of the chromosomes against the sequences.fasta files of the generations.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+
+    Returns:
+        dict: Generation dictionary for every generation with sequences.fasta containing:
+              - 'checked': The number of individuals in both the generation and the FASTA file.
+              - 'mismatches': A dictionary mapping individuals to their (encoded, FASTA) sequences where these differ.
+              - 'missing': Individuals of the generation without FASTA record.
+              - 'unknown': FASTA records without individual in the generation.
+
+    Example:
+        >>> check_fasta('run_123')[8]
+        {'checked': 20, 'mismatches': {}, 'missing': [], 'unknown': []}
+    """
+    encoded = {}
+
+    for generation, individual, sequence in encode_run_chromosomes(run):
+        encoded.setdefault(generation, {})[individual] = sequence
+
+    report = {}
+
+    for generation, sequences in encoded.items():
+        filepath = f"{run}/Generation_{generation}/sequences.fasta"
+
+        if not os.path.isfile(filepath):
+            continue
+
+        fasta = dict(read_fasta(filepath))
+        common = [individual for individual in sequences if individual in fasta]
+
+        report[generation] = {
+            "checked": len(common),
+            "mismatches": {
+                individual: (sequences[individual], fasta[individual]) 
+                for individual in common if sequences[individual] != fasta[individual]
+            },
+            "missing": [individual for individual in sequences if individual not in fasta],
+            "unknown": [individual for individual in fasta if individual not in sequences],
+        }
+
+    return report
+
+
 ### UNIQUE GENES WITH COLORS ###
 def _generate_color_scale(start_color, end_color, num_colors):
     """
@@ -437,20 +1437,5 @@ def get_unique_gene_colors(run):
     Returns:
         dict: A dictionary where keys are unique gene layers and values are unique colors in hexadecimal format.
     """
-    connected_genes = _get_connected_layers(run)
-    unique_genes = {connected_gene: "" for connected_gene in connected_genes}
-    
-    opacity_step = 1 / len(unique_genes)
-    
-    start_color = '#6173E9'
-    end_color = '#B70202'
-    
-    num_colors = len(unique_genes)
-    color_scale = _generate_color_scale(start_color, end_color, num_colors)
-
-    for idx, gene in enumerate(unique_genes):
-        
-        opacity = 1 - idx * opacity_step
-        unique_genes[gene] = color_scale[idx]
+    return get_compiled_search_space(run).colors.copy()
 
-    return unique_genes
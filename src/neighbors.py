@@ -0,0 +1,237 @@
+import numpy as np
+from evolution import get_chromosome_table, get_generations
+
+
+##################################################
+
+# MODULE NEIGHBORS
+
+# The Neighbors Module provides functionalities
+# for finding the most similar architectures of
+# a run with MinHash signatures of gene n-grams
+# and locality-sensitive hashing.
+
+##################################################
+
+
+### MINHASH SIGNATURES ###
+# Genes per n-gram, number of hash functions and LSH bands (hash functions per band = NUM_HASHES / LSH_BANDS)
+NGRAM_SIZE = 3
+NUM_HASHES = 64
+LSH_BANDS = 16
+
+# Individuals hashed at once, bounding the memory of the shingle hashes
+SIGNATURE_BATCH = 10000
+
+_MERSENNE_PRIME = np.int64((1 << 31) - 1)
+_hash_parameters = np.random.default_rng(42).integers(1, _MERSENNE_PRIME, size=(2, NUM_HASHES), dtype=np.int64)
+_band_multipliers = np.random.default_rng(43).integers(1, _MERSENNE_PRIME, size=NUM_HASHES // LSH_BANDS, dtype=np.int64)
+
+def _gene_token(gene, with_parameters):
+    """
+    Get the token of a gene for the n-grams.
+
+    Args:
+        gene (dict): The gene of a chromosome.
+        with_parameters (bool): Whether the parameters are part of the token.
+
+    Returns:
+        tuple: The layer and, with parameters, the sorted parameters of the gene.
+    """
+    if not with_parameters:
+        return (gene.get("layer"),)
+
+    return (gene.get("layer"),) + tuple(sorted((key, str(value)) for key, value in gene.items() if key != "layer"))
+
+def _get_shingles(chromosome, tokens, with_parameters):
+    """
+    Get the hashed gene n-grams of a chromosome.
+
+    The chromosome is padded with start and end tokens, so the n-grams also capture its ends and
+    chromosomes shorter than NGRAM_SIZE still have n-grams.
+
+    Args:
+        chromosome (list): The genes of the chromosome.
+        tokens (dict): Vocabulary mapping gene tokens to integer ids, extended by new tokens.
+        with_parameters (bool): Whether the parameters are part of the gene tokens.
+
+    Returns:
+        list: The distinct n-gram hashes.
+    """
+    ids = [0]
+
+    for gene in chromosome:
+        token = _gene_token(gene, with_parameters)
+        if token not in tokens:
+            tokens[token] = len(tokens) + 2
+        ids.append(tokens[token])
+
+    ids.append(1)
+
+    return list({hash(tuple(ids[start:start + NGRAM_SIZE])) for start in range(max(1, len(ids) - NGRAM_SIZE + 1))})
+
+def _minhash_signatures(shingles):
+    """
+    Compute the MinHash signatures of sets of n-gram hashes.
+
+    Args:
+        shingles (list): The n-gram hashes of every individual, each with at least one n-gram.
+
+    Returns:
+        numpy.ndarray: Matrix (individuals x NUM_HASHES) of the signatures.
+    """
+    lengths = np.array([len(ngrams) for ngrams in shingles], dtype=np.int64)
+    values = np.array([ngram for ngrams in shingles for ngram in ngrams], dtype=np.int64) % _MERSENNE_PRIME
+    starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+
+    # Universal hashing (a * x + b) mod p of every n-gram for every hash function
+    hashes = (values[:, None] * _hash_parameters[0] + _hash_parameters[1]) % _MERSENNE_PRIME
+
+    # The hashes are below 2^31 and fit into 32 bits
+    return np.minimum.reduceat(hashes, starts, axis=0).astype(np.uint32)
+
+def _band_hashes(signatures):
+    """
+    Combine the signature rows of every LSH band into one hash.
+
+    Args:
+        signatures (numpy.ndarray): Matrix (individuals x NUM_HASHES) of the signatures.
+
+    Returns:
+        numpy.ndarray: Matrix (individuals x LSH_BANDS) of the band hashes.
+    """
+    bands = signatures.reshape(len(signatures), LSH_BANDS, -1).astype(np.int64)
+    return ((bands * _band_multipliers) % _MERSENNE_PRIME).sum(axis=2) % _MERSENNE_PRIME
+
+
+### NEIGHBOR INDEX ###
+_neighbor_indexes = {}
+
+def get_neighbor_index(run, with_parameters=False):
+    """
+    Get the MinHash/LSH index of the architectures of all processed generations.
+
+    The index is built once per run. When new generations are processed only their individuals are hashed
+    and added to the index.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+        with_parameters (bool, optional): Whether the gene parameters are part of the n-grams. Defaults to False.
+
+    Returns:
+        dict: A dictionary containing:
+              - 'generations': The generation of every indexed individual.
+              - 'individuals': The names of the indexed individuals.
+              - 'rows': A dictionary mapping (generation, individual) to its row.
+              - 'signatures': Matrix (individuals x NUM_HASHES) of the MinHash signatures.
+              - 'bands': Matrix (individuals x LSH_BANDS) of the band hashes.
+              - 'band_order': Matrix (LSH_BANDS x individuals) of the rows sorted by band hash.
+              - 'band_sorted': Matrix (LSH_BANDS x individuals) of the sorted band hashes.
+
+    Example:
+    >>> get_neighbor_index('my_run')['signatures'].shape
+    (400, 64)
+    """
+    generations = get_generations(run, as_int=True)
+    key = (run, with_parameters)
+
+    cached = _neighbor_indexes.get(key)
+    if cached is None or cached["processed"] != generations[:len(cached["processed"])]:
+        cached = {
+            "processed": [],
+            "tokens": {},
+            "generations": np.zeros(0, dtype=np.int64),
+            "individuals": [],
+            "rows": {},
+            "signatures": np.zeros((0, NUM_HASHES), dtype=np.uint32),
+            "bands": np.zeros((0, LSH_BANDS), dtype=np.int64),
+            "band_order": np.zeros((LSH_BANDS, 0), dtype=np.int64),
+            "band_sorted": np.zeros((LSH_BANDS, 0), dtype=np.int64),
+        }
+        _neighbor_indexes[key] = cached
+
+    new_generations = generations[len(cached["processed"]):]
+
+    if new_generations:
+        table = get_chromosome_table(run)
+        new_rows = [
+            row for row in np.flatnonzero(np.isin(table["generations"], new_generations))
+            if table["chromosomes"][row] is not None
+        ]
+
+        signatures = [cached["signatures"]]
+
+        for start in range(0, len(new_rows), SIGNATURE_BATCH):
+            batch = new_rows[start:start + SIGNATURE_BATCH]
+            shingles = [_get_shingles(table["chromosomes"][row], cached["tokens"], with_parameters) for row in batch]
+            signatures.append(_minhash_signatures(shingles))
+
+        for row in new_rows:
+            cached["rows"][(int(table["generations"][row]), table["individuals"][row])] = len(cached["individuals"])
+            cached["individuals"].append(table["individuals"][row])
+
+        cached["generations"] = np.concatenate([cached["generations"], table["generations"][new_rows].astype(np.int64)])
+        cached["signatures"] = np.concatenate(signatures)
+        cached["bands"] = _band_hashes(cached["signatures"])
+        cached["band_order"] = np.argsort(cached["bands"], axis=0, kind="stable").T
+        cached["band_sorted"] = np.take_along_axis(cached["bands"].T, cached["band_order"], axis=1)
+        cached["processed"] = cached["processed"] + new_generations
+
+    return cached
+
+def get_similar_architectures(run, generation, individual, k=10, with_parameters=False):
+    """
+    Find the architectures of the run most similar to the architecture of an individual.
+
+    Candidates share at least one LSH band with the individual. They are ranked by the Jaccard similarity of
+    the gene n-grams estimated from the MinHash signatures. If the bands give fewer than k candidates, all
+    individuals are ranked.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+        generation (int): The generation of the individual.
+        individual (str): The name of the individual.
+        k (int, optional): The number of architectures. Defaults to 10.
+        with_parameters (bool, optional): Whether the gene parameters are compared. Defaults to False.
+
+    Returns:
+        list: The most similar individuals as dictionaries with 'generation', 'individual' and 'similarity'
+              in descending similarity, the individual itself excluded. Empty if the individual isn't indexed.
+
+    Example:
+    >>> get_similar_architectures('my_run', 8, 'silent_avocet', k=2)
+    [{'generation': 9, 'individual': 'giga_galago', 'similarity': 1.0}, {'generation': 7, ...}]
+    """
+    index = get_neighbor_index(run, with_parameters)
+    row = index["rows"].get((generation, individual))
+
+    if row is None or k < 1:
+        return []
+
+    # Rows with the same hash in any band
+    candidates = []
+    for band in range(LSH_BANDS):
+        first = np.searchsorted(index["band_sorted"][band], index["bands"][row, band], side="left")
+        last = np.searchsorted(index["band_sorted"][band], index["bands"][row, band], side="right")
+        candidates.append(index["band_order"][band, first:last])
+
+    candidates = np.unique(np.concatenate(candidates))
+    candidates = candidates[candidates != row]
+
+    if len(candidates) < k:
+        candidates = np.delete(np.arange(len(index["individuals"])), row)
+
+    similarity = np.count_nonzero(index["signatures"][candidates] == index["signatures"][row], axis=1) / NUM_HASHES
+
+    # Top k by similarity, ties in row order
+    top = np.argpartition(-similarity, k - 1)[:k] if len(candidates) > k else np.arange(len(candidates))
+    top = top[np.lexsort((candidates[top], -similarity[top]))]
+
+    return [
+        {
+            "generation": int(index["generations"][candidates[idx]]),
+            "individual": index["individuals"][candidates[idx]],
+            "similarity": float(similarity[idx]),
+        }
+        for idx in top
+    ]
@@ -5,9 +5,13 @@ import dash_mantine_components as dmc
 from dash_iconify import DashIconify
 from dotenv import load_dotenv
 import os
-from evolution import get_family_tree, get_generations, get_individuals, get_random_individual, get_individuals_min_max, get_individual_result, get_individual_chromosome, get_meas_info
-from components import dot_heading, bullet_chart_card, bullet_chart_card_basic, warning, information, chromosome_sequence
-from dataval import validate_generations_of_individuals, validate_crossover_parents, validate_meas_info, validate_individual_chromosome, validate_individual_result
+from evolution import get_family_tree, get_generations, get_individuals, get_random_individual, get_measurement_bounds, get_individual_result, get_individual_chromosome, get_meas_info
+from components import dot_heading, bullet_chart_card, bullet_chart_card_basic, warning, information, chromosome_sequence, alignment_sequence
+from genepool import get_unique_gene_colors, get_rule_violations
+from alignment import get_aligned_genes
+from neighbors import get_similar_architectures
+from similarity import get_architecture_family
+from dataval import validate_generations_of_individuals, validate_crossover_parents, validate_meas_info, validate_individual_chromosome, validate_individual_result, validate_individual_rule_compliance
 
 ### LOAD PATH FROM ENVIRONMENT VARIABLES
 load_dotenv()
@@ -71,6 +75,11 @@ MARKS_STYLE = {
 }
 
 
+### SIMILAR ARCHITECTURES
+similar_architectures_k = 10
+architecture_family_k = 5
+
+
 ### FAMILY TREE COMPONENTS 
 def family_tree_cytsocape():
     """
@@ -235,8 +244,8 @@ def set_cytoscape(gen_range, ind, ind_clicked, edge_clicked):
 
 @callback( 
     Output("individual-heading", "children"),  Output("individual-exceptions", "children"), Output("individual-genes", "children"), Output("individual-results", "children"), 
-    Input("cytoscape-family-tree", "tapNodeData"), Input("ind-select", "value"), Input("gen-range-slider", "value"))
-def set_values(ind_clicked, ind_select, gen_range):
+    Input("cytoscape-family-tree", "tapNodeData"), Input("ind-select", "value"), Input("gen-range-slider", "value"), Input("bounds-select", "value"))
+def set_values(ind_clicked, ind_select, gen_range, bounds_scope="run"):
     """
     Sets the information to be displayed about the selected individual.
 
@@ -244,6 +253,7 @@ def set_values(ind_clicked, ind_select, gen_range):
         ind_clicked (dict): Data of the individual node clicked on the Cytoscape component.
         ind_select (str): Selected individual from the dropdown.
         gen_range (tuple): Tuple containing the minimum and maximum generation values selected on the RangeSlider.
+        bounds_scope (str): Whether the results are shown against the bounds of the "run" or of the "generation".
 
     Returns:
         list: Name of the selected individual.
@@ -288,6 +298,11 @@ def set_values(ind_clicked, ind_select, gen_range):
     if val_msg:
         ind_exceptions.append(warning(val_msg))
         return ind_heading, ind_exceptions, None, None
+    
+    rule_msg = validate_individual_rule_compliance(get_rule_violations(run, gen, ind), gen, ind)
+    
+    if rule_msg:
+        ind_exceptions.append(warning(rule_msg))
         
 
     ### 3 CHROMOSOME ###
@@ -299,7 +314,12 @@ def set_values(ind_clicked, ind_select, gen_range):
     if "fitness" in ind_meas:
         ind_fitness += [bullet_chart_card_basic(ind_meas['fitness'], 0, 1, metric_card_id="bullet-chart-basic")]
 
-    border_meas = get_individuals_min_max(run, generation_range=None)
+    bounds = get_measurement_bounds(run)
+    border_meas = bounds["run"]
+    
+    if bounds_scope == "generation" and gen in bounds["generation"]:
+        border_meas = {meas: gen_bounds if gen_bounds[0] is not None else border_meas[meas] for meas, gen_bounds in bounds["generation"][gen].items()}
+    
     meas_info = get_meas_info(run)
     del meas_info['fitness']
     
@@ -324,6 +344,129 @@ def set_values(ind_clicked, ind_select, gen_range):
     return ind_heading, ind_exceptions, ind_genes, ind_fitness
 
 
+@callback(Output("edge-alignment", "children"), Input("cytoscape-family-tree", "tapEdgeData"), Input("cytoscape-family-tree", "tapNodeData"))
+def set_edge_alignment(edge_clicked, ind_clicked):
+    """
+    Sets the alignment of the parent and child chromosomes of the clicked edge. Only the alignment of this pair is fetched.
+
+    Args:
+        edge_clicked (dict): Data of the edge clicked on the Cytoscape component.
+        ind_clicked (dict): Data of the individual node clicked on the Cytoscape component.
+
+    Returns:
+        list: Alignment of the parent and child chromosomes, empty if no edge is selected.
+    """
+    
+    if edge_clicked is None or "generation" not in edge_clicked:
+        return []
+    
+    # The alignment is hidden when an individual is clicked
+    if dash.ctx.triggered and dash.ctx.triggered[0]["prop_id"].endswith("tapNodeData"):
+        return []
+    
+    parent = edge_clicked["source"]
+    child = edge_clicked["target"]
+    gen = edge_clicked["generation"]
+    
+    columns = get_aligned_genes(run, gen-1, parent, gen, child)
+    heading = dot_heading("Alignment", style={"margin": "10px", 'flex': '100%'})
+    
+    if columns is None:
+        return [heading, information("No gene sequences for the alignment.")]
+    
+    return [heading, alignment_sequence(columns, labels=(parent, child), unique_genes=get_unique_gene_colors(run))]
+
+@callback(
+    Output("similar-architectures", "children"),
+    Input("cytoscape-family-tree", "tapNodeData"), Input("ind-select", "value"), Input("gen-range-slider", "value"), Input("similar-parameters", "checked"))
+def set_similar_architectures(ind_clicked, ind_select, gen_range, with_parameters=False):
+    """
+    Sets the architectures of the run most similar to the selected individual.
+
+    Args:
+        ind_clicked (dict): Data of the individual node clicked on the Cytoscape component.
+        ind_select (str): Selected individual from the dropdown.
+        gen_range (tuple): Tuple containing the minimum and maximum generation values selected on the RangeSlider.
+        with_parameters (bool): Whether the gene parameters are compared.
+
+    Returns:
+        list: Most similar individuals with their generation and similarity.
+    """
+    if ind_clicked is None: 
+        ind = ind_select
+        gen = gen_range[1]
+    else:
+        ind = ind_clicked["id"]
+        gen = ind_clicked["generation"]
+    
+    similar = get_similar_architectures(run, gen, ind, k=similar_architectures_k, with_parameters=bool(with_parameters))
+    
+    if not similar:
+        return [information("No similar architectures found.")]
+    
+    return [
+        dmc.Group(
+            [
+                dmc.Text(neighbor["individual"], size='xs', weight=500),
+                dmc.Text(f"GEN {neighbor['generation']}", size='xs', color='dimmed'),
+                dmc.Badge(f"{neighbor['similarity']:.0%}", variant='light', color='indigo', size='xs'),
+            ],
+            position='apart',
+            spacing='xs'
+        )
+        for neighbor in similar
+    ]
+
+@callback(
+    Output("architecture-family", "children"),
+    Input("cytoscape-family-tree", "tapNodeData"), Input("ind-select", "value"), Input("gen-range-slider", "value"))
+def set_architecture_family(ind_clicked, ind_select, gen_range):
+    """
+    Sets the architecture family of the selected individual: its gene sequence and the most similar gene
+    sequences of the run, each with the generations of the individuals carrying it.
+
+    Args:
+        ind_clicked (dict): Data of the individual node clicked on the Cytoscape component.
+        ind_select (str): Selected individual from the dropdown.
+        gen_range (tuple): Tuple containing the minimum and maximum generation values selected on the RangeSlider.
+
+    Returns:
+        list: The gene sequences with their similarity, number of individuals and generations.
+    """
+    if ind_clicked is None: 
+        ind = ind_select
+        gen = gen_range[1]
+    else:
+        ind = ind_clicked["id"]
+        gen = ind_clicked["generation"]
+    
+    family = get_architecture_family(run, gen, ind, k=architecture_family_k)
+    
+    if not family:
+        return [information("No gene sequence for the architecture family.")]
+    
+    return [
+        html.Div(
+            [
+                dmc.Group(
+                    [
+                        dmc.Text(architecture["sequence"], size='xs', weight=500, style={'font-family': 'monospace'}),
+                        dmc.Badge(f"{architecture['similarity']:.0%}", variant='light', color='indigo', size='xs'),
+                    ],
+                    position='apart',
+                    spacing='xs'
+                ),
+                dmc.Text(
+                    f"{len(architecture['individuals'])} IND · GEN {', '.join(str(generation) for generation in sorted({generation for generation, _ in architecture['individuals']}))}",
+                    size='xs',
+                    color='dimmed'
+                ),
+            ],
+            style={'margin-bottom': '6px'}
+        )
+        for architecture in family
+    ]
+
 ### FAMILY TREE PAGE LAYOUT  
 def family_tree_header():
     """
@@ -363,6 +506,13 @@ def individual_information():
         [
             html.Div([], id='individual-heading'), 
             html.Div([], id='individual-exceptions'), 
+            dmc.SegmentedControl(
+                id='bounds-select',
+                data=[{"value": "run", "label": "Run bounds"}, {"value": "generation", "label": "Generation bounds"}],
+                value='run',
+                size='xs',
+                style={'margin': '10px'}
+            ),
             dmc.Grid(
                 [
                     dmc.Col([html.Div([], id='individual-results')], span=10),
@@ -370,7 +520,13 @@ def individual_information():
                 ],
                 gutter="xs",
                 grow=True
-            )
+            ),
+            html.Div([], id='edge-alignment'),
+            dot_heading("Similar architectures", style={"margin": "10px", 'flex': '100%'}),
+            dmc.Switch(id='similar-parameters', label="Compare parameters", checked=False, size='xs', style={'margin': '10px'}),
+            html.Div([], id='similar-architectures', style={'margin': '10px'}),
+            dot_heading("Architecture family", style={"margin": "10px", 'flex': '100%'}),
+            html.Div([], id='architecture-family', style={'margin': '10px'})
         ], 
         span=2, 
         className='cytoscape-values', 
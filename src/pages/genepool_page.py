@@ -5,7 +5,7 @@ import dash_cytoscape as cyto
 import plotly.express as px
 from dotenv import load_dotenv
 import os
-from evolution import get_number_of_genes, get_generations
+from evolution import get_gene_frequencies
 from genepool import get_genepool
 from components import parameter_card, warning
 from dataval import validate_search_space
@@ -84,6 +84,27 @@ def cytoscape_stylesheet(groups):
                 'line-color': '#6173E9',
             }
         },
+        {
+            'selector': 'edge[weight]',
+            'style': {
+                'width': 'mapData(weight, 0, 1, 1, 10)',
+            }
+        },
+        {
+            'selector': 'edge[usage = 0]',
+            'style': {
+                'line-style': 'dashed',
+                'opacity': '0.4',
+            }
+        },
+        {
+            'selector': '.dead-end',
+            'style': {
+                'border-color': '#B70202',
+                'border-width': '3px',
+                'border-style': 'dashed',
+            }
+        },
     ]
 
     # Style for groupe nodes
@@ -124,6 +145,7 @@ def cytoscape_stylesheet(groups):
 def cytoscape_search_space():
     """
     Generates the cytoscape component for the gene search space.
+    Nodes are placed at the persisted preset positions of the gene pool layout.
 
     Returns:
         dash_cytoscape.Cytoscape: Cytoscape component for gene search space.
@@ -138,7 +160,9 @@ def cytoscape_search_space():
         style={'height': '600px', 'width': '100%'},
         stylesheet=stylesheet,
         layout={
-            'name': 'cose',
+            'name': 'preset',
+            'fit': True,
+            'padding': 30,
         }
     )
     
@@ -252,24 +276,34 @@ def display_node_data(data):
     parameter_cards = []
     for key, value in gene.items():
         
-        not_metric = ["id", "label", "f_name", "layer", "parent", "exclude"]
+        not_metric = ["id", "label", "f_name", "layer", "parent", "exclude", "symbol", "symbol-variants"]
         
         if key not in not_metric:
             
             mc = parameter_card(key, str(value), "mdi:input")
             parameter_cards.append(mc)   
             
-    # Number of genes per generation
-    numb_of_genes = []
+    # Number of genes per generation read from the cached gene frequency matrix
+    frequencies = get_gene_frequencies(run)
+    generations = frequencies["generations"]
+    
+    numb_of_genes = [0] * len(generations)
+    numb_of_individuals = [0] * len(generations)
     
-    for generation in range(1, len(get_generations(run))+1):
-        numb_of_genes.append(get_number_of_genes(run, generation, gene["layer"]))
+    if gene["layer"] in frequencies["layer_index"]:
+        row = frequencies["layer_index"][gene["layer"]]
+        numb_of_genes = frequencies["counts"][row].tolist()
+        numb_of_individuals = frequencies["presence"][row].tolist()
     
     fig = px.bar(
-        x = list(range(1, len(get_generations(run))+1)), 
+        x = generations, 
         y = numb_of_genes, 
         labels={"x": "Generation", "y": f"{gene['layer']} layers"}
     )
+    fig.update_traces(
+        customdata=numb_of_individuals,
+        hovertemplate="Generation: %{x}<br>Layers: %{y}<br>Individuals: %{customdata}<extra></extra>"
+    )
     graph = dcc.Graph(figure=fig, id="gene-distribution-plot")
     
     fig.update_layout(
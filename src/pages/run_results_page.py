@@ -1,13 +1,19 @@
 import dash
-from dash import html, dcc
+from dash import html, dcc, callback, Input, Output, State, MATCH, Patch
+from dash.exceptions import PreventUpdate
 import dash_mantine_components as dmc
 import plotly.graph_objects as go
 import numpy as np
 from dotenv import load_dotenv
 import os
 from components import dot_heading, bullet_chart_card_basic, parameter_card, chromosome_sequence, warning
-from evolution import get_generations, get_meas_info, get_healthy_individuals_results, get_best_individuals, get_hyperparameters
+from evolution import get_generations, get_meas_info, get_top_individuals, get_hyperparameters, get_results_table, get_generation_statistics, get_duplicate_index
 from genepool import get_unique_gene_colors
+from pareto import get_pareto_objectives, get_pareto_ranks, get_hypervolumes
+from sketches import get_box_statistics
+from correlation import get_correlation_matrix
+from similarity import get_similarity_matrix
+from diversity import get_diversity_metrics, get_similarity_embeddings
 from dataval import validate_generations_of_individuals, validate_meas_info
 
 
@@ -25,20 +31,179 @@ grid_gutter = 'xl'
 fitn_obj_height = 180
 
 
+### GENERATION PLOT RENDERING
+pinned_generation_ticks = 30
+generation_tick_count = 10
+
+
+### PARETO PLOT RENDERING
+pareto_webgl_threshold = 5000
+pareto_density_threshold = 20000
+pareto_density_bins = 100
+pareto_density_min_count = 3
+
+
+### SIMILARITY PLOT RENDERING
+similarity_max_labels = 50
+
+
 ### HELPER FUNCTIONS FOR PLOTS ###
-def add_meas_trace(fig, run, meas, generation_range=None, min=None, max=None, show_std=True, linecolor='#6173E9'):
+def _lttb_indices(x, y, threshold):
+    """
+    Select the points of a curve which preserve its shape with the Largest-Triangle-Three-Buckets algorithm.
+
+    Args:
+        x (numpy.ndarray): The x values of the curve in ascending order.
+        y (numpy.ndarray): The finite y values of the curve.
+        threshold (int): The number of points to select.
+
+    Returns:
+        numpy.ndarray: The indices of the selected points, always including the first and the last point.
+    """
+    n = len(x)
+    
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    
+    # Buckets between the first and the last point
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    indices = [0]
+    
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        
+        # Average of the next bucket, the last point for the last bucket
+        if bucket + 2 < len(edges):
+            next_x = x[edges[bucket + 1]:edges[bucket + 2]].mean()
+            next_y = y[edges[bucket + 1]:edges[bucket + 2]].mean()
+        else:
+            next_x, next_y = x[-1], y[-1]
+        
+        # Point of the bucket spanning the largest triangle with the previous selected point
+        previous = indices[-1]
+        areas = np.abs((x[previous] - next_x) * (y[start:end] - y[previous]) - (x[previous] - x[start:end]) * (next_y - y[previous]))
+        indices.append(start + int(np.argmax(areas)))
+    
+    indices.append(n - 1)
+    
+    return np.array(indices)
+
+def _get_meas_curve(run, meas, generation_range=None, max_points=None, x_range=None):
+    """
+    Get the mean and standard deviation of a measurement per generation, downsampled to at most max_points generations.
+    Mean and standard deviation are downsampled separately with LTTB and the selected generations are combined.
+
+    Args:
+        run (str): Path to the run results.
+        meas (str): Measurement to be plotted.
+        generation_range (range): Range of the generations.
+        max_points (int): Maximum number of generations, usually the width of the plot in pixels.
+        x_range (tuple): Tuple containing the minimum and maximum visible generation.
+
+    Returns:
+        tuple: The generations, means and standard deviations as numpy arrays.
+    """
+    
+    # Get the precomputed statistics of the measurement per generation
+    statistics = get_generation_statistics(run)
+    generations = np.array(statistics["generations"])
+    avg_results = statistics["statistics"][meas]["mean"]
+    std_results = statistics["statistics"][meas]["std"]
+    
+    selected = np.ones(len(generations), dtype=bool)
+    
+    if generation_range is not None:
+        selected &= np.isin(generations, list(generation_range))
+    
+    # Visible generations and their neighbours to keep the curve continuous
+    if x_range is not None:
+        visible = np.flatnonzero((generations >= x_range[0]) & (generations <= x_range[1]))
+        window = np.zeros(len(generations), dtype=bool)
+        window[max(visible[0] - 1, 0) if len(visible) else 0:visible[-1] + 2 if len(visible) else 0] = True
+        selected &= window
+    
+    generations, avg_results, std_results = generations[selected], avg_results[selected], std_results[selected]
+    
+    # Downsample the generations with valid values
+    if max_points is not None and len(generations) > max_points:
+        finite = np.flatnonzero(np.isfinite(avg_results) & np.isfinite(std_results))
+        keep = np.union1d(
+            _lttb_indices(generations[finite], avg_results[finite], max_points // 2),
+            _lttb_indices(generations[finite], std_results[finite], max_points // 2),
+        )
+        generations, avg_results, std_results = generations[finite][keep], avg_results[finite][keep], std_results[finite][keep]
+    
+    return generations, avg_results, std_results
+
+def _meas_trace_data(generations, avg_results, std_results):
+    """
+    Get the data of the standard deviation band and the mean trace of a measurement.
+
+    Args:
+        generations (numpy.ndarray): The generations.
+        avg_results (numpy.ndarray): The means.
+        std_results (numpy.ndarray): The standard deviations.
+
+    Returns:
+        tuple: The x and y values of the standard deviation band and of the mean as lists.
+    """
+    generations = generations.tolist()
+    
+    std_top = avg_results - std_results
+    std_bottom = (avg_results + std_results)[::-1]
+    
+    std_x = generations + generations[::-1]
+    std_y = np.concatenate([std_top, std_bottom]).tolist()
+    
+    return std_x, std_y, generations, avg_results.tolist()
+
+def _generation_dtick(first, last):
+    """
+    Get the distance of the x-axis ticks for a range of generations.
+    The distance is a whole number of generations of 1, 2 or 5 times a power of ten, so about generation_tick_count ticks are shown.
+
+    Args:
+        first (float): The first generation of the range.
+        last (float): The last generation of the range.
+
+    Returns:
+        int: The distance of the ticks in generations.
+    """
+    step = max(1.0, abs(last - first) / generation_tick_count)
+    magnitude = 10 ** int(np.floor(np.log10(step)))
+    
+    return int(next(factor * magnitude for factor in (1, 2, 5, 10) if factor * magnitude >= step))
+
+def _generation_axis(generations):
+    """
+    Get the x-axis tick settings of a plot over generations.
+    Few generations are all pinned as ticks, for many generations the ticks are placed on whole generations.
+
+    Args:
+        generations (list): The generations.
+
+    Returns:
+        dict: The tick settings of the x-axis.
+    """
+    if len(generations) <= pinned_generation_ticks:
+        return {'tickvals': list(generations)}
+    
+    return {'tick0': 0, 'dtick': _generation_dtick(generations[0], generations[-1])}
+
+def add_meas_trace(fig, run, meas, generation_range=None, show_std=True, linecolor='#6173E9', max_points=None):
     """
     Add a measurement trace to a Plotly figure.
+    Only valid values within the 'min-boundary' and 'max-boundary' of the measurement are considered.
+    The standard deviation trace is always added before the mean trace, but hidden if not shown.
 
     Args:
         fig (plotly.graph_objs.Figure): Plotly figure to which the measurement trace will be added.
         run (str): Path to the run results.
         meas (str): Measurement to be plotted.
         generation_range (tuple): Tuple containing the minimum and maximum generation.
-        min (float): Minimum boundary for valid values.
-        max (float): Maximum boundary for valid values.
         show_std (bool): Whether to show standard deviation.
         linecolor (str): Color of the measurement trace.
+        max_points (int): Maximum number of generations to plot, all generations if None.
 
     Returns:
         None
@@ -46,57 +211,25 @@ def add_meas_trace(fig, run, meas, generation_range=None, min=None, max=None, sh
     
     measurements = get_meas_info(run)
     
-    # Defining borders to exclude and include invalid values
-    if min is None:
-        min = -100000000000
-    if max is None:
-        max = 100000000000
-
-    # Get the indivuals' information by sotring the valid values in arrays
-    gen_results, _ = get_healthy_individuals_results(run, generation_range, as_generation_dict=True)
-    
-    generations = []
-    avg_results = []
-    std_results = []
-    
-    for gen, results in gen_results.items():
-        
-        values = []
-        
-        for ind, result in results.items():
-            
-            if result is not None and meas in result:
-                value = result[meas]
-
-                if (type(value) == int or type(value) == float) and (value <= max) and (value >= min): 
-                    values.append(value)
-            
-        generations.append(gen)
-        avg_results.append(np.mean(np.array(values)))
-        std_results.append(np.std(np.array(values)))
-    
-    avg_results = np.array(avg_results)
-    std_results = np.array(std_results)
+    generations, avg_results, std_results = _get_meas_curve(run, meas, generation_range, max_points)
+    std_x, std_y, mean_x, mean_y = _meas_trace_data(generations, avg_results, std_results)
     
     # Add standard deviation in background
-    std_top = avg_results - std_results
-    std_bottom = (avg_results + std_results)[::-1]
-    
-    if show_std:
-        fig.add_trace(go.Scatter(
-            x=np.concatenate([generations, generations[::-1]]),
-            y=np.concatenate([std_top, std_bottom]),
-            fill='toself',
-            fillcolor='rgba(239,239,239,0.5)',
-            line={'color':'rgba(239,239,239,0.5)'},
-            name='Standard Deviation',
-            hoverinfo='x+y'
-        ))
+    fig.add_trace(go.Scatter(
+        x=std_x,
+        y=std_y,
+        fill='toself',
+        fillcolor='rgba(239,239,239,0.5)',
+        line={'color':'rgba(239,239,239,0.5)'},
+        name='Standard Deviation',
+        hoverinfo='x+y',
+        visible=show_std
+    ))
     
     # Add mean in forground
     fig.add_trace(go.Scatter(
-        x=generations,
-        y=avg_results,
+        x=mean_x,
+        y=mean_y,
         mode='lines+markers',
         name=measurements[meas]["displayname"],
         line=go.scatter.Line(color=linecolor),
@@ -105,7 +238,7 @@ def add_meas_trace(fig, run, meas, generation_range=None, min=None, max=None, sh
     
     # Set xaxis ticks to generations to avoid non int values
     fig.update_layout(
-        xaxis={'tickvals': generations},
+        xaxis=_generation_axis(get_generation_statistics(run)["generations"]),
     )
 
 def add_constraint_trace(fig, constraint):
@@ -130,7 +263,7 @@ def add_constraint_trace(fig, constraint):
         )
     )
 
-def figure_meas_over_gen(run, measures, generation_range=None, min=None, max=None, show_std=True, show_constraint=True, title=None, xaxis_title=None, yaxis_title=None):
+def figure_meas_over_gen(run, measures, generation_range=None, show_std=True, show_constraint=True, title=None, xaxis_title=None, yaxis_title=None, max_points=None):
     """
     Generate a Plotly figure showing measurement trends over generations.
 
@@ -138,13 +271,12 @@ def figure_meas_over_gen(run, measures, generation_range=None, min=None, max=Non
         run (str): Path to the run results.
         measures (str or list): Measurement(s) to be plotted.
         generation_range (tuple): Tuple containing the minimum and maximum generation values.
-        min (float): Minimum boundary for valid values.
-        max (float): Maximum boundary for valid values.
         show_std (bool): Whether to show standard deviation.
         show_constraint (bool): Whether to show constraint trace.
         title (str): Title of the figure.
         xaxis_title (str): Title of the x-axis.
         yaxis_title (str): Title of the y-axis.
+        max_points (int): Maximum number of generations per trace, all generations if None.
 
     Returns:
         plotly.graph_objs.Figure: Plotly figure showing measurement trends over generations.
@@ -179,7 +311,7 @@ def figure_meas_over_gen(run, measures, generation_range=None, min=None, max=Non
             opacity = 1 - idx * opacity_step
             linecolor = f'rgba(97,115,233,{opacity})'
         
-            add_meas_trace(fig, run, meas, generation_range, min, max, show_std, linecolor)
+            add_meas_trace(fig, run, meas, generation_range, show_std, linecolor, max_points)
     
             # Constraint trace
             #if show_constraint:
@@ -202,20 +334,20 @@ def figure_meas_over_gen(run, measures, generation_range=None, min=None, max=Non
         showlegend=showlegend,
         plot_bgcolor='rgba(0,0,0,0)',
         hovermode="x",
+        uirevision='meas-over-gen',
     )
     
     return fig
 
-def graph_meas_over_gen(run, measures, generation_range=None, min=None, max=None, show_std=True, max_width=600, height=200, width=None, show_constraint=True, title=None, xaxis_title=None, yaxis_title=None, id="graph-meas-over-gen"):
+def graph_meas_over_gen(run, measures, generation_range=None, show_std=True, max_width=600, height=200, width=None, show_constraint=True, title=None, xaxis_title=None, yaxis_title=None, id=None):
     """
     Generate a Dash Graph component showing measurement trends over generations.
+    The curves are downsampled to the width of the graph and refined when zooming.
 
     Args:
         run (str): Path to the run results.
         measures (str or list): Measurement(s) to be plotted.
         generation_range (tuple): Tuple containing the minimum and maximum generation values.
-        min (float): Minimum boundary for valid values.
-        max (float): Maximum boundary for valid values.
         show_std (bool): Whether to show standard deviation.
         max_width (int): Maximum width of the graph.
         height (int): Height of the graph.
@@ -224,31 +356,182 @@ def graph_meas_over_gen(run, measures, generation_range=None, min=None, max=None
         title (str): Title of the graph.
         xaxis_title (str): Title of the x-axis.
         yaxis_title (str): Title of the y-axis.
-        id (str): ID of the graph component.
+        id (str): ID of the graph component, defaults to the measures.
 
     Returns:
         dash_core_components.Graph: Dash Graph component showing measurement trends over generations.
     """
     
-    fig = figure_meas_over_gen(run, measures, generation_range, min, max, show_std, show_constraint, title, xaxis_title, yaxis_title)
+    if type(measures) is str:
+        measures = [measures]
+    
+    # Plot one generation per pixel
+    max_points = int(width or max_width)
+    
+    fig = figure_meas_over_gen(run, measures, generation_range, show_std, show_constraint, title, xaxis_title, yaxis_title, max_points)
     
     graph_div = dcc.Graph(
         figure=fig, 
         style={'height': height, 'max-width': max_width, 'min-width': 200, 'width': width},
-        id=id
+        id={'type': 'graph-meas-over-gen', 'index': id or ','.join(measures), 'measures': ','.join(measures), 'points': max_points}
     )
     
     return graph_div
 
-def get_pareto_optimality_fig(run, generation_range=None, max_width=600, height=200):
+@callback(
+    Output({'type': 'graph-meas-over-gen', 'index': MATCH, 'measures': MATCH, 'points': MATCH}, 'figure'),
+    Input({'type': 'graph-meas-over-gen', 'index': MATCH, 'measures': MATCH, 'points': MATCH}, 'relayoutData'),
+    State({'type': 'graph-meas-over-gen', 'index': MATCH, 'measures': MATCH, 'points': MATCH}, 'id'),
+    prevent_initial_call=True
+)
+def update_meas_over_gen_resolution(relayout_data, graph_id):
+    """
+    Refine the downsampled curves of a measurement graph to the zoomed generations.
+
+    Args:
+        relayout_data (dict): The relayout data of the graph.
+        graph_id (dict): The ID of the graph containing the measures and the number of points.
+
+    Returns:
+        dash.Patch: Patch of the trace data and the tick distance of the figure.
+    """
+    
+    # Zoomed range or reset of the x-axis
+    if relayout_data is None:
+        raise PreventUpdate
+    elif 'xaxis.range[0]' in relayout_data and 'xaxis.range[1]' in relayout_data:
+        x_range = (relayout_data['xaxis.range[0]'], relayout_data['xaxis.range[1]'])
+    elif 'xaxis.range' in relayout_data:
+        x_range = tuple(relayout_data['xaxis.range'])
+    elif relayout_data.get('xaxis.autorange'):
+        x_range = None
+    else:
+        raise PreventUpdate
+    
+    patched_fig = Patch()
+    
+    for idx, meas in enumerate(graph_id['measures'].split(',')):
+        
+        generations, avg_results, std_results = _get_meas_curve(run, meas, max_points=graph_id['points'], x_range=x_range)
+        std_x, std_y, mean_x, mean_y = _meas_trace_data(generations, avg_results, std_results)
+        
+        # Every measure has a standard deviation and a mean trace
+        patched_fig['data'][2 * idx]['x'] = std_x
+        patched_fig['data'][2 * idx]['y'] = std_y
+        patched_fig['data'][2 * idx + 1]['x'] = mean_x
+        patched_fig['data'][2 * idx + 1]['y'] = mean_y
+    
+    # Ticks on whole generations of the zoomed range
+    generations = get_generation_statistics(run)["generations"]
+    if len(generations) > pinned_generation_ticks:
+        patched_fig['layout']['xaxis']['dtick'] = _generation_dtick(*(x_range or (generations[0], generations[-1])))
+    
+    return patched_fig
+
+def graph_meas_box(run, meas, max_width=600, height=200, width=None):
+    """
+    Generate a Dash Graph component showing the distribution of a measurement per generation as box plots.
+    The boxes are drawn from the quantile sketches of the generations, if there are more generations than 
+    fit the graph, consecutive generations are merged into one box.
+
+    Args:
+        run (str): Path to the run results.
+        meas (str): Measurement to be plotted.
+        max_width (int): Maximum width of the graph.
+        height (int): Height of the graph.
+        width (int): Width of the graph.
+
+    Returns:
+        dash_core_components.Graph: Dash Graph component showing the distribution of the measurement over generations.
+    """
+    
+    # One box per eight pixels at most
+    max_boxes = int(width or max_width) // 8
+    boxes = get_box_statistics(run, meas, max_boxes=max_boxes)
+    generations = boxes["generations"].tolist()
+    
+    fig = go.Figure()
+    
+    fig.add_trace(go.Box(
+        x=generations,
+        q1=boxes["q1"],
+        median=boxes["median"],
+        q3=boxes["q3"],
+        lowerfence=boxes["lowerfence"],
+        upperfence=boxes["upperfence"],
+        name=get_meas_info(run)[meas]["displayname"],
+        marker_color='#6173E9',
+        line={'width': 1},
+    ))
+    
+    fig.update_layout(
+        xaxis={**_generation_axis(generations), 'tickfont':{'color': '#D0D0D0'}, 'showline':True},
+        yaxis={'showgrid':True, 'gridcolor':'#D0D0D0', 'tickfont':{'color': '#D0D0D0'}},
+        margin={'l': 10, 'b': 10, 't': 10, 'r': 10},
+        showlegend=False,
+        plot_bgcolor='rgba(0,0,0,0)',
+    )
+    
+    graph_div = dcc.Graph(
+        figure=fig, 
+        style={'height': height, 'max-width': max_width, 'min-width': 200, 'width': width},
+    )
+    
+    return graph_div
+
+def _pareto_density_trace(obj1, obj2, front):
+    """
+    Bin the individuals of the multi-objective mapping into a density heatmap.
+    Individuals on the pareto front and in sparse bins (outliers) are not binned.
+
+    Args:
+        obj1 (numpy.ndarray): Values of the first objective.
+        obj2 (numpy.ndarray): Values of the second objective.
+        front (numpy.ndarray): Boolean array, True for individuals on the pareto front.
+
+    Returns:
+        tuple: A tuple containing:
+               - numpy.ndarray: Boolean array, True for individuals which are drawn as exact points.
+               - plotly.graph_objs.Heatmap: Heatmap of the binned individuals.
+    """
+    counts, xedges, yedges = np.histogram2d(obj1, obj2, bins=pareto_density_bins)
+    
+    # Bin of every individual
+    xbin = np.clip(np.searchsorted(xedges, obj1, side='right') - 1, 0, len(xedges) - 2)
+    ybin = np.clip(np.searchsorted(yedges, obj2, side='right') - 1, 0, len(yedges) - 2)
+    
+    exact = front | (counts[xbin, ybin] < pareto_density_min_count)
+    
+    # Count the binned individuals only, empty bins stay transparent
+    binned = np.zeros_like(counts)
+    np.add.at(binned, (xbin[~exact], ybin[~exact]), 1)
+    binned[binned == 0] = np.nan
+    
+    heatmap = go.Heatmap(
+        x=(xedges[:-1] + xedges[1:]) / 2,
+        y=(yedges[:-1] + yedges[1:]) / 2,
+        z=binned.T,
+        colorscale=[[0.0, '#EFEFEF'], [1.0, '#A4B0FE']],
+        showscale=False,
+        name='Density',
+        hovertemplate='%{z} individuals<extra></extra>',
+    )
+    
+    return exact, heatmap
+
+def get_pareto_optimality_fig(run, generation_range=None, max_width=600, height=200, density=None):
     """
     Generate a Dash Graph component showing multi-objective mappingto identify pareto optimal neural architectures.
+    The individuals on the Pareto front of the fitness function objectives are highlighted.
+    Many individuals are rendered with WebGL and dense regions can be reduced to a density heatmap
+    so that the size of the figure stays bounded.
 
     Args:
         run (str): Path to the run results.
         generation_range (tuple): Tuple containing the minimum and maximum generation values.
         max_width (int): Maximum width of the graph.
         height (int): Height of the graph.
+        density (bool): Whether to bin dense regions, by default only above the density threshold.
 
     Returns:
         dash_core_components.Graph: Dash Graph component showing  multi-objective mapping of architectures.
@@ -269,11 +552,7 @@ def get_pareto_optimality_fig(run, generation_range=None, max_width=600, height=
     }
         
     # Get all fitness objectives
-    fitness_objectives = []
-    
-    for measurement, rules in measurements.items():
-        if rules["pareto-optimlity-plot"]:
-            fitness_objectives.append(measurement)
+    fitness_objectives, _ = get_pareto_objectives(run)
       
     numb_fo = len(fitness_objectives)
     obj1, obj2, obj3 = None, None, None
@@ -282,20 +561,29 @@ def get_pareto_optimality_fig(run, generation_range=None, max_width=600, height=
     # Special Cases
     if numb_fo == 0 or numb_fo == 1:
         return None
-    elif numb_fo > 3:
-        fitness_objectives = fitness_objectives[:3]
     
-    # Objectives
-    results, _ = get_healthy_individuals_results(run, as_generation_dict=False)
+    # Objectives of the ranked individuals
+    pareto = get_pareto_ranks(run)
+    ranked = pareto["ranks"] > 0
+    objectives = pareto["values"][ranked]
+    front = pareto["front"][ranked]
+    
+    # Reduce dense regions to bins, the pareto front and points in sparse bins stay exact
+    if density is None:
+        density = len(objectives) > pareto_density_threshold
     
-    if numb_fo == 2:
-        obj1 = [result[fitness_objectives[0]] for result in results]
-        obj2 = [result[fitness_objectives[1]] for result in results]
+    exact = np.ones(len(objectives), dtype=bool)
+    density_trace = None
+    
+    if density and len(objectives):
+        exact, density_trace = _pareto_density_trace(objectives[:, 0], objectives[:, 1], front)
+    
+    obj1 = objectives[exact, 0]
+    obj2 = objectives[exact, 1]
+    front = front[exact]
         
-    elif numb_fo == 3:
-        obj1 = [result[fitness_objectives[0]] for result in results]
-        obj2 = [result[fitness_objectives[1]] for result in results]
-        obj3 = [result[fitness_objectives[2]] for result in results]
+    if numb_fo == 3:
+        obj3 = objectives[exact, 2]
         
         custom_colorscale = [
             [0.0, '#ACB5ED'], 
@@ -324,14 +612,33 @@ def get_pareto_optimality_fig(run, generation_range=None, max_width=600, height=
             }
         )
     
+    # WebGL rendering for many points
+    scatter = go.Scattergl if len(obj1) > pareto_webgl_threshold else go.Scatter
+    
     # Add pareto optimality scatter plot
     fig = go.Figure()
     
-    fig.add_trace(go.Scatter(
+    if density_trace is not None:
+        fig.add_trace(density_trace)
+    
+    fig.add_trace(scatter(
         x=obj1,
         y=obj2,
         mode='markers',
-        marker=marker
+        marker=marker,
+        name='Individuals'
+    ))
+    
+    # Highlight the pareto front
+    front_order = np.argsort(obj1[front], kind='stable')
+    
+    fig.add_trace(scatter(
+        x=obj1[front][front_order],
+        y=obj2[front][front_order],
+        mode='markers',
+        marker=dict(size=7, color='rgba(0,0,0,0)', line=dict(color='#B70202', width=1.5)),
+        name='Pareto front',
+        hoverinfo='x+y'
     ))
     
     # Update layout of figure
@@ -364,11 +671,62 @@ def get_pareto_optimality_fig(run, generation_range=None, max_width=600, height=
     return graph_div
 
 
+def get_hypervolume_fig(run, max_width=600, height=200):
+    """
+    Generate a Dash Graph component showing the hypervolume of the fitness function objectives reached up to every generation.
+
+    Args:
+        run (str): Path to the run results.
+        max_width (int): Maximum width of the graph.
+        height (int): Height of the graph.
+
+    Returns:
+        dash_core_components.Graph: Dash Graph component showing the hypervolume over generations.
+    """
+    
+    hypervolumes = get_hypervolumes(run)
+    
+    # Special Cases
+    if hypervolumes is None:
+        return None
+    
+    fig = go.Figure()
+    
+    fig.add_trace(go.Scatter(
+        x=hypervolumes["generations"],
+        y=hypervolumes["hypervolume"],
+        mode='lines+markers',
+        name='Hypervolume',
+        line=go.scatter.Line(color='#6173E9'),
+        hoverinfo='x+y'
+    ))
+    
+    fig.update_layout(
+        title="Hypervolume over generations",
+        title_font_color='#717171',
+        title_font_size=15,
+        title_font=dict(family='sans-serif'),
+        xaxis={**_generation_axis(hypervolumes["generations"]), 'tickfont':{'color': '#D0D0D0'}, 'showline':True},
+        yaxis={'showgrid':True, 'gridcolor':'#D0D0D0', 'tickfont':{'color': '#D0D0D0'}},
+        margin={'l': 10, 'b': 10, 't': 50, 'r': 10},
+        showlegend=False,
+        plot_bgcolor='rgba(0,0,0,0)',
+        hovermode="x",
+    )
+    
+    graph_div = dcc.Graph(
+        figure=fig, 
+        style={'height': height, 'max-width': max_width, 'min-width': 200},
+    )
+    
+    return graph_div
+
+
 ### GENERAL RUN OVERVIEW ###
 def general_overview():
     """
     Generate a Dash Grid component containing the count of healthy and unhealthy individuals, fitness plot, 
-    mulit-objective individual mapping plot.
+    hypervolume plot, mulit-objective individual mapping plot.
 
     Returns:
         dash_mantine_components.Grid: Dash Grid component containing general overview.
@@ -376,18 +734,22 @@ def general_overview():
     
     tot_gen = get_hyperparameters(run)["num_generations"]["value"]
     processed_gen = len(get_generations(run))
-    healthy, unhealthy = get_healthy_individuals_results(run, as_generation_dict=False)
+    healthy_mask = get_results_table(run)["healthy"]
+    healthy = int(healthy_mask.sum())
+    unhealthy = len(healthy_mask) - healthy
     
     gen_processed = bullet_chart_card_basic(processed_gen, 1, tot_gen, unit='Generations processed', info='Generations', back_color='#6173E9', bar_color='#A4B0FE', load_color='#FFFFFF', margin='0px', min_width='260px', flex='1')
-    ind_healthy = parameter_card("Healthy Individuals", len(healthy), icon='icon-park-outline:health', margin='0px', width='100%')
-    ind_unhealthy = parameter_card("Unhealthy Individuals", len(unhealthy), icon='mdi:robot-dead-outline', margin='0px', width='100%')
-    fitness_plot = graph_meas_over_gen(run, 'fitness', generation_range=None, min=0, max=1, height=222.5, title="Fitness over generations", xaxis_title="", yaxis_title="")
+    ind_healthy = parameter_card("Healthy Individuals", healthy, icon='icon-park-outline:health', margin='0px', width='100%')
+    ind_unhealthy = parameter_card("Unhealthy Individuals", unhealthy, icon='mdi:robot-dead-outline', margin='0px', width='100%')
+    fitness_plot = graph_meas_over_gen(run, 'fitness', generation_range=None, height=222.5, title="Fitness over generations", xaxis_title="", yaxis_title="", id="general-overview-fitness")
+    hypervolume_plot = get_hypervolume_fig(run, height=222.5)
     pareto_optimality_plot = get_pareto_optimality_fig(run, height=222.5)
 
     general_overview = dmc.Grid(
         [
             dmc.Col(dmc.Stack([gen_processed, ind_healthy, ind_unhealthy]), span="auto"),
             dmc.Col(fitness_plot, span="auto", className="col-results-page"), 
+            dmc.Col(hypervolume_plot, span="auto", className="col-results-page"),
             dmc.Col(pareto_optimality_plot, span="auto", className="col-results-page"),
         ],
         gutter=grid_gutter,
@@ -400,10 +762,13 @@ def general_overview():
 
 
 ### INDIVIDUAL RUN RESULTS PLOT ###
-def objectives_overview():
+def objectives_overview(view="mean"):
     """
     Generate a Dash Grid component containing the overview of metrics over generations plots.
 
+    Args:
+        view (str): Show the "mean" and standard deviation or the distribution as "box" plots.
+
     Returns:
         dash_mantine_components.Grid: Dash Grid component containing overview of metrics over generations plots.
     """
@@ -422,7 +787,8 @@ def objectives_overview():
                 dmc.Col(
                     [
                         dot_heading(heading, style={"font-size": "14px"}, className='dot-heading-results-page'), 
-                        graph_meas_over_gen(run, measurement, generation_range=None, min=meas_info.get("min-boundary", None), max=meas_info.get("max-boundary", None), height=fitn_obj_height, width=250)
+                        graph_meas_box(run, measurement, height=fitn_obj_height, width=250) if view == "box" else
+                        graph_meas_over_gen(run, measurement, generation_range=None, height=fitn_obj_height, width=250)
                     ], 
                     className="col-results-page"
                 )
@@ -438,53 +804,469 @@ def objectives_overview():
     return objectives_overview
 
 
+### CORRELATION PLOT ###
+def figure_correlation(run, generation, method="pearson", cumulative=False):
+    """
+    Generate a Plotly heatmap of the correlations between the measurements of a generation.
+
+    Args:
+        run (str): Path to the run results.
+        generation (int): Generation of the correlations.
+        method (str): Correlation method, "pearson" or "spearman".
+        cumulative (bool): Whether to correlate all individuals up to the generation.
+
+    Returns:
+        plotly.graph_objs.Figure: Plotly heatmap of the correlation matrix.
+    """
+    measurements = get_meas_info(run)
+    matrix = get_correlation_matrix(run, generation, method, cumulative)
+    labels = [measurements[meas]["displayname"] for meas in measurements]
+    
+    fig = go.Figure(go.Heatmap(
+        x=labels,
+        y=labels,
+        z=matrix,
+        zmin=-1,
+        zmax=1,
+        colorscale=[[0.0, '#B70202'], [0.5, '#FFFFFF'], [1.0, '#6173E9']],
+        text=np.round(matrix, 2),
+        texttemplate='%{text}',
+        hovertemplate='%{y} / %{x}: %{z:.3f}<extra></extra>',
+        colorbar={'thickness': 10, 'tickfont': {'color': '#D0D0D0'}, 'outlinecolor': '#D0D0D0'},
+    ))
+    
+    fig.update_layout(
+        xaxis={'tickfont':{'color': '#717171'}},
+        yaxis={'tickfont':{'color': '#717171'}, 'autorange': 'reversed'},
+        margin={'l': 10, 'b': 10, 't': 10, 'r': 10},
+        plot_bgcolor='rgba(0,0,0,0)',
+    )
+    
+    return fig
+
+def correlation_overview():
+    """
+    Generate a Dash Div component containing the heatmap of the correlations between the measurements
+    with a generation slider, the correlation method and whether to correlate cumulatively.
+
+    Returns:
+        dash_html_components.Div: Dash Div component containing the correlation heatmap.
+    """
+    generations = get_generations(run, as_int=True)
+    
+    if not generations:
+        return None
+    
+    # Label at most ten generations
+    marks_step = max(1, len(generations) // 10)
+    marks = {gen: str(gen) for gen in generations[::marks_step]}
+    
+    return html.Div(
+        [
+            dot_heading("Correlations between measurements", style={"font-size": "14px"}, className='dot-heading-results-page'),
+            dmc.Group(
+                [
+                    dmc.SegmentedControl(
+                        id='correlation-method',
+                        data=[{"value": "pearson", "label": "Pearson"}, {"value": "spearman", "label": "Spearman"}],
+                        value='pearson',
+                        size='xs'
+                    ),
+                    dmc.Switch(id='correlation-cumulative', label="Up to generation", checked=False, size='xs'),
+                ],
+                position='left'
+            ),
+            dcc.Graph(
+                figure=figure_correlation(run, generations[-1]),
+                style={'height': 350, 'max-width': 600},
+                id='correlation-heatmap'
+            ),
+            dcc.Slider(
+                min=generations[0], 
+                max=generations[-1], 
+                step=1, 
+                value=generations[-1], 
+                marks=marks,
+                id='correlation-generation'
+            ),
+        ],
+        style={'margin-top': '25px', 'max-width': 600}
+    )
+
+@callback(
+    Output('correlation-heatmap', 'figure'),
+    Input('correlation-generation', 'value'),
+    Input('correlation-method', 'value'),
+    Input('correlation-cumulative', 'checked'),
+    prevent_initial_call=True
+)
+def update_correlation(generation, method, cumulative):
+    """
+    Update the correlation heatmap to the selected generation, method and cumulative setting.
+
+    Args:
+        generation (int): The selected generation.
+        method (str): The selected correlation method.
+        cumulative (bool): Whether to correlate all individuals up to the generation.
+
+    Returns:
+        plotly.graph_objs.Figure: Plotly heatmap of the correlation matrix.
+    """
+    if generation not in get_generations(run, as_int=True):
+        raise PreventUpdate
+    
+    return figure_correlation(run, generation, method, bool(cumulative))
+
+
+### UNIQUENESS PLOT ###
+def get_uniqueness_fig(run, max_width=700, height=250):
+    """
+    Generate a Dash Graph component showing the ratio of distinct and of novel architectures per generation.
+
+    Args:
+        run (str): Path to the run results.
+        max_width (int): Maximum width of the graph.
+        height (int): Height of the graph.
+
+    Returns:
+        dash_core_components.Graph: Dash Graph component showing the uniqueness over generations.
+    """
+    index = get_duplicate_index(run)
+    
+    with np.errstate(invalid="ignore", divide="ignore"):
+        novel = np.where(index["individuals"] > 0, index["novel"] / np.maximum(index["individuals"], 1), np.nan)
+    
+    fig = go.Figure()
+    
+    fig.add_trace(go.Scatter(
+        x=index["generations"],
+        y=index["uniqueness"],
+        mode='lines+markers',
+        name='Distinct architectures',
+        line=go.scatter.Line(color='#6173E9'),
+        customdata=np.column_stack([index["distinct"], index["individuals"]]),
+        hovertemplate='%{customdata[0]} of %{customdata[1]} distinct<extra></extra>'
+    ))
+    
+    fig.add_trace(go.Scatter(
+        x=index["generations"],
+        y=novel,
+        mode='lines+markers',
+        name='New architectures',
+        line=go.scatter.Line(color='#A4B0FE', dash='dot'),
+        customdata=np.column_stack([index["novel"], index["individuals"]]),
+        hovertemplate='%{customdata[0]} of %{customdata[1]} new<extra></extra>'
+    ))
+    
+    fig.update_layout(
+        title="Architecture uniqueness over generations",
+        title_font_color='#717171',
+        title_font_size=15,
+        title_font=dict(family='sans-serif'),
+        xaxis={**_generation_axis(index["generations"]), 'tickfont':{'color': '#D0D0D0'}, 'showline':True},
+        yaxis={'showgrid':True, 'gridcolor':'#D0D0D0', 'tickfont':{'color': '#D0D0D0'}, 'tickformat': '.0%', 'range': [0, 1.05]},
+        margin={'l': 10, 'b': 10, 't': 50, 'r': 10},
+        legend={'orientation': 'h', 'y': -0.2, 'font': {'color': '#717171'}},
+        plot_bgcolor='rgba(0,0,0,0)',
+        hovermode="x",
+    )
+    
+    return dcc.Graph(
+        figure=fig, 
+        style={'height': height, 'max-width': max_width, 'min-width': 200},
+    )
+
+
+### DIVERSITY PLOTS ###
+def get_diversity_fig(run, max_width=700, height=250):
+    """
+    Generate a Dash Graph component showing the mean chromosome similarity and the layer usage entropy per generation.
+
+    Args:
+        run (str): Path to the run results.
+        max_width (int): Maximum width of the graph.
+        height (int): Height of the graph.
+
+    Returns:
+        dash_core_components.Graph: Dash Graph component showing the diversity over generations.
+    """
+    metrics = get_diversity_metrics(run)
+    
+    fig = go.Figure()
+    
+    fig.add_trace(go.Scatter(
+        x=metrics["generations"],
+        y=metrics["mean_similarity"],
+        mode='lines+markers',
+        name='Mean pairwise similarity',
+        line=go.scatter.Line(color='#6173E9'),
+        customdata=metrics["distinct"],
+        hovertemplate='Similarity %{y:.3f}, %{customdata} distinct architectures<extra></extra>'
+    ))
+    
+    fig.add_trace(go.Scatter(
+        x=metrics["generations"],
+        y=metrics["normalized_layer_entropy"],
+        mode='lines+markers',
+        name='Layer usage entropy (normalized)',
+        line=go.scatter.Line(color='#A4B0FE', dash='dot'),
+        customdata=metrics["layer_entropy"],
+        hovertemplate='Entropy %{customdata:.2f} bits<extra></extra>'
+    ))
+    
+    fig.update_layout(
+        title="Population diversity over generations",
+        title_font_color='#717171',
+        title_font_size=15,
+        title_font=dict(family='sans-serif'),
+        xaxis={**_generation_axis(metrics["generations"]), 'tickfont':{'color': '#D0D0D0'}, 'showline':True},
+        yaxis={'showgrid':True, 'gridcolor':'#D0D0D0', 'tickfont':{'color': '#D0D0D0'}, 'range': [0, 1.05]},
+        margin={'l': 10, 'b': 10, 't': 50, 'r': 10},
+        legend={'orientation': 'h', 'y': -0.2, 'font': {'color': '#717171'}},
+        plot_bgcolor='rgba(0,0,0,0)',
+        hovermode="x",
+    )
+    
+    return dcc.Graph(
+        figure=fig, 
+        style={'height': height, 'max-width': max_width, 'min-width': 200},
+    )
+
+def figure_embedding(run, generation):
+    """
+    Generate a Plotly scatter plot of the 2D similarity embedding of the individuals of a generation colored by fitness.
+
+    Args:
+        run (str): Path to the run results.
+        generation (int): Generation of the individuals.
+
+    Returns:
+        plotly.graph_objs.Figure: Plotly scatter plot of the embedding.
+    """
+    embedding = get_similarity_embeddings(run)[generation]
+    table = get_results_table(run)
+    
+    # Fitness of the embedded individuals
+    fitness = np.full(len(embedding["individuals"]), np.nan)
+    
+    if "fitness" in table["measurements"]:
+        rows = np.flatnonzero(table["generations"] == generation)
+        row_index = {table["individuals"][row]: row for row in rows}
+        column = table["measurements"].index("fitness")
+        
+        for idx, individual in enumerate(embedding["individuals"]):
+            row = row_index.get(individual)
+            if row is not None and table["healthy"][row]:
+                fitness[idx] = table["values"][row, column]
+    
+    fig = go.Figure(go.Scatter(
+        x=embedding["coordinates"][:, 0],
+        y=embedding["coordinates"][:, 1],
+        mode='markers',
+        text=embedding["individuals"],
+        marker=dict(
+            size=9,
+            color=fitness,
+            colorscale=[[0.0, '#D1D6F8'], [1.0, '#6173E9']],
+            showscale=True,
+            colorbar={'title': 'Fitness', 'thickness': 10, 'tickfont': {'color': '#D0D0D0'}, 'outlinecolor': '#D0D0D0'},
+            line={'width': 1, 'color': '#FFFFFF'},
+        ),
+        hovertemplate='%{text}<br>Fitness: %{marker.color:.3f}<extra></extra>',
+    ))
+    
+    fig.update_layout(
+        title="Individuals by chromosome similarity",
+        title_font_color='#717171',
+        title_font_size=15,
+        title_font=dict(family='sans-serif'),
+        xaxis={'showgrid': False, 'zeroline': False, 'showticklabels': False},
+        yaxis={'showgrid': False, 'zeroline': False, 'showticklabels': False, 'scaleanchor': 'x'},
+        margin={'l': 10, 'b': 10, 't': 50, 'r': 10},
+        plot_bgcolor='rgba(0,0,0,0)',
+    )
+    
+    return fig
+
+
+### SIMILARITY PLOT ###
+def figure_similarity(run, generation, source="evovis"):
+    """
+    Generate a Plotly heatmap of the pairwise chromosome similarity of the individuals of a generation.
+
+    Args:
+        run (str): Path to the run results.
+        generation (int): Generation of the individuals.
+        source (str): "evovis" for the similarity computed by EvoVis or "csv" for the similarity.csv of the run.
+
+    Returns:
+        plotly.graph_objs.Figure: Plotly heatmap of the similarity matrix, empty with a note if the generation has no similarity.csv.
+    """
+    try:
+        similarity = get_similarity_matrix(run, generation, source=source)
+    except ValueError:
+        fig = go.Figure()
+        fig.add_annotation(text=f"Generation {generation} has no similarity.csv", showarrow=False, font={'color': '#717171'})
+        fig.update_layout(xaxis={'visible': False}, yaxis={'visible': False}, plot_bgcolor='rgba(0,0,0,0)')
+        return fig
+    
+    individuals = similarity["individuals"]
+    matrix = similarity["matrix"] if similarity["scale"] == 1.0 else similarity["matrix"] * np.float32(similarity["scale"])
+    
+    fig = go.Figure(go.Heatmap(
+        x=individuals,
+        y=individuals,
+        z=matrix,
+        zmin=0,
+        zmax=1,
+        colorscale=[[0.0, '#FFFFFF'], [1.0, '#6173E9']],
+        hovertemplate='%{y} / %{x}: %{z:.3f}<extra></extra>',
+        colorbar={'thickness': 10, 'tickfont': {'color': '#D0D0D0'}, 'outlinecolor': '#D0D0D0'},
+    ))
+    
+    # Names are only readable for small generations
+    show_labels = len(individuals) <= similarity_max_labels
+    
+    fig.update_layout(
+        xaxis={'tickfont':{'color': '#717171', 'size': 8}, 'showticklabels': show_labels},
+        yaxis={'tickfont':{'color': '#717171', 'size': 8}, 'showticklabels': show_labels, 'autorange': 'reversed'},
+        margin={'l': 10, 'b': 10, 't': 10, 'r': 10},
+        plot_bgcolor='rgba(0,0,0,0)',
+    )
+    
+    return fig
+
+def similarity_overview():
+    """
+    Generate a Dash Div component containing the heatmap and the 2D embedding of the chromosome similarity with a generation slider.
+
+    Returns:
+        dash_html_components.Div: Dash Div component containing the similarity heatmap and embedding.
+    """
+    generations = get_generations(run, as_int=True)
+    
+    if not generations:
+        return None
+    
+    # Label at most ten generations
+    marks_step = max(1, len(generations) // 10)
+    marks = {gen: str(gen) for gen in generations[::marks_step]}
+    
+    return html.Div(
+        [
+            dot_heading("Chromosome similarity", style={"font-size": "14px"}, className='dot-heading-results-page'),
+            dmc.SegmentedControl(
+                id='similarity-source',
+                data=[{"value": "evovis", "label": "Computed by EvoVis"}, {"value": "csv", "label": "similarity.csv"}],
+                value='evovis',
+                size='xs'
+            ),
+            dmc.Group(
+                [
+                    dcc.Graph(
+                        figure=figure_similarity(run, generations[-1]),
+                        style={'height': 600, 'width': 700},
+                        id='similarity-heatmap'
+                    ),
+                    dcc.Graph(
+                        figure=figure_embedding(run, generations[-1]),
+                        style={'height': 500, 'width': 500},
+                        id='similarity-embedding'
+                    ),
+                ],
+                position='left',
+                align='start'
+            ),
+            dcc.Slider(
+                min=generations[0], 
+                max=generations[-1], 
+                step=1, 
+                value=generations[-1], 
+                marks=marks,
+                id='similarity-generation'
+            ),
+        ],
+        style={'max-width': 1220}
+    )
+
+@callback(
+    Output('similarity-heatmap', 'figure'),
+    Output('similarity-embedding', 'figure'),
+    Input('similarity-generation', 'value'),
+    Input('similarity-source', 'value'),
+    prevent_initial_call=True
+)
+def update_similarity(generation, source):
+    """
+    Update the similarity heatmap and the similarity embedding to the selected generation.
+
+    The embedding is always computed from the EvoVis similarity, so all generations share the same metric.
+
+    Args:
+        generation (int): The selected generation.
+        source (str): The source of the heatmap, "evovis" or "csv".
+
+    Returns:
+        plotly.graph_objs.Figure: Plotly heatmap of the similarity matrix.
+        plotly.graph_objs.Figure: Plotly scatter plot of the similarity embedding.
+    """
+    if generation not in get_generations(run, as_int=True):
+        raise PreventUpdate
+    
+    return figure_similarity(run, generation, source), figure_embedding(run, generation)
+
+
 ### BEST INDIVIDUALS PLOT ###
-def best_individuals_overview():
+def best_individuals_overview(k=1, measurement="fitness"):
     """
     Generate a Dash Group component containing the overview of the best individuals chromosomes.
 
+    Args:
+        k (int): Number of best individuals per generation.
+        measurement (str): Measurement to rank the individuals by in its 'objective-direction'.
+
     Returns:
         dash_mantine_components.Group: Dash Group component containing best individuals chromosomes.
     """
     genomes = []
-    best_individuals = get_best_individuals(run)
+    top_individuals = get_top_individuals(run, k=k, measurement=measurement)
     unique_genes = get_unique_gene_colors(run)
     
-    for gen, ind in best_individuals.items():
-        
-        if ind["individual"] is None:
-            continue
-        
-        splits = ind["individual"].split("_")
-        
-        ind_abbrev = ""
-        for split in splits:
-            ind_abbrev += split[0].upper()
+    for gen, individuals in top_individuals.items():
+        for rank, ind in enumerate(individuals, start=1):
         
-        ind_results = ind.copy()
-        del ind_results["chromosome"]
-        ind_results = str(ind_results)
-        ind_results = ind_results.replace('{', '').replace('}', '').replace("'", '')
-        
-        ind_overview = html.Div(
-            [
-                dmc.Tooltip(
-                    label=ind_results,
-                    position="right",
-                    offset=3,
-                    transition="slide-up",
-                    color='gray',
-                    multiline=True,
-                    width="300px",
-                    children=[dmc.Avatar(ind_abbrev, radius="xl", style={"color": "#000000", "background-color": "#FFFFFF", "margin": "5px"})]
-                ),
-                html.P(f"GEN {gen}", style={"margin": "5px", "font-weight": "bold", "font-size": "11px"}),
-                
-                chromosome_sequence(ind["chromosome"], justify="flex-start", align="center", compromised=True, unique_genes=unique_genes),
-            ],
-            className="best-individual"
-        )
-        genomes.append(ind_overview)
+            splits = ind["individual"].split("_")
+            
+            ind_abbrev = ""
+            for split in splits:
+                ind_abbrev += split[0].upper()
+            
+            ind_results = ind.copy()
+            del ind_results["chromosome"]
+            ind_results = str(ind_results)
+            ind_results = ind_results.replace('{', '').replace('}', '').replace("'", '')
+            
+            label = f"GEN {gen}" if k == 1 else f"GEN {gen} #{rank}"
+            
+            ind_overview = html.Div(
+                [
+                    dmc.Tooltip(
+                        label=ind_results,
+                        position="right",
+                        offset=3,
+                        transition="slide-up",
+                        color='gray',
+                        multiline=True,
+                        width="300px",
+                        children=[dmc.Avatar(ind_abbrev, radius="xl", style={"color": "#000000", "background-color": "#FFFFFF", "margin": "5px"})]
+                    ),
+                    html.P(label, style={"margin": "5px", "font-weight": "bold", "font-size": "11px"}),
+                    
+                    chromosome_sequence(ind["chromosome"], justify="flex-start", align="center", compromised=True, unique_genes=unique_genes),
+                ],
+                className="best-individual"
+            )
+            genomes.append(ind_overview)
 
     genomes_div = dmc.Group(
         genomes, 
@@ -495,6 +1277,50 @@ def best_individuals_overview():
     
     return genomes_div
 
+def best_individuals_settings():
+    """
+    Generate a Dash Group component with the number of best individuals per generation and the measurement to rank by.
+
+    Returns:
+        dash_mantine_components.Group: Dash Group component containing the settings of the best individuals overview.
+    """
+    measurements = get_meas_info(run)
+    data = [{"value": meas, "label": meas_info["displayname"]} for meas, meas_info in measurements.items()]
+    
+    if "fitness" not in measurements:
+        data.insert(0, {"value": "fitness", "label": "Fitness"})
+    
+    return dmc.Group(
+        [
+            dmc.NumberInput(id="best-individuals-k", label="Individuals per generation", value=1, min=1, step=1, style={"width": 200}),
+            dmc.Select(id="best-individuals-measurement", label="Ranked by", data=data, value="fitness", style={"width": 200}),
+        ],
+        position='left',
+        style={'margin-bottom': '25px'}
+    )
+
+@callback(
+    Output('best-individuals-overview', 'children'),
+    Input('best-individuals-k', 'value'),
+    Input('best-individuals-measurement', 'value'),
+    prevent_initial_call=True
+)
+def update_best_individuals(k, measurement):
+    """
+    Update the overview of the best individuals to the selected number per generation and measurement.
+
+    Args:
+        k (int): Number of best individuals per generation.
+        measurement (str): Measurement to rank the individuals by.
+
+    Returns:
+        dash_mantine_components.Group: Dash Group component containing best individuals chromosomes.
+    """
+    if not k or k < 1 or measurement is None:
+        raise PreventUpdate
+    
+    return best_individuals_overview(int(k), measurement)
+
 
 ### PAGE LAYOUT ###
 def performance_plots_div():
@@ -508,10 +1334,35 @@ def performance_plots_div():
         children=[
             html.H1("Run Result Plots", style={'margin-bottom': '25px', 'margin-top': '25px'}),
             general_overview(),
-            objectives_overview(),
+            dmc.SegmentedControl(
+                id='objectives-view',
+                data=[{"value": "mean", "label": "Mean and standard deviation"}, {"value": "box", "label": "Distribution"}],
+                value='mean',
+                size='xs',
+                style={'margin-top': '25px'}
+            ),
+            html.Div(objectives_overview(), id='objectives-overview'),
+            correlation_overview(),
         ]
     )
 
+@callback(
+    Output('objectives-overview', 'children'),
+    Input('objectives-view', 'value'),
+    prevent_initial_call=True
+)
+def update_objectives_view(view):
+    """
+    Switch the overview of metrics over generations plots between mean and distribution.
+
+    Args:
+        view (str): The selected view, "mean" or "box".
+
+    Returns:
+        dash_mantine_components.Grid: Dash Grid component containing overview of metrics over generations plots.
+    """
+    return objectives_overview(view)
+
 def best_individuals_div():
     """
     Generate a Dash Div component containing chromsomes of the best individuals.
@@ -522,7 +1373,23 @@ def best_individuals_div():
     return html.Div(
         children=[
             html.H1("Fittest Individuals", style={'margin-bottom': '25px', 'margin-top': '25px'}),
-            best_individuals_overview()
+            best_individuals_settings(),
+            html.Div(best_individuals_overview(), id="best-individuals-overview")
+        ]
+    )
+
+def diversity_div():
+    """
+    Generate a Dash Div component containing the diversity, the architecture uniqueness and the chromosome similarity of the individuals.
+
+    Returns:
+        dash_html_components.Div: Dash Div component containing the diversity plots and the similarity heatmap.
+    """
+    return html.Div(
+        children=[
+            html.H1("Population Diversity", style={'margin-bottom': '25px', 'margin-top': '25px'}),
+            dmc.Group([get_diversity_fig(run), get_uniqueness_fig(run)], position='left', align='start'),
+            similarity_overview()
         ]
     )
 
@@ -552,10 +1419,12 @@ def run_results_layout():
                     [   
                         dmc.Tab("Run results plots", value="plots"),
                         dmc.Tab("Fittest individuals", value="best-individuals"),
+                        dmc.Tab("Diversity", value="diversity"),
                     ]
                 ),
                 dmc.TabsPanel(performance_plots_div(), value="plots"),
                 dmc.TabsPanel(best_individuals_div(), value="best-individuals"),
+                dmc.TabsPanel(diversity_div(), value="diversity"),
             ],
             color="indigo",
             orientation="horizontal",
@@ -0,0 +1,436 @@
+import numpy as np
+from bisect import bisect_left, bisect_right
+from evolution import get_generations, get_meas_info, get_results_table
+
+
+##################################################
+
+# MODULE PARETO
+
+# The Pareto Module provides functionalities
+# for the non-dominated sorting of the individuals
+# by the fitness function objectives of a run
+# and for the Pareto ranks of the individuals.
+
+##################################################
+
+
+### OBJECTIVES ###
+MAX_OBJECTIVES = 3
+
+def get_pareto_objectives(run):
+    """
+    Get the fitness function objectives and their optimization directions.
+    The objectives are the measurements with 'pareto-optimlity-plot' set, at most the first three.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+
+    Returns:
+        tuple: A tuple containing:
+               - list: The measurement keys of the objectives.
+               - list: The directions of the objectives ("maximize" or "minimize").
+
+    Example:
+    >>> get_pareto_objectives('my_run')
+    (['memory_footprint_h5', 'inference_time', 'val_acc'], ['minimize', 'minimize', 'maximize'])
+    """
+    measurements = get_meas_info(run)
+    objectives = [meas for meas, meas_info in measurements.items() if meas_info["pareto-optimlity-plot"]][:MAX_OBJECTIVES]
+    directions = [measurements[meas]["objective-direction"] for meas in objectives]
+
+    return objectives, directions
+
+def _to_minimization(values, directions):
+    """
+    Convert objective values so that all objectives are minimized.
+
+    Args:
+        values (numpy.ndarray): Matrix of objective values (points x objectives).
+        directions (list): The directions of the objectives ("maximize" or "minimize").
+
+    Returns:
+        numpy.ndarray: The objective values with the maximized objectives negated.
+    """
+    signs = np.array([-1.0 if direction == "maximize" else 1.0 for direction in directions])
+    return values * signs
+
+
+### NON-DOMINATED SORTING ###
+def _sort_1d(points):
+    """
+    Rank one-dimensional points, every distinct value forms its own front.
+
+    Args:
+        points (numpy.ndarray): Matrix of distinct points (points x 1), lexicographically sorted.
+
+    Returns:
+        numpy.ndarray: The Pareto rank of every point, starting with 1.
+    """
+    return np.arange(1, len(points) + 1, dtype=np.int32)
+
+def _sort_2d(points):
+    """
+    Rank two-dimensional points with a sweep over the first objective.
+
+    Every front is represented by its smallest second objective, which grows from front to front.
+    A point belongs to the first front whose smallest second objective is larger than its own,
+    found by binary search. The sorting takes O(n log n).
+
+    Args:
+        points (numpy.ndarray): Matrix of distinct points (points x 2), lexicographically sorted.
+
+    Returns:
+        numpy.ndarray: The Pareto rank of every point, starting with 1.
+    """
+    ranks = np.empty(len(points), dtype=np.int32)
+    front_minimum = []
+
+    for idx, y in enumerate(points[:, 1].tolist()):
+        front = bisect_right(front_minimum, y)
+
+        if front == len(front_minimum):
+            front_minimum.append(y)
+        else:
+            front_minimum[front] = y
+
+        ranks[idx] = front + 1
+
+    return ranks
+
+def _sort_3d(points):
+    """
+    Rank three-dimensional points with a sweep over the first objective.
+
+    Every front keeps the staircase of its non-dominated points in the second and third objective.
+    As all earlier points are not worse in the first objective, a point is dominated by a front if a
+    staircase point is not worse in the other two objectives. Since a point dominated by a front is
+    dominated by all earlier fronts, the front of a point is found by binary search over the fronts,
+    each test being a binary search in a staircase. The sorting takes O(n log² n) plus the staircase updates.
+
+    Args:
+        points (numpy.ndarray): Matrix of distinct points (points x 3), lexicographically sorted.
+
+    Returns:
+        numpy.ndarray: The Pareto rank of every point, starting with 1.
+    """
+    ranks = np.empty(len(points), dtype=np.int32)
+
+    # Staircase of every front: second objective ascending, third objective descending
+    stairs_y = []
+    stairs_z = []
+
+    def dominates(front, y, z):
+        idx = bisect_right(stairs_y[front], y) - 1
+        return idx >= 0 and stairs_z[front][idx] <= z
+
+    for idx, (y, z) in enumerate(points[:, 1:].tolist()):
+
+        # First front that doesn't dominate the point
+        low, high = 0, len(stairs_y)
+        while low < high:
+            middle = (low + high) // 2
+            if dominates(middle, y, z):
+                low = middle + 1
+            else:
+                high = middle
+
+        if low == len(stairs_y):
+            stairs_y.append([y])
+            stairs_z.append([z])
+
+        else:
+            front_y, front_z = stairs_y[low], stairs_z[low]
+
+            # Remove the staircase points which are now dominated
+            start = bisect_left(front_y, y)
+            end = start
+            while end < len(front_y) and front_z[end] >= z:
+                end += 1
+
+            front_y[start:end] = [y]
+            front_z[start:end] = [z]
+
+        ranks[idx] = low + 1
+
+    return ranks
+
+def non_dominated_sort(values, directions=None):
+    """
+    Compute the Pareto rank of every point, the Pareto front has rank 1.
+
+    Equal points get the same rank. Points with NaN values aren't ranked.
+
+    Args:
+        values (numpy.ndarray): Matrix of objective values (points x objectives) with 1 to 3 objectives.
+        directions (list, optional): The directions of the objectives ("maximize" or "minimize"). Defaults to minimizing all objectives.
+
+    Returns:
+        numpy.ndarray: The Pareto rank of every point, 0 for points with NaN values.
+
+    Raises:
+        ValueError: If there are more than three objectives.
+
+    Example:
+    >>> non_dominated_sort(np.array([[1, 2], [2, 1], [2, 2]]))
+    array([1, 1, 2], dtype=int32)
+    """
+    values = np.asarray(values, dtype=np.float64)
+
+    if values.ndim != 2 or not 1 <= values.shape[1] <= MAX_OBJECTIVES:
+        raise ValueError(f"Non-dominated sorting supports 1 to {MAX_OBJECTIVES} objectives.")
+
+    if directions is not None:
+        values = _to_minimization(values, directions)
+
+    ranks = np.zeros(len(values), dtype=np.int32)
+    valid = ~np.isnan(values).any(axis=1)
+
+    if not valid.any():
+        return ranks
+
+    # Distinct points in lexicographic order
+    points, inverse = np.unique(values[valid], axis=0, return_inverse=True)
+    sorters = {1: _sort_1d, 2: _sort_2d, 3: _sort_3d}
+    ranks[valid] = sorters[values.shape[1]](points)[inverse.reshape(-1)]
+
+    return ranks
+
+
+### PARETO RANKS OF A RUN ###
+_pareto_ranks = {}
+
+def get_pareto_ranks(run):
+    """
+    Get the Pareto rank of every individual of the run by the fitness function objectives.
+
+    The rows are the rows of the results table. Only healthy individuals with valid values for
+    all objectives are ranked. The ranks are cached until a new generation is processed or the config changes.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+
+    Returns:
+        dict: A dictionary containing:
+              - 'objectives': The measurement keys of the objectives.
+              - 'directions': The directions of the objectives.
+              - 'generations': Array with the generation number of every individual.
+              - 'individuals': List with the names of the individuals.
+              - 'values': Matrix of the objective values (individuals x objectives).
+              - 'ranks': The Pareto rank of every individual, 0 if not ranked.
+              - 'front': Boolean array, True for individuals on the Pareto front.
+
+    Example:
+    >>> pareto = get_pareto_ranks('my_run')
+    >>> np.array(pareto['individuals'])[pareto['front']]
+    array(['clay_poodle', ...])
+    """
+    table = get_results_table(run)
+    objectives, directions = get_pareto_objectives(run)
+    key = (tuple(get_generations(run, as_int=True)), tuple(objectives), tuple(directions))
+
+    cached = _pareto_ranks.get(run)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    columns = [table["measurements"].index(objective) for objective in objectives]
+    values = table["values"][:, columns]
+    ranks = np.zeros(len(values), dtype=np.int32)
+
+    if objectives:
+        healthy = table["healthy"]
+        ranks[healthy] = non_dominated_sort(values[healthy], directions)
+
+    pareto = {
+        "objectives": objectives,
+        "directions": directions,
+        "generations": table["generations"],
+        "individuals": table["individuals"],
+        "values": values,
+        "ranks": ranks,
+        "front": ranks == 1,
+    }
+    _pareto_ranks[run] = (key, pareto)
+
+    return pareto
+
+
+### HYPERVOLUME ###
+# Margin of the reference point beyond the worst value of the first generation, relative to its value range
+HYPERVOLUME_MARGIN = 0.1
+
+_hypervolumes = {}
+
+def _dominated_area(points):
+    """
+    Compute the area dominated by a set of two-dimensional points up to the reference point (1, 1).
+
+    Args:
+        points (list): List of (x, y) tuples within the unit square.
+
+    Returns:
+        float: The area of the union of the boxes spanned by the points and the reference point.
+    """
+    area = 0.0
+    lowest = 1.0
+    points = sorted(points)
+
+    for idx, (x, y) in enumerate(points):
+        lowest = min(lowest, y)
+        next_x = points[idx + 1][0] if idx + 1 < len(points) else 1.0
+        area += (next_x - x) * (1.0 - lowest)
+
+    return area
+
+def _hypervolume_2d(points):
+    """
+    Compute the exact hypervolume of normalized two-dimensional points with reference point (1, 1).
+
+    Args:
+        points (numpy.ndarray): Matrix of points (points x 2) to be minimized within the unit square.
+
+    Returns:
+        float: The hypervolume.
+    """
+    return _dominated_area(points.tolist())
+
+def _hypervolume_3d(points):
+    """
+    Compute the exact hypervolume of normalized three-dimensional points with reference point (1, 1, 1).
+
+    The points are swept by the third objective while the dominated area of the first two objectives is
+    kept as a staircase. Every inserted point only changes the area next to the staircase points it removes,
+    so the sweep takes O(n log n) plus the staircase updates.
+
+    Args:
+        points (numpy.ndarray): Matrix of points (points x 3) to be minimized within the unit cube.
+
+    Returns:
+        float: The hypervolume.
+    """
+    points = points[np.argsort(points[:, 2], kind="stable")].tolist()
+    stairs_x, stairs_y = [], []
+    area = 0.0
+    volume = 0.0
+
+    for idx, (x, y, z) in enumerate(points):
+        start = bisect_left(stairs_x, x)
+        dominated = (start > 0 and stairs_y[start - 1] <= y) or (start < len(stairs_x) and stairs_x[start] == x and stairs_y[start] <= y)
+
+        if not dominated:
+            end = start
+            while end < len(stairs_x) and stairs_y[end] >= y:
+                end += 1
+
+            # Area of the staircase within the box of the point before inserting it
+            overlap = [(x, stairs_y[start - 1])] if start > 0 else []
+            overlap += list(zip(stairs_x[start:end], stairs_y[start:end]))
+            overlap += [(stairs_x[end], y)] if end < len(stairs_x) else []
+
+            area += (1.0 - x) * (1.0 - y) - _dominated_area(overlap)
+            stairs_x[start:end] = [x]
+            stairs_y[start:end] = [y]
+
+        next_z = points[idx + 1][2] if idx + 1 < len(points) else 1.0
+        volume += area * (next_z - z)
+
+    return volume
+
+def _get_hypervolume_bounds(run, pareto, values, row_generations):
+    """
+    Get the fixed ideal and reference point of the hypervolume in minimization form.
+
+    The bounds of an objective are its 'min-boundary' and 'max-boundary' from the config.json file. Missing
+    bounds are taken from the ranked individuals of the first generation, the reference point widened by
+    HYPERVOLUME_MARGIN of their range, so they don't change when generations are added.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+        pareto (dict): The Pareto ranks of the run, see get_pareto_ranks.
+        values (numpy.ndarray): Matrix (ranked individuals x objectives) of the objective values to be minimized.
+        row_generations (numpy.ndarray): The generation of every ranked individual.
+
+    Returns:
+        tuple: The ideal point and the reference point.
+    """
+    meas_infos = get_meas_info(run)
+    first = values[row_generations == row_generations.min()] if len(values) else np.zeros((0, len(pareto["objectives"])))
+    ideal = np.zeros(len(pareto["objectives"]))
+    reference = np.ones(len(pareto["objectives"]))
+
+    for col, (objective, direction) in enumerate(zip(pareto["objectives"], pareto["directions"])):
+        low, high = meas_infos[objective]["min-boundary"], meas_infos[objective]["max-boundary"]
+
+        # Best and worst value to be minimized
+        best, worst = (-high if high is not None else None, -low if low is not None else None) if direction == "maximize" else (low, high)
+        first_best = first[:, col].min() if len(first) else 0.0
+        first_worst = first[:, col].max() if len(first) else 1.0
+        margin = HYPERVOLUME_MARGIN * (first_worst - first_best) if first_worst > first_best else 1.0
+
+        ideal[col] = best if best is not None else first_best
+        reference[col] = worst if worst is not None else first_worst + margin
+
+    return ideal, reference
+
+def get_hypervolumes(run):
+    """
+    Get the hypervolume of the fitness function objectives reached up to every generation.
+
+    The objectives are normalized by a fixed ideal and reference point, the boundaries of the config.json file
+    or the values of the first generation, so the hypervolumes of a run stay comparable as generations are
+    added. Points beyond the reference point add no volume and points better than the ideal point can raise
+    the hypervolume above 1. The hypervolume is computed exactly for two and three objectives. The
+    non-dominated individuals found so far are kept as archive, so a new generation only merges its
+    individuals into the archive.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+
+    Returns:
+        dict: A dictionary containing:
+              - 'generations': The generation numbers.
+              - 'hypervolume': The normalized hypervolume reached up to every generation.
+              Returns None if there are less than two objectives.
+
+    Example:
+    >>> get_hypervolumes('my_run')['hypervolume']
+    [0.41, 0.52, 0.52, 0.58, ...]
+    """
+    pareto = get_pareto_ranks(run)
+    num_objectives = len(pareto["objectives"])
+
+    if num_objectives < 2:
+        return None
+
+    ranked = pareto["ranks"] > 0
+    values = _to_minimization(pareto["values"][ranked], pareto["directions"])
+    row_generations = pareto["generations"][ranked]
+    generations = [int(generation) for generation in np.unique(pareto["generations"])]
+
+    ideal, reference = _get_hypervolume_bounds(run, pareto, values, row_generations)
+    scale = np.where(reference > ideal, reference - ideal, 1.0)
+    key = (tuple(pareto["objectives"]), tuple(pareto["directions"]), tuple(ideal), tuple(reference))
+
+    cached = _hypervolumes.get(run)
+    if cached is None or cached["key"] != key or cached["generations"] != generations[:len(cached["generations"])]:
+        cached = {"key": key, "generations": [], "hypervolume": [], "archive": np.zeros((0, num_objectives))}
+        _hypervolumes[run] = cached
+
+    hypervolume = _hypervolume_2d if num_objectives == 2 else _hypervolume_3d
+
+    for generation in generations[len(cached["generations"]):]:
+        new_points = (values[row_generations == generation] - ideal) / scale
+        new_points = new_points[(new_points < 1.0).all(axis=1)]
+        archive = np.vstack([cached["archive"], new_points])
+
+        if len(archive):
+            archive = np.unique(archive[non_dominated_sort(archive) == 1], axis=0)
+
+        cached["archive"] = archive
+        cached["generations"].append(generation)
+        cached["hypervolume"].append(hypervolume(archive) if len(archive) else 0.0)
+
+    return {
+        "generations": list(cached["generations"]),
+        "hypervolume": list(cached["hypervolume"]),
+    }
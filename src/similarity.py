@@ -0,0 +1,989 @@
+import numpy as np
+import pandas as pd
+import os
+import sys
+import json
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from evolution import get_individuals, get_generations, get_architecture_hash
+from genepool import encode_chromosome, encode_run_chromosomes, get_compiled_search_space
+from neighbors import get_neighbor_index, LSH_BANDS
+
+
+##################################################
+
+# MODULE SIMILARITY
+
+# The Similarity Module provides functionalities
+# for encoding the chromosomes of a generation
+# as gene sequences, for computing the pairwise
+# alignment similarity of the sequences with a
+# checkpoint of the aligned architecture pairs, for
+# loading the similarity matrices of a run and for
+# the sparse similarity graph across generations.
+
+##################################################
+
+
+### GENE SEQUENCES OF A GENERATION ###
+def get_generation_sequences(run, generation):
+    """
+    Get the gene sequences of the individuals of a generation.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+        generation (int): The generation number.
+
+    Returns:
+        dict: A dictionary mapping individual names to their gene sequences.
+
+    Example:
+    >>> get_generation_sequences('my_run', 6)
+    {'banana_bat': 'CBg', 'cerise_shrimp': 'TRDIDITMBgO', ...}
+    """
+    chromosomes = get_individuals(run, range(generation, generation+1), value="chromosome", as_generation_dict=True)[generation]
+
+    return {
+        individual: encode_chromosome(run, chromosome)
+        for individual, chromosome in sorted(chromosomes.items())
+        if chromosome is not None
+    }
+
+
+### ALIGNMENT KERNEL ###
+# Number of sequence pairs aligned together, batches are spread over a process pool
+ALIGNMENT_BATCH = 65536
+
+def _encode_sequences(sequences, padding):
+    """
+    Encode sequences as a padded matrix of character codes.
+
+    Args:
+        sequences (list): The sequences.
+        padding (int): The code of the padding, must not match any character or the padding of other matrices.
+
+    Returns:
+        tuple: The matrix (sequences x longest length) of the codes and the lengths of the sequences.
+    """
+    lengths = np.array([len(sequence) for sequence in sequences], dtype=np.int64)
+    codes = np.full((len(sequences), max(lengths.max(initial=0), 1)), padding, dtype=np.int32)
+
+    for idx, sequence in enumerate(sequences):
+        codes[idx, :len(sequence)] = [ord(char) for char in sequence]
+
+    return codes, lengths
+
+def _alignment_matches(sequences_a, sequences_b):
+    """
+    Count the matching genes of the optimal global alignments of sequence pairs.
+
+    The alignments score a match with 1, mismatches and gaps with 0. The dynamic programming matrices of
+    all pairs are computed together row by row: a cell takes the diagonal cell plus the match or the cell
+    above, and because gaps are free the row is completed with a running maximum. A pair drops out once
+    the rows of its shorter sequence are done.
+
+    Args:
+        sequences_a (list): The first sequences of the pairs.
+        sequences_b (list): The second sequences of the pairs.
+
+    Returns:
+        numpy.ndarray: The number of matching genes of every pair.
+    """
+    # The shorter sequence of every pair spans the rows, pairs with long rows first
+    pairs = [(a, b) if len(a) <= len(b) else (b, a) for a, b in zip(sequences_a, sequences_b)]
+    order = np.argsort([-len(a) for a, _ in pairs], kind="stable")
+    codes_a, lengths_a = _encode_sequences([pairs[idx][0] for idx in order], -1)
+    codes_b, lengths_b = _encode_sequences([pairs[idx][1] for idx in order], -2)
+
+    row = np.zeros((len(pairs), codes_b.shape[1] + 1), dtype=np.int32)
+
+    for i in range(codes_a.shape[1]):
+        # Only pairs whose shorter sequence has a gene in this row are active
+        active = np.searchsorted(-lengths_a, -i, side="left")
+        current = row[:active]
+        candidate = current.copy()
+        candidate[:, 1:] = np.maximum(current[:, 1:], current[:, :-1] + (codes_a[:active, i:i+1] == codes_b[:active]))
+        row[:active] = np.maximum.accumulate(candidate, axis=1)
+
+    matches = np.zeros(len(pairs), dtype=np.int32)
+    matches[order] = row[np.arange(len(pairs)), lengths_b]
+
+    return matches
+
+def _alignment_similarities(sequences_a, sequences_b):
+    """
+    Compute the alignment similarity of sequence pairs.
+
+    Args:
+        sequences_a (list): The first sequences of the pairs.
+        sequences_b (list): The second sequences of the pairs.
+
+    Returns:
+        numpy.ndarray: The similarity of every pair.
+    """
+    longest = np.array([max(len(a), len(b)) for a, b in zip(sequences_a, sequences_b)], dtype=np.float64)
+    matches = _alignment_matches(sequences_a, sequences_b)
+
+    return np.where(longest > 0, matches / np.maximum(longest, 1), 1.0)
+
+def _align_pairs(sequences_a, sequences_b, workers=None):
+    """
+    Compute the alignment similarity of sequence pairs in batches of ALIGNMENT_BATCH, spread over a process pool if there are several.
+
+    Args:
+        sequences_a (list): The first sequences of the pairs.
+        sequences_b (list): The second sequences of the pairs.
+        workers (int, optional): The number of processes. Defaults to the number of CPUs.
+
+    Returns:
+        numpy.ndarray: The similarity of every pair.
+    """
+    batches = [(sequences_a[start:start + ALIGNMENT_BATCH], sequences_b[start:start + ALIGNMENT_BATCH]) for start in range(0, len(sequences_a), ALIGNMENT_BATCH)]
+    workers = min(workers or os.cpu_count() or 1, len(batches))
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_alignment_similarities, *zip(*batches)))
+    else:
+        results = [_alignment_similarities(batch_a, batch_b) for batch_a, batch_b in batches]
+
+    return np.concatenate(results) if results else np.zeros(0)
+
+def compute_similarity_matrix(sequences, workers=None):
+    """
+    Compute the pairwise alignment similarity of gene sequences.
+
+    The similarity of two sequences is the number of matching genes of their optimal global alignment
+    divided by the length of the longer sequence, so identical sequences have similarity 1.
+    Only distinct sequences are aligned. The pairs are aligned in batches of ALIGNMENT_BATCH,
+    which are spread over a process pool if there are several.
+
+    Args:
+        sequences (list): The gene sequences.
+        workers (int, optional): The number of processes. Defaults to the number of CPUs.
+
+    Returns:
+        numpy.ndarray: The symmetric similarity matrix (sequences x sequences).
+
+    Example:
+    >>> compute_similarity_matrix(['CBgO', 'CDIMDBgO'])
+    array([[1. , 0.5],
+           [0.5, 1. ]])
+    """
+    distinct, inverse = np.unique(np.array(sequences, dtype=object), return_inverse=True)
+    distinct = distinct.tolist()
+    inverse = inverse.reshape(-1)
+
+    # Pairs of distinct sequences, sorted by length so padded rows are short
+    order = np.argsort([len(sequence) for sequence in distinct], kind="stable")
+    rows, cols = np.triu_indices(len(distinct), k=1)
+    rows, cols = order[rows], order[cols]
+    similarities = _align_pairs([distinct[idx] for idx in rows], [distinct[idx] for idx in cols], workers)
+
+    distinct_matrix = np.eye(len(distinct))
+    distinct_matrix[rows, cols] = similarities
+    distinct_matrix[cols, rows] = similarities
+
+    return distinct_matrix[np.ix_(inverse, inverse)]
+
+
+### SIMILARITY CHECKPOINTS ###
+_similarity_checkpoints = {}
+
+def _get_checkpoint_dir(run):
+    """
+    Get the similarity checkpoint directory in the EvoVis cache directory of the run, creating it if necessary.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+
+    Returns:
+        str: The path of the similarity checkpoint directory.
+    """
+    checkpoint_dir = os.path.join(_get_similarity_cache_dir(run), "checkpoints")
+    os.makedirs(checkpoint_dir, exist_ok=True)
+    return checkpoint_dir
+
+def _load_similarity_checkpoint(run):
+    """
+    Load the similarity scores of the checkpoint files which weren't loaded before.
+
+    Every processed generation has one checkpoint file with the scores of the architecture pairs first
+    aligned in that generation. Files are only loaded once per session.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+
+    Returns:
+        dict: The checkpoint of the run with the 'generations' processed and the 'scores' of the architecture
+              hash pairs, the smaller hash first.
+    """
+    checkpoint = _similarity_checkpoints.setdefault(run, {"generations": set(), "scores": {}})
+
+    try:
+        checkpoint_dir = _get_checkpoint_dir(run)
+        filenames = os.listdir(checkpoint_dir)
+    except OSError:
+        return checkpoint
+
+    for filename in filenames:
+        if not (filename.startswith("Generation_") and filename.endswith(".npz")):
+            continue
+
+        generation = int(filename[len("Generation_"):-len(".npz")])
+        if generation in checkpoint["generations"]:
+            continue
+
+        with np.load(os.path.join(checkpoint_dir, filename)) as pairs:
+            checkpoint["scores"].update(zip(zip(pairs["first"].tolist(), pairs["second"].tolist()), pairs["scores"].tolist()))
+
+        checkpoint["generations"].add(generation)
+
+    return checkpoint
+
+def _write_similarity_checkpoint(run, generation, pairs, scores):
+    """
+    Write the newly aligned architecture pairs of a generation to its checkpoint file.
+
+    The file is written to a temporary file first and renamed, so an interrupted write never leaves
+    a partial checkpoint behind.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+        generation (int): The generation number.
+        pairs (list): The architecture hash pairs, the smaller hash first.
+        scores (numpy.ndarray): The similarity of every pair.
+    """
+    filepath = os.path.join(_get_checkpoint_dir(run), f"Generation_{generation}.npz")
+    temporary = f"{filepath}.tmp"
+
+    with open(temporary, 'wb') as file:
+        np.savez(
+            file,
+            first=np.array([first for first, _ in pairs], dtype=str),
+            second=np.array([second for _, second in pairs], dtype=str),
+            scores=np.asarray(scores, dtype=np.float64),
+        )
+
+    os.replace(temporary, filepath)
+
+
+### SIMILARITY CSV ###
+def get_generation_similarity(run, generation, workers=None):
+    """
+    Compute the similarity matrix of the individuals of a generation.
+
+    Individuals with the same architecture hash share their scores and only the architecture pairs missing in the
+    similarity checkpoint of the run are aligned, so the cost of a generation depends on its new architectures
+    and not on the length of the run. The new scores are checkpointed once the generation is complete, so an
+    interrupted computation resumes with the last complete generation.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+        generation (int): The generation number.
+        workers (int, optional): The number of processes. Defaults to the number of CPUs.
+
+    Returns:
+        pandas.DataFrame: The similarity matrix with the individual names as index and columns.
+    """
+    chromosomes = get_individuals(run, range(generation, generation+1), value="chromosome", as_generation_dict=True)[generation]
+    chromosomes = {individual: chromosome for individual, chromosome in sorted(chromosomes.items()) if chromosome is not None}
+    names = list(chromosomes.keys())
+
+    # Distinct architectures of the generation
+    sequences = {}
+    hashes = []
+    for chromosome in chromosomes.values():
+        chromosome_hash = get_architecture_hash(chromosome)
+        hashes.append(chromosome_hash)
+        if chromosome_hash not in sequences:
+            sequences[chromosome_hash] = encode_chromosome(run, chromosome)
+
+    distinct = sorted(sequences)
+    inverse = np.searchsorted(distinct, hashes) if hashes else np.zeros(0, dtype=np.int64)
+
+    # Architecture pairs without checkpointed score
+    checkpoint = _load_similarity_checkpoint(run)
+    rows, cols = np.triu_indices(len(distinct), k=1)
+    pairs = [(distinct[row], distinct[col]) for row, col in zip(rows.tolist(), cols.tolist())]
+    missing = [pair for pair in pairs if pair not in checkpoint["scores"]]
+
+    scores = _align_pairs([sequences[first] for first, _ in missing], [sequences[second] for _, second in missing], workers)
+    checkpoint["scores"].update(zip(missing, scores.tolist()))
+
+    if generation not in checkpoint["generations"]:
+        try:
+            _write_similarity_checkpoint(run, generation, missing, scores)
+        except OSError:
+            # Read-only run directories keep the scores in memory for this session
+            pass
+        checkpoint["generations"].add(generation)
+
+    distinct_matrix = np.eye(len(distinct))
+    distinct_matrix[rows, cols] = [checkpoint["scores"][pair] for pair in pairs]
+    distinct_matrix[cols, rows] = distinct_matrix[rows, cols]
+    matrix = distinct_matrix[np.ix_(inverse, inverse)]
+
+    return pd.DataFrame(np.round(matrix, 3), index=names, columns=names)
+
+def update_similarity_checkpoint(run, workers=None):
+    """
+    Compute the similarity scores of all processed generations which aren't in the similarity checkpoint yet.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+        workers (int, optional): The number of processes. Defaults to the number of CPUs.
+
+    Returns:
+        list: The generation numbers which were computed.
+
+    Example:
+    >>> update_similarity_checkpoint('my_run')
+    [21]
+    """
+    checkpoint = _load_similarity_checkpoint(run)
+    new_generations = [generation for generation in get_generations(run, as_int=True) if generation not in checkpoint["generations"]]
+
+    for generation in new_generations:
+        get_generation_similarity(run, generation, workers)
+
+    return new_generations
+
+def write_similarity_csv(run, generation, filepath=None, workers=None, force=False):
+    """
+    Compute the similarity matrix of a generation and write it in the similarity.csv format.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+        generation (int): The generation number.
+        filepath (str, optional): The path of the CSV file. Defaults to the similarity.csv file of the generation.
+        workers (int, optional): The number of processes. Defaults to the number of CPUs.
+        force (bool, optional): Whether an existing file is overwritten. Defaults to False.
+
+    Returns:
+        str: The path of the written file.
+
+    Raises:
+        FileExistsError: If the file exists and force is False.
+    """
+    if filepath is None:
+        filepath = f"{run}/Generation_{generation}/similarity.csv"
+
+    if os.path.exists(filepath) and not force:
+        raise FileExistsError(f"{filepath} already exists. Use force=True to overwrite it.")
+
+    similarity = get_generation_similarity(run, generation, workers)
+    similarity.to_csv(filepath, index_label="Unnamed: 0")
+
+    return filepath
+
+
+### SIMILARITY MATRICES ###
+# Storage type of the cached matrices, "float32" or "uint8" quantized to steps of 1/255
+SIMILARITY_DTYPE = "float32"
+QUANTIZATION_STEPS = 255
+
+# Source of the matrices, "evovis" aligns the gene sequences of every generation with the same metric,
+# "csv" reads the similarity.csv files shipped with the run, whose metric differs and which may be missing
+SIMILARITY_SOURCES = ("evovis", "csv")
+SIMILARITY_SOURCE = "evovis"
+
+_similarity_matrices = {}
+
+def _get_similarity_cache_dir(run):
+    """
+    Get the similarity matrix directory in the EvoVis cache directory of the run, creating it if necessary.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+
+    Returns:
+        str: The path of the similarity matrix directory.
+    """
+    cache_dir = os.path.join(run, ".evovis", "similarity")
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+def _get_csv_signature(filepath):
+    """
+    Get the modification time and size of a similarity.csv file.
+
+    Args:
+        filepath (str): The path of the CSV file.
+
+    Returns:
+        list: The modification time in nanoseconds and the size in bytes, None if the file doesn't exist.
+    """
+    if not os.path.isfile(filepath):
+        return None
+
+    stat = os.stat(filepath)
+    return [stat.st_mtime_ns, stat.st_size]
+
+def _get_generation_signature(run, generation):
+    """
+    Get the signature of the chromosomes of a generation, which the EvoVis similarity is computed from.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+        generation (int): The generation number.
+
+    Returns:
+        str: Hash of the sorted individual names with their architecture hashes and of the search space.
+    """
+    chromosomes = get_individuals(run, range(generation, generation+1), value="chromosome", as_generation_dict=True)[generation]
+    content = [get_compiled_search_space(run).signature] + [
+        [individual, get_architecture_hash(chromosome)] for individual, chromosome in sorted(chromosomes.items())
+    ]
+
+    return hashlib.sha1(json.dumps(content).encode("utf-8")).hexdigest()
+
+def _get_source_signature(run, generation, source):
+    """
+    Get the signature of the source of a similarity matrix, which changes whenever the matrix changes.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+        generation (int): The generation number.
+        source (str): "csv" or "evovis".
+
+    Returns:
+        list or str: The signature of the similarity.csv (None if it doesn't exist) or of the chromosomes.
+    """
+    if source == "csv":
+        return _get_csv_signature(f"{run}/Generation_{generation}/similarity.csv")
+
+    return _get_generation_signature(run, generation)
+
+def _read_similarity_source(run, generation, source):
+    """
+    Read the similarity matrix of a generation from its similarity.csv or compute it from the chromosomes.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+        generation (int): The generation number.
+        source (str): "csv" or "evovis".
+
+    Returns:
+        tuple: The individual names and the similarity matrix as float32 array.
+    """
+    if source == "csv":
+        similarity = pd.read_csv(f"{run}/Generation_{generation}/similarity.csv", index_col=0, dtype={0: str}, engine="c")
+        similarity = similarity.astype(np.float32)
+    else:
+        similarity = get_generation_similarity(run, generation)
+
+    return [str(name) for name in similarity.index], similarity.to_numpy(dtype=np.float32)
+
+def _convert_similarity_matrix(run, generation, dtype, source):
+    """
+    Convert the similarity matrix of a generation into a binary matrix file with a name index.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+        generation (int): The generation number.
+        dtype (str): The storage type, "float32" or "uint8".
+        source (str): "csv" or "evovis".
+
+    Returns:
+        dict: The name index with the individual names, the storage type, the source and the signature of the source.
+    """
+    signature = _get_source_signature(run, generation, source)
+    individuals, matrix = _read_similarity_source(run, generation, source)
+
+    if dtype == "uint8":
+        matrix = np.rint(np.clip(matrix, 0.0, 1.0) * QUANTIZATION_STEPS).astype(np.uint8)
+
+    index = {"signature": signature, "dtype": dtype, "source": source, "individuals": individuals}
+
+    try:
+        cache_dir = _get_similarity_cache_dir(run)
+        np.save(os.path.join(cache_dir, f"Generation_{generation}_{source}_{dtype}.npy"), matrix)
+
+        with open(os.path.join(cache_dir, f"Generation_{generation}_{source}_{dtype}.json"), 'w') as file:
+            json.dump(index, file)
+    except OSError:
+        # Read-only run directories keep the matrix in memory for this session
+        index["matrix"] = matrix
+
+    return index
+
+def get_similarity_matrix(run, generation, dtype=SIMILARITY_DTYPE, source=SIMILARITY_SOURCE):
+    """
+    Get the similarity matrix of a generation as memory-mapped binary matrix.
+
+    The matrix is computed from the chromosomes ("evovis") or parsed from the similarity.csv of the generation
+    ("csv") only once and stored as .npy file with a JSON name index in the EvoVis cache directory of the run.
+    Afterwards the matrix is memory-mapped on first access, so only the rows which are read are loaded from disk.
+    The files are converted again when the similarity.csv or, for "evovis", the individuals or their architectures
+    change, so generations which are still filling up stay current. The two sources use different metrics, so
+    matrices of different sources must not be compared.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+        generation (int): The generation number.
+        dtype (str, optional): "float32" or "uint8", which stores the similarity quantized to QUANTIZATION_STEPS
+                               steps. Defaults to SIMILARITY_DTYPE.
+        source (str, optional): "evovis" or "csv". Defaults to SIMILARITY_SOURCE.
+
+    Returns:
+        dict: A dictionary containing:
+              - 'individuals': The individual names in the order of the rows and columns.
+              - 'index': A dictionary mapping individual names to their row.
+              - 'matrix': The read-only matrix (individuals x individuals) of the stored type.
+              - 'scale': The factor converting the stored values to the similarity.
+              - 'source': The source of the matrix, "evovis" or "csv".
+
+    Raises:
+        ValueError: If the storage type or the source is unknown or the generation has no similarity.csv.
+
+    Example:
+    >>> matrix = get_similarity_matrix('my_run', 8)
+    >>> matrix['matrix'][matrix['index']['silent_avocet'], :3]
+    memmap([1.   , 0.345, 0.2  ], dtype=float32)
+    """
+    if dtype not in ("float32", "uint8"):
+        raise ValueError(f"Unknown similarity storage type '{dtype}'. Must be 'float32' or 'uint8'.")
+
+    if source not in SIMILARITY_SOURCES:
+        raise ValueError(f"Unknown similarity source '{source}'. Must be 'evovis' or 'csv'.")
+
+    signature = _get_source_signature(run, generation, source)
+
+    if source == "csv" and signature is None:
+        raise ValueError(f"Generation {generation} has no similarity.csv.")
+
+    key = (run, generation, dtype, source)
+
+    cached = _similarity_matrices.get(key)
+    if cached is not None and cached["signature"] == signature:
+        return cached
+
+    cache_dir = os.path.join(run, ".evovis", "similarity")
+    matrix_path = os.path.join(cache_dir, f"Generation_{generation}_{source}_{dtype}.npy")
+    index_path = os.path.join(cache_dir, f"Generation_{generation}_{source}_{dtype}.json")
+    index = None
+
+    # Reuse the converted matrix if it belongs to the same source
+    if os.path.isfile(matrix_path) and os.path.isfile(index_path):
+        try:
+            with open(index_path, 'r') as file:
+                index = json.load(file)
+            if index.get("signature") != signature or index.get("dtype") != dtype or index.get("source") != source:
+                index = None
+        except (OSError, json.JSONDecodeError):
+            index = None
+
+    if index is None:
+        index = _convert_similarity_matrix(run, generation, dtype, source)
+
+    matrix = index["matrix"] if "matrix" in index else np.load(matrix_path, mmap_mode="r")
+    individuals = index["individuals"]
+
+    cached = {
+        "signature": signature,
+        "individuals": individuals,
+        "index": {individual: row for row, individual in enumerate(individuals)},
+        "matrix": matrix,
+        "scale": 1.0 / QUANTIZATION_STEPS if dtype == "uint8" else 1.0,
+        "source": source,
+    }
+    _similarity_matrices[key] = cached
+
+    return cached
+
+def get_similarity_row(run, generation, individual, dtype=SIMILARITY_DTYPE, source=SIMILARITY_SOURCE):
+    """
+    Get the similarity of an individual to all individuals of its generation.
+
+    For float32 matrices the row is a view on the memory-mapped file without copying.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+        generation (int): The generation number.
+        individual (str): The name of the individual.
+        dtype (str, optional): "float32" or "uint8". Defaults to SIMILARITY_DTYPE.
+        source (str, optional): "evovis" or "csv". Defaults to SIMILARITY_SOURCE.
+
+    Returns:
+        numpy.ndarray: The similarity to the individuals in the order of get_similarity_matrix, None if the
+                       individual isn't in the matrix.
+
+    Example:
+    >>> get_similarity_row('my_run', 8, 'silent_avocet')[:3]
+    memmap([1.   , 0.345, 0.2  ], dtype=float32)
+    """
+    similarity = get_similarity_matrix(run, generation, dtype, source)
+    row = similarity["index"].get(individual)
+
+    if row is None:
+        return None
+
+    values = similarity["matrix"][row]
+    return values if similarity["scale"] == 1.0 else values * np.float32(similarity["scale"])
+
+
+### RUN SIMILARITY GRAPH ###
+# Neighbors per architecture and number of architectures up to which all pairs are aligned
+GRAPH_NEIGHBORS = 10
+GRAPH_EXACT_LIMIT = 1000
+
+# Approximate graph: LSH candidates aligned per architecture, members taken per LSH bucket, random candidates
+# per architecture, neighbors kept per architecture while refining, maximum refinement rounds, fraction of
+# changed neighbors below which the refinement stops and architectures processed at once
+GRAPH_CANDIDATES = 100
+GRAPH_BUCKET_LIMIT = 64
+GRAPH_RANDOM_CANDIDATES = 30
+GRAPH_POOL_NEIGHBORS = 20
+GRAPH_MAX_ROUNDS = 8
+GRAPH_CONVERGENCE = 0.001
+GRAPH_BLOCK = 2048
+
+_similarity_graphs = {}
+
+def _top_per_row(owners, scores, limit):
+    """
+    Select the entries with the highest scores per row.
+
+    Args:
+        owners (numpy.ndarray): The row of every entry.
+        scores (numpy.ndarray): The score of every entry.
+        limit (int): The maximum number of entries per row.
+
+    Returns:
+        numpy.ndarray: The selected entries, ordered by row and descending score.
+    """
+    order = np.lexsort((-scores, owners))
+    owners = owners[order]
+    starts = np.searchsorted(owners, owners, side="left")
+
+    return order[np.arange(len(owners)) - starts < limit]
+
+def _csr_rows(indptr, indices, rows):
+    """
+    Gather the entries of rows of a CSR matrix.
+
+    Args:
+        indptr (numpy.ndarray): The row pointers.
+        indices (numpy.ndarray): The column indices.
+        rows (numpy.ndarray): The rows to gather.
+
+    Returns:
+        tuple: The position in rows and the column index of every gathered entry.
+    """
+    sizes = indptr[rows + 1] - indptr[rows]
+    offsets = np.arange(sizes.sum()) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+
+    return np.repeat(np.arange(len(rows)), sizes), indices[np.repeat(indptr[rows], sizes) + offsets]
+
+def _bucket_candidates(index, rows):
+    """
+    Collect the rows of the neighbor index sharing an LSH bucket with the given rows.
+
+    At most GRAPH_BUCKET_LIMIT members are taken from every bucket, so large groups of near identical
+    architectures don't make the candidates quadratic.
+
+    Args:
+        index (dict): The neighbor index, see neighbors.get_neighbor_index.
+        rows (numpy.ndarray): The rows of the neighbor index.
+
+    Returns:
+        tuple: The position in rows and the candidate row of every candidate pair.
+    """
+    owners = []
+    candidates = []
+
+    for band in range(LSH_BANDS):
+        hashes = index["bands"][rows, band]
+        first = np.searchsorted(index["band_sorted"][band], hashes, side="left")
+        sizes = np.minimum(np.searchsorted(index["band_sorted"][band], hashes, side="right") - first, GRAPH_BUCKET_LIMIT)
+
+        offsets = np.arange(sizes.sum()) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+        owners.append(np.repeat(np.arange(len(rows)), sizes))
+        candidates.append(index["band_order"][band, np.repeat(first, sizes) + offsets])
+
+    return np.concatenate(owners), np.concatenate(candidates)
+
+def _nearest_candidates(sequences, nodes, owners, candidates, k):
+    """
+    Align the candidates of a block of nodes and keep the k most similar per node.
+
+    Args:
+        sequences (list): The gene sequence of every node.
+        nodes (numpy.ndarray): The nodes of the block.
+        owners (numpy.ndarray): The position in nodes of every candidate pair.
+        candidates (numpy.ndarray): The candidate node of every candidate pair.
+        k (int): The number of neighbors per node.
+
+    Returns:
+        tuple: The number of neighbors of every node, the neighbors and their similarities in descending order.
+    """
+    # Distinct candidate nodes other than the node itself
+    valid = candidates != nodes[owners]
+    pairs = np.unique(owners[valid] * len(sequences) + candidates[valid])
+    owners, candidates = pairs // len(sequences), pairs % len(sequences)
+
+    similarities = _align_pairs([sequences[node] for node in nodes[owners]], [sequences[node] for node in candidates])
+
+    selected = _top_per_row(owners, similarities, k)
+
+    return np.bincount(owners[selected], minlength=len(nodes)), candidates[selected], similarities[selected].astype(np.float32)
+
+def _build_graph(blocks):
+    """
+    Concatenate the neighbors of the blocks of nodes to CSR arrays.
+
+    Args:
+        blocks (list): The neighbor counts, neighbors and similarities of every block.
+
+    Returns:
+        tuple: The indptr, indices and data arrays.
+    """
+    counts = np.concatenate([block[0] for block in blocks]) if blocks else np.zeros(0, dtype=np.int64)
+
+    return (
+        np.concatenate([[0], np.cumsum(counts)]).astype(np.int64),
+        np.concatenate([block[1] for block in blocks]).astype(np.int64) if blocks else np.zeros(0, dtype=np.int64),
+        np.concatenate([block[2] for block in blocks]) if blocks else np.zeros(0, dtype=np.float32),
+    )
+
+def _exact_graph(sequences, k):
+    """
+    Find the k most similar nodes of every node by aligning all pairs, a block of rows at a time.
+
+    Args:
+        sequences (list): The gene sequence of every node.
+        k (int): The number of neighbors per node.
+
+    Returns:
+        tuple: The indptr, indices and data arrays.
+    """
+    block = max(1, ALIGNMENT_BATCH // max(1, len(sequences)))
+    blocks = []
+
+    for start in range(0, len(sequences), block):
+        nodes = np.arange(start, min(start + block, len(sequences)))
+        owners = np.repeat(np.arange(len(nodes)), len(sequences))
+        candidates = np.tile(np.arange(len(sequences)), len(nodes))
+        blocks.append(_nearest_candidates(sequences, nodes, owners, candidates, k))
+
+    return _build_graph(blocks)
+
+def _approximate_graph(sequences, index, representatives, row_nodes, k):
+    """
+    Find approximately the k most similar nodes of every node from LSH candidates refined by neighborhood search.
+
+    The initial candidates of a node are the GRAPH_CANDIDATES nodes sharing an LSH bucket with the highest
+    estimated Jaccard similarity and GRAPH_RANDOM_CANDIDATES random nodes. In every refinement round the
+    neighbors, the neighbors of the neighbors and the nodes having the node as neighbor become the candidates,
+    until less than GRAPH_CONVERGENCE of the neighbors change or GRAPH_MAX_ROUNDS rounds are done. While
+    refining, max(k, GRAPH_POOL_NEIGHBORS) neighbors are kept per node.
+
+    Args:
+        sequences (list): The gene sequence of every node.
+        index (dict): The neighbor index, see neighbors.get_neighbor_index.
+        representatives (numpy.ndarray): A row of the neighbor index for every node.
+        row_nodes (numpy.ndarray): The node of every row of the neighbor index, -1 if the row has no node.
+        k (int): The number of neighbors per node.
+
+    Returns:
+        tuple: The indptr, indices and data arrays.
+    """
+    pool = max(k, GRAPH_POOL_NEIGHBORS)
+    rng = np.random.default_rng(42)
+    blocks = []
+
+    for start in range(0, len(sequences), GRAPH_BLOCK):
+        nodes = np.arange(start, min(start + GRAPH_BLOCK, len(sequences)))
+        owners, candidate_rows = _bucket_candidates(index, representatives[nodes])
+        candidates = row_nodes[candidate_rows]
+        owners, candidates = owners[candidates >= 0], candidates[candidates >= 0]
+
+        # Preselection by the agreement of the MinHash signatures
+        agreement = np.count_nonzero(
+            index["signatures"][representatives[nodes[owners]]] == index["signatures"][representatives[candidates]], axis=1
+        )
+        selected = _top_per_row(owners, agreement, GRAPH_CANDIDATES)
+
+        blocks.append(_nearest_candidates(
+            sequences, nodes,
+            np.concatenate([owners[selected], np.repeat(np.arange(len(nodes)), GRAPH_RANDOM_CANDIDATES)]),
+            np.concatenate([candidates[selected], rng.integers(0, len(sequences), len(nodes) * GRAPH_RANDOM_CANDIDATES)]),
+            pool,
+        ))
+
+    indptr, indices, data = _build_graph(blocks)
+
+    # Refinement with the neighbors of the neighbors and the reverse neighbors
+    for _ in range(GRAPH_MAX_ROUNDS):
+        reverse_order = np.argsort(indices, kind="stable")
+        reverse_indptr = np.concatenate([[0], np.cumsum(np.bincount(indices, minlength=len(sequences)))]).astype(np.int64)
+        reverse_indices = np.repeat(np.arange(len(sequences)), np.diff(indptr))[reverse_order]
+        blocks = []
+
+        for start in range(0, len(sequences), GRAPH_BLOCK):
+            nodes = np.arange(start, min(start + GRAPH_BLOCK, len(sequences)))
+            neighbor_owners, neighbors = _csr_rows(indptr, indices, nodes)
+            reverse_owners, reverse = _csr_rows(reverse_indptr, reverse_indices, nodes)
+            second_positions, second = _csr_rows(indptr, indices, neighbors)
+
+            blocks.append(_nearest_candidates(
+                sequences, nodes,
+                np.concatenate([neighbor_owners, reverse_owners, neighbor_owners[second_positions]]),
+                np.concatenate([neighbors, reverse, second]),
+                pool,
+            ))
+
+        previous = np.repeat(np.arange(len(sequences)), np.diff(indptr)) * len(sequences) + indices
+        indptr, indices, data = _build_graph(blocks)
+        current = np.repeat(np.arange(len(sequences)), np.diff(indptr)) * len(sequences) + indices
+
+        if np.count_nonzero(~np.isin(current, previous)) <= GRAPH_CONVERGENCE * max(1, len(current)):
+            break
+
+    # The k most similar of the kept neighbors
+    owners = np.repeat(np.arange(len(sequences)), np.diff(indptr))
+    keep = np.arange(len(indices)) - indptr[owners] < k
+
+    return np.concatenate([[0], np.cumsum(np.minimum(np.diff(indptr), k))]).astype(np.int64), indices[keep], data[keep]
+
+def get_similarity_graph(run, k=GRAPH_NEIGHBORS):
+    """
+    Get the sparse graph of the k most similar architectures of every architecture across all generations.
+
+    The nodes are the distinct gene sequences of the run. Runs with up to GRAPH_EXACT_LIMIT nodes align all
+    pairs, a block of rows at a time, so the graph is exact. Larger runs search the neighbors among candidates
+    from the LSH buckets of the MinHash index and random nodes, refined by the neighbors of the neighbors,
+    without a pass over all pairs. The n-gram MinHash is only a rough proxy for the alignment similarity,
+    the neighborhood search makes up most of the recall: on the 388 architectures of the example run, forced
+    to the approximate search, 100% (k=5) and 99.9% (k=10) of the neighbors are among the exact top k. Larger
+    runs get relatively fewer random candidates, so their recall can be lower.
+    Nodes can have fewer than k neighbors if the run has few architectures.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+        k (int, optional): The number of neighbors per architecture. Defaults to GRAPH_NEIGHBORS.
+
+    Returns:
+        dict: A dictionary containing:
+              - 'sequences': The gene sequence of every node.
+              - 'indptr', 'indices', 'data': The neighbors of node i are indices[indptr[i]:indptr[i+1]] with
+                the similarities data[indptr[i]:indptr[i+1]] in descending order (CSR format).
+              - 'member_indptr', 'members': The individuals of node i are members[member_indptr[i]:member_indptr[i+1]]
+                as (generation, name) tuples.
+              - 'node_index': A dictionary mapping (generation, name) to the node of the individual.
+
+    Example:
+    >>> graph = get_similarity_graph('my_run')
+    >>> node = graph['node_index'][(8, 'silent_avocet')]
+    >>> graph['indices'][graph['indptr'][node]:graph['indptr'][node + 1]]
+    array([112,  37, 250, ...])
+    """
+    generations = tuple(get_generations(run, as_int=True))
+    key = (run, k)
+
+    cached = _similarity_graphs.get(key)
+    if cached is not None and cached[0] == generations:
+        return cached[1]
+
+    # Distinct sequences and their individuals
+    node_index = {}
+    sequences = []
+    sequence_nodes = {}
+    members = []
+
+    for generation, individual, sequence in encode_run_chromosomes(run):
+        node = sequence_nodes.setdefault(sequence, len(sequences))
+        if node == len(sequences):
+            sequences.append(sequence)
+            members.append([])
+        members[node].append((generation, individual))
+        node_index[(generation, individual)] = node
+
+    # Representative row of every node in the neighbor index and node of every row
+    index = get_neighbor_index(run)
+    row_nodes = np.full(len(index["individuals"]), -1, dtype=np.int64)
+
+    for (generation, individual), row in index["rows"].items():
+        row_nodes[row] = node_index.get((generation, individual), -1)
+
+    representatives = np.zeros(len(sequences), dtype=np.int64)
+    representatives[row_nodes[row_nodes >= 0]] = np.flatnonzero(row_nodes >= 0)
+
+    if len(sequences) <= GRAPH_EXACT_LIMIT:
+        indptr, indices, data = _exact_graph(sequences, k)
+    else:
+        indptr, indices, data = _approximate_graph(sequences, index, representatives, row_nodes, k)
+
+    graph = {
+        "sequences": sequences,
+        "indptr": indptr,
+        "indices": indices,
+        "data": data,
+        "member_indptr": np.concatenate([[0], np.cumsum([len(node_members) for node_members in members])]).astype(np.int64),
+        "members": [member for node_members in members for member in node_members],
+        "node_index": node_index,
+    }
+    _similarity_graphs[key] = (generations, graph)
+
+    return graph
+
+def get_architecture_family(run, generation, individual, k=GRAPH_NEIGHBORS):
+    """
+    Get the individuals of all generations with the same or one of the most similar architectures as an individual.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+        generation (int): The generation of the individual.
+        individual (str): The name of the individual.
+        k (int, optional): The number of similar architectures. Defaults to GRAPH_NEIGHBORS.
+
+    Returns:
+        list: The architecture of the individual followed by its neighbors, each as dictionary with the 'sequence',
+              the 'similarity' and the 'individuals' as (generation, name) tuples. Empty if the individual has no chromosome.
+
+    Example:
+    >>> get_architecture_family('my_run', 8, 'silent_avocet', k=1)
+    [{'sequence': 'CIMCDBg', 'similarity': 1.0, 'individuals': [(8, 'silent_avocet')]},
+     {'sequence': 'CIMCDBgO', 'similarity': 0.875, 'individuals': [(9, 'giga_galago'), (11, 'mutant_crane')]}]
+    """
+    graph = get_similarity_graph(run, k)
+    node = graph["node_index"].get((generation, individual))
+
+    if node is None:
+        return []
+
+    neighbors = graph["indices"][graph["indptr"][node]:graph["indptr"][node + 1]]
+    similarities = graph["data"][graph["indptr"][node]:graph["indptr"][node + 1]]
+
+    return [
+        {
+            "sequence": graph["sequences"][neighbor],
+            "similarity": float(similarity),
+            "individuals": graph["members"][graph["member_indptr"][neighbor]:graph["member_indptr"][neighbor + 1]],
+        }
+        for neighbor, similarity in zip([node] + neighbors.tolist(), [1.0] + similarities.tolist())
+    ]
+
+
+if __name__ == "__main__":
+    arguments = [argument for argument in sys.argv[1:] if not argument.startswith("--")]
+    options = [argument for argument in sys.argv[1:] if argument.startswith("--")]
+
+    if len(arguments) != 1 or any(option not in ("--write-csv", "--force") for option in options):
+        print("Usage: python3 src/similarity.py <run results directory> [--write-csv [--force]]")
+        sys.exit(1)
+
+    run_path = arguments[0]
+    print(f"Aligned the new architecture pairs of generations {update_similarity_checkpoint(run_path)}")
+
+    for generation in get_generations(run_path, as_int=True):
+        if "--write-csv" not in options:
+            similarity = get_similarity_matrix(run_path, generation)
+            print(f"Generation {generation}: {len(similarity['individuals'])} individuals")
+            continue
+
+        try:
+            print(f"Generation {generation}: wrote {write_similarity_csv(run_path, generation, force='--force' in options)}")
+        except FileExistsError:
+            print(f"Generation {generation}: similarity.csv exists, use --force to overwrite it")
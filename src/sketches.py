@@ -0,0 +1,275 @@
+import numpy as np
+from evolution import get_generations, get_meas_info, get_results_table
+
+
+##################################################
+
+# MODULE SKETCHES
+
+# The Sketches Module provides functionalities
+# for summarizing the distribution of the measurements
+# per generation in mergeable quantile sketches
+# of bounded size.
+
+##################################################
+
+
+### QUANTILE SKETCH ###
+SKETCH_COMPRESSION = 100
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch in the style of a merging t-digest.
+
+    The values are summarized by at most about SKETCH_COMPRESSION centroids (mean and weight). Centroids near
+    the tails represent few values, so extreme quantiles stay accurate. Minimum and maximum are kept exactly.
+
+    Attributes:
+        compression (int): The compression, bounding the number of centroids.
+        means (numpy.ndarray): The means of the centroids in ascending order.
+        weights (numpy.ndarray): The number of values of the centroids.
+        min (float): The smallest value, NaN if the sketch is empty.
+        max (float): The largest value, NaN if the sketch is empty.
+
+    Example:
+    >>> sketch = QuantileSketch(np.random.rand(10000))
+    >>> sketch.quantile([0.25, 0.5, 0.75])
+    array([0.25, 0.5, 0.75])
+    """
+
+    def __init__(self, values=None, compression=SKETCH_COMPRESSION):
+        self.compression = compression
+        self.means = np.zeros(0)
+        self.weights = np.zeros(0)
+        self.min = np.nan
+        self.max = np.nan
+
+        if values is not None:
+            self.add(values)
+
+    @property
+    def count(self):
+        """
+        int: The number of values added to the sketch.
+        """
+        return int(self.weights.sum())
+
+    def add(self, values):
+        """
+        Add values to the sketch, NaN values are ignored.
+
+        Args:
+            values (array-like): The values to add.
+
+        Returns:
+            QuantileSketch: The sketch itself.
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+
+        if len(values):
+            self._compress(
+                np.concatenate([self.means, values]),
+                np.concatenate([self.weights, np.ones(len(values))]),
+            )
+            self.min = np.fmin(self.min, values.min())
+            self.max = np.fmax(self.max, values.max())
+
+        return self
+
+    def merge(self, other):
+        """
+        Merge two sketches into a new sketch summarizing the values of both.
+
+        Args:
+            other (QuantileSketch): The sketch to merge with.
+
+        Returns:
+            QuantileSketch: The merged sketch.
+        """
+        merged = QuantileSketch(compression=self.compression)
+
+        if not len(self.weights) and not len(other.weights):
+            return merged
+
+        merged._compress(np.concatenate([self.means, other.means]), np.concatenate([self.weights, other.weights]))
+        merged.min = np.fmin(self.min, other.min)
+        merged.max = np.fmax(self.max, other.max)
+
+        return merged
+
+    def _compress(self, means, weights):
+        """
+        Merge neighbouring centroids so that every centroid covers at most one unit of the arcsine scale function.
+
+        Args:
+            means (numpy.ndarray): The means of the centroids in any order.
+            weights (numpy.ndarray): The weights of the centroids.
+
+        Returns:
+            None
+        """
+        if not len(weights):
+            self.means, self.weights = np.zeros(0), np.zeros(0)
+            return
+
+        order = np.argsort(means, kind="stable")
+        means, weights = means[order], weights[order]
+
+        # Scale of the quantile at the left edge of every centroid
+        total = weights.sum()
+        left = (np.cumsum(weights) - weights) / total
+        scale = np.floor(self.compression / (2 * np.pi) * np.arcsin(2 * left - 1))
+
+        # Centroids starting in the same unit of the scale are merged
+        starts = np.flatnonzero(np.concatenate([[True], scale[1:] != scale[:-1]]))
+        merged_weights = np.add.reduceat(weights, starts)
+
+        self.means = np.add.reduceat(means * weights, starts) / merged_weights
+        self.weights = merged_weights
+
+    def quantile(self, q):
+        """
+        Estimate quantiles by interpolating between the centers of the centroids.
+
+        Args:
+            q (float or array-like): The quantile(s) between 0 and 1.
+
+        Returns:
+            float or numpy.ndarray: The estimated quantile(s), NaN if the sketch is empty.
+        """
+        q = np.asarray(q, dtype=np.float64)
+
+        if not len(self.weights):
+            return np.full(q.shape, np.nan) if q.ndim else np.nan
+
+        # Quantiles at the centers of the centroids, bounded by the exact extremes
+        total = self.weights.sum()
+        centers = (np.cumsum(self.weights) - self.weights / 2) / total
+        positions = np.concatenate([[0.0], centers, [1.0]])
+        values = np.concatenate([[self.min], self.means, [self.max]])
+
+        return np.interp(q, positions, values)
+
+
+### SKETCHES OF A RUN ###
+_generation_sketches = {}
+
+def get_generation_sketches(run):
+    """
+    Get a quantile sketch of every measurement per generation.
+
+    The sketches summarize the healthy individuals with values within the 'min-boundary' and 'max-boundary'
+    of a measurement. They are built once per generation when the generation is read for the first time and
+    merged to answer generation ranges.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+
+    Returns:
+        dict: Generation dictionnairy mapping every measurement to its QuantileSketch.
+
+    Example:
+    >>> get_generation_sketches('my_run')[3]['inference_time'].quantile(0.5)
+    0.41
+    """
+    meas_infos = get_meas_info(run)
+    measurements = list(meas_infos.keys())
+    boundaries = tuple((meas_infos[meas]["min-boundary"], meas_infos[meas]["max-boundary"]) for meas in measurements)
+    key = (tuple(measurements), boundaries)
+
+    cached = _generation_sketches.get(run)
+    if cached is None or cached["key"] != key:
+        cached = {"key": key, "sketches": {}}
+        _generation_sketches[run] = cached
+
+    new_generations = [gen for gen in get_generations(run, as_int=True) if gen not in cached["sketches"]]
+
+    if new_generations:
+        table = get_results_table(run)
+
+        for generation in new_generations:
+            rows = (table["generations"] == generation) & table["healthy"]
+            cached["sketches"][generation] = {}
+
+            for col, meas in enumerate(table["measurements"]):
+                low, high = boundaries[col]
+                values = table["values"][rows, col]
+                values = values[(values >= (-np.inf if low is None else low)) & (values <= (np.inf if high is None else high))]
+                cached["sketches"][generation][meas] = QuantileSketch(values)
+
+    return cached["sketches"]
+
+def get_range_sketch(run, measurement, generation_range=None):
+    """
+    Get the quantile sketch of a measurement over a range of generations by merging the generation sketches.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+        measurement (str): The measurement key.
+        generation_range (range, optional): A python range of generations. Defaults to all processed generations.
+
+    Returns:
+        QuantileSketch: The merged sketch.
+
+    Example:
+    >>> get_range_sketch('my_run', 'val_acc', range(1, 6)).quantile(0.9)
+    0.86
+    """
+    sketches = get_generation_sketches(run)
+    merged = QuantileSketch()
+
+    for generation, generation_sketches in sketches.items():
+        if generation_range is None or generation in generation_range:
+            merged = merged.merge(generation_sketches[measurement])
+
+    return merged
+
+def get_box_statistics(run, measurement, max_boxes=None):
+    """
+    Get the box plot statistics of a measurement per generation from the quantile sketches.
+
+    If there are more generations than max_boxes, consecutive generations are merged into one box.
+    The whiskers reach the most extreme values within 1.5 times the interquartile range. Boxes without
+    valid values have NaN statistics and a count of 0.
+
+    Args:
+        run (str): The path of the ENAS run results directory.
+        measurement (str): The measurement key.
+        max_boxes (int, optional): The maximum number of boxes. Defaults to one box per generation.
+
+    Returns:
+        dict: A dictionary with the arrays 'generations' (first generation of every box), 'count', 'q1',
+              'median', 'q3', 'lowerfence' and 'upperfence'.
+
+    Example:
+    >>> get_box_statistics('my_run', 'inference_time')['median']
+    array([0.52, 0.47, ...])
+    """
+    sketches = get_generation_sketches(run)
+    generations = sorted(sketches.keys())
+
+    # Merge consecutive generations into boxes
+    boxes = len(generations) if max_boxes is None else max(1, min(max_boxes, len(generations)))
+    groups = np.array_split(np.array(generations, dtype=np.int64), boxes) if generations else []
+
+    statistics = {key: [] for key in ["generations", "count", "q1", "median", "q3", "lowerfence", "upperfence"]}
+
+    for group in groups:
+        sketch = QuantileSketch()
+        for generation in group.tolist():
+            sketch = sketch.merge(sketches[generation][measurement])
+
+        # Empty boxes get NaN statistics
+        q1, median, q3 = sketch.quantile([0.25, 0.5, 0.75])
+        iqr = q3 - q1
+
+        statistics["generations"].append(int(group[0]))
+        statistics["count"].append(sketch.count)
+        statistics["q1"].append(q1)
+        statistics["median"].append(median)
+        statistics["q3"].append(q3)
+        statistics["lowerfence"].append(np.fmax(sketch.min, q1 - 1.5 * iqr))
+        statistics["upperfence"].append(np.fmin(sketch.max, q3 + 1.5 * iqr))
+
+    return {key: np.array(values) for key, values in statistics.items()}